@@ -0,0 +1,98 @@
+"""Geçmişte arama benchmark'ı: LIKE taraması ile FTS5 dizini.
+
+Geçici bir veritabanına farklı içerikli çok sayıda yazı ekler (arama dizini tetikleyicilerle dolar),
+ardından aynı aramayı LIKE '%...%' taramasıyla ve HistoryManager.search_posts ile yapar. Kelime
+sıklıkları Zipf dağılımına yakındır; seyrek, orta sıklıkta ve hemen her yazıda geçen kelimeler ölçülür.
+
+Kullanım: python benchmarks/bench_history_search.py [--posts 100000]
+"""
+import argparse
+import itertools
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.history_manager import HistoryManager, html_to_text  # noqa: E402
+
+SYLLABLES = "ka le mi ro su ta ne bi yo da çe şu gö lü ar ın ev ol".split()
+# Her kelime başlık, anahtar kelime ya da içerikte geçmeli
+LEGACY_CONDITION = "(title LIKE ? OR keywords LIKE ? OR content LIKE ?)"
+
+
+def timed(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - started) / repeat * 1000, result
+
+
+def make_vocabulary(rng, size=20000):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def make_content(rng, words, weights):
+    # Az sayıda çok yaygın, çok sayıda seyrek kelime
+    paragraphs = (" ".join(rng.choices(words, cum_weights=weights, k=50)) for _ in range(5))
+    return "".join(f"<!-- wp:paragraph --><p>{paragraph}</p><!-- /wp:paragraph -->" for paragraph in paragraphs)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    words = make_vocabulary(rng)
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_file = os.path.join(temp_dir, "posts_history.db")
+        manager = HistoryManager(db_file=db_file)
+
+        started = time.perf_counter()
+        with manager._connection() as conn:
+            conn.executemany(
+                "INSERT INTO posts (title, content, content_text, keywords, wordpress_id, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                ((" ".join(rng.choices(words, cum_weights=weights, k=4)), content, html_to_text(content),
+                  ", ".join(rng.choices(words, cum_weights=weights, k=3)), i,
+                  f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 12:00:00")
+                 for i, content in enumerate(make_content(rng, words, weights) for _ in range(args.posts)))
+            )
+        print(f"{args.posts} yazı eklendi ({time.perf_counter() - started:.1f} s, arama dizini dahil)")
+        print(f"Veritabanı boyutu: {os.path.getsize(db_file) / 1024 / 1024:.0f} MB")
+
+        # Tüm kelimelerin geçtiği yazılar: LIKE her kelime için tarama, FTS5 tek MATCH
+        queries = (words[15000], words[2000], f"{words[300]} {words[1200]}", words[0])
+        print(f"{'arama':>28} {'LIKE (ms)':>10} {'FTS5 (ms)':>10} {'eşleşme':>8} {'sıralama':>9}")
+        for query in queries:
+            terms = query.split()
+
+            def legacy():
+                with sqlite3.connect(db_file) as conn:
+                    where = " AND ".join([LEGACY_CONDITION] * len(terms))
+                    params = [f"%{term}%" for term in terms for _ in range(3)]
+                    return conn.execute(f"SELECT id FROM posts WHERE {where} ORDER BY created_at DESC LIMIT 20",
+                                        params).fetchall()
+
+            legacy_ms, _ = timed(legacy, max(1, args.repeat // 10))
+            fts_ms, page = timed(lambda: manager.search_posts(query), args.repeat)
+            assert len(page["results"]) == min(20, page["total"])
+            print(f"{query:>28} {legacy_ms:>10.1f} {fts_ms:>10.2f} {page['total']:>8} "
+                  f"{'bm25' if page['ranked'] else 'tarih':>9}")
+
+        deep_ms, _ = timed(lambda: manager.search_posts(words[2000], offset=200), args.repeat)
+        print(f"{words[2000] + ' (11. sayfa)':>28} {'':>10} {deep_ms:>10.2f}")
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Geçmiş panosu sorgularının benchmark'ı.
+
+Geçici bir veritabanına çok sayıda yazı ekler; eski sorguları (her çağrıda yeni bağlantı, tam tarama
+ile COUNT(DISTINCT DATE(...)), indekssiz ORDER BY created_at) HistoryManager'ın havuzlu bağlantı, özet
+tablo ve indeksli sorgularıyla karşılaştırır.
+
+Kullanım: python benchmarks/bench_history_stats.py [--posts 200000]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.history_manager import HistoryManager  # noqa: E402
+
+LEGACY_STATS = """
+    SELECT COUNT(*), COUNT(DISTINCT DATE(created_at)),
+           ROUND(CAST(COUNT(*) AS FLOAT) / NULLIF(COUNT(DISTINCT DATE(created_at)), 0), 1)
+    FROM posts
+"""
+LEGACY_HISTORY = "SELECT * FROM posts ORDER BY created_at DESC LIMIT 50"
+
+
+def timed(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_file = os.path.join(temp_dir, "posts_history.db")
+        manager = HistoryManager(db_file=db_file)
+
+        content = "<p>" + "Lorem ipsum dolor sit amet. " * 200 + "</p>"
+        started = time.perf_counter()
+        with manager._connection() as conn:
+            conn.executemany(
+                "INSERT INTO posts (title, content, keywords, wordpress_id, created_at) VALUES (?, ?, ?, ?, ?)",
+                ((f"Yazı {i}", content, "seyahat", i,
+                  f"2024-{random.randint(1, 12):02d}-{random.randint(1, 28):02d} 12:00:00")
+                 for i in range(args.posts))
+            )
+        print(f"{args.posts} yazı eklendi ({time.perf_counter() - started:.1f} s, tetikleyiciler dahil)")
+
+        def legacy_stats():
+            with sqlite3.connect(db_file) as conn:
+                return conn.execute(LEGACY_STATS).fetchone()
+
+        def legacy_history():
+            # Eski şemada indeks yoktu; aynı koşul için indeks kullanımı engellenir
+            with sqlite3.connect(db_file) as conn:
+                return conn.execute(LEGACY_HISTORY.replace("FROM posts", "FROM posts NOT INDEXED")).fetchall()
+
+        legacy = legacy_stats()
+        current = manager.get_post_stats()
+        assert (legacy[0], legacy[1], legacy[2]) == (current['total_posts'], current['active_days'],
+                                                     current['avg_posts_per_day']), (legacy, current)
+
+        print(f"{'sorgu':>10} {'eski (ms)':>10} {'yeni (ms)':>10}")
+        print(f"{'istatistik':>10} {timed(legacy_stats, args.repeat):>10.2f} "
+              f"{timed(manager.get_post_stats, args.repeat):>10.3f}")
+        print(f"{'geçmiş':>10} {timed(legacy_history, args.repeat):>10.2f} "
+              f"{timed(manager.get_posts_history, args.repeat):>10.3f}")
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
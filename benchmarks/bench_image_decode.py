@@ -0,0 +1,92 @@
+"""Görsel çözme yolunun bellek ve süre benchmark'ı.
+
+6000x4000 bir JPEG'i eski yöntemle (tüm içerik belleğe, tam çözünürlükte çözme, LANCZOS) ve yeni
+yöntemle (dosyadan, draft() ile hedefe yakın çözme) 800x600'e küçültür. Her işlem ayrı bir süreçte
+çalıştırılır ve o sürecin bellek tepe değerindeki artış raporlanır. Ardından piksel sınırının
+sıkıştırma bombasını reddettiği doğrulanır.
+
+Kullanım: python benchmarks/bench_image_decode.py [--width 6000 --height 4000]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image  # noqa: E402
+
+from modules.image_safety import ImageLimitError, PeakMemory, open_image  # noqa: E402
+from modules.renditions import resize_to_file  # noqa: E402
+
+
+def legacy_resize(source_path, output_path, width, height):
+    with PeakMemory() as memory:
+        with open(source_path, "rb") as f:
+            content = f.read()
+        img = Image.open(BytesIO(content))
+        memory.track(img)
+        img = img.resize((width, height), getattr(Image, "Resampling", Image).LANCZOS)
+        img.save(output_path)
+    return memory.report()
+
+
+def new_resize(source_path, output_path, width, height):
+    return resize_to_file(source_path, output_path, width, height, False, "jpeg")["memory"]
+
+
+def _run(queue, fn, *args):
+    started = time.perf_counter()
+    report = fn(*args)
+    queue.put((time.perf_counter() - started, report))
+
+
+def measure(fn, *args):
+    # Her ölçüm temiz bir süreçte yapılır; önceki çözmelerin belleği sonucu etkilemez
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_run, args=(queue, fn) + args)
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--width", type=int, default=6000)
+    parser.add_argument("--height", type=int, default=4000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source_path = os.path.join(temp_dir, "source.jpg")
+        # Gürültü yerine geçişli bir desen: gerçekçi bir JPEG boyutu verir
+        gradient = Image.linear_gradient("L").resize((args.width, args.height))
+        Image.merge("RGB", (gradient, gradient.rotate(90, expand=False), gradient.transpose(0))).save(
+            source_path, quality=90)
+        print(f"Kaynak: {args.width}x{args.height}, {os.path.getsize(source_path) / 1024 / 1024:.1f} MB")
+
+        print(f"{'yöntem':>8} {'süre (ms)':>10} {'RSS artışı (MB)':>16} {'bitmap tepe (MB)':>17}")
+        for name, fn in (("eski", legacy_resize), ("yeni", new_resize)):
+            output_path = os.path.join(temp_dir, f"out-{name}.jpg")
+            elapsed, report = measure(fn, source_path, output_path, 800, 600)
+            growth = report["rss_growth_bytes"]
+            growth_text = f"{growth / 1024 / 1024:.1f}" if growth is not None else "-"
+            print(f"{name:>8} {elapsed * 1000:>10.1f} {growth_text:>16} "
+                  f"{report['peak_image_bytes'] / 1024 / 1024:>17.1f}")
+
+        # Küçük dosya, çok büyük piksel sayısı: başlık okunduğunda reddedilmeli
+        bomb_path = os.path.join(temp_dir, "bomb.png")
+        Image.new("1", (20000, 20000)).save(bomb_path)
+        try:
+            open_image(bomb_path)
+            print("Sıkıştırma bombası reddedilmedi!")
+        except ImageLimitError as e:
+            print(f"Sıkıştırma bombası reddedildi ({os.path.getsize(bomb_path) / 1024:.0f} KB dosya): {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Yakın kopya denetiminin benchmark'ı.
+
+Geçmişe kademeli olarak yazı ekler ve her kademede bir yazının hafifçe düzenlenmiş kopyasını
+HistoryManager.find_near_duplicates (LSH kovaları) ile ve tüm imzaları tek tek karşılaştıran kaba
+yöntemle arar. LSH süresi aday sayısına bağlı kalırken kaba yöntem geçmişle doğrusal büyür.
+
+Kullanım: python benchmarks/bench_near_duplicates.py [--steps 1000,5000,20000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.history_manager import HistoryManager, signature_text  # noqa: E402
+from modules.near_duplicates import estimate_similarity, minhash_signature, signature_from_blob  # noqa: E402
+
+
+def make_article(rng, vocabulary, words=250):
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+def edit(rng, vocabulary, text, changes):
+    words = text.split()
+    for i in rng.sample(range(len(words)), changes):
+        words[i] = rng.choice(vocabulary)
+    return " ".join(words)
+
+
+def brute_force(manager, title, content, threshold):
+    signature = minhash_signature(signature_text(title, "test", content))
+    with manager._connection() as conn:
+        rows = conn.execute("SELECT post_id, signature FROM post_minhash WHERE signature IS NOT NULL").fetchall()
+    return [post_id for post_id, blob in rows
+            if estimate_similarity(signature, signature_from_blob(blob)) >= threshold]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", default="1000,5000,20000")
+    parser.add_argument("--threshold", type=float, default=0.7)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    vocabulary = [f"kelime{i}" for i in range(5000)]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = HistoryManager(db_file=os.path.join(temp_dir, "posts_history.db"))
+        articles = []
+
+        print(f"{'yazı':>7} {'kayıt (ms)':>11} {'LSH (ms)':>9} {'kaba (ms)':>10} {'benzerlik':>10} {'yakalanan':>10}")
+        for step in (int(s) for s in args.steps.split(",")):
+            started = time.perf_counter()
+            added = step - len(articles)
+            while len(articles) < step:
+                article = make_article(rng, vocabulary)
+                articles.append(article)
+                manager.save_post({"title": f"Yazı {len(articles)}", "content": f"<p>{article}</p>",
+                                   "keywords": "test"}, len(articles))
+            save_ms = (time.perf_counter() - started) / max(1, added) * 1000
+
+            # Kelimelerin ~%3'ü değiştirilmiş kopya
+            original = rng.randrange(len(articles))
+            candidate = f"<p>{edit(rng, vocabulary, articles[original], 8)}</p>"
+            title = f"Yazı {original + 1}"
+
+            started = time.perf_counter()
+            duplicates = manager.find_near_duplicates(title, candidate, "test", threshold=args.threshold)
+            lsh_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            brute = brute_force(manager, title, candidate, args.threshold)
+            brute_ms = (time.perf_counter() - started) * 1000
+
+            found = any(item["id"] == original + 1 for item in duplicates)
+            similarity = duplicates[0]["similarity"] if duplicates else 0
+            assert set(brute) >= {item["id"] for item in duplicates}
+            print(f"{step:>7} {save_ms:>11.1f} {lsh_ms:>9.2f} {brute_ms:>10.1f} {similarity:>10.3f} "
+                  f"{'evet' if found else 'hayır':>10}")
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Şablon render mikro-benchmark'ı.
+
+Eski yöntem (her anahtar için bir str.replace + kalanları temizleyen re.sub) ile derlenmiş
+şablonun tek geçişli render'ını büyük yazılar üzerinde karşılaştırır.
+
+Kullanım: python benchmarks/bench_template_render.py
+"""
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.template_manager import CompiledTemplate  # noqa: E402
+
+
+def legacy_render(template_content, values):
+    for key, value in values.items():
+        template_content = template_content.replace(f"@{key}@", str(value))
+    return re.sub(r'@\w+@', '', template_content)
+
+
+def build_case(content_kb):
+    template = "\n".join([
+        '<!-- wp:image {"align":"@image_alignment@"} -->',
+        "@featured_image@",
+        "<!-- /wp:image -->",
+        "<h1>@title@</h1>",
+        "@content@",
+        '<div class="content-images">@content_images@</div>',
+        "<p>@content_image_1@</p><p>@content_image_2@</p><p>@content_image_3@</p>",
+        "<p><strong>Etiketler:</strong> @tags@</p>",
+        "<p>@date@ @unknown@</p>",
+    ])
+    paragraph = "<!-- wp:paragraph -->\n<p>" + "Lorem ipsum dolor sit amet. " * 20 + "</p>\n<!-- /wp:paragraph -->\n"
+    image = '<figure class="wp-block-image"><img src="https://images.example.com/photo.jpg" alt="x"/></figure>\n'
+    values = {
+        "title": "Berlin'de Gezilecek Yerler",
+        "content": paragraph * max(1, content_kb * 1024 // len(paragraph)),
+        "content_images": image * 200,
+        "featured_image": image,
+        "image_alignment": "center",
+        "content_image_1": image,
+        "content_image_2": image,
+        "content_image_3": image,
+        "tags": "berlin, gezi, tarih",
+        "date": "01.01.2025",
+        "content_image_alignment": "none",
+        "alternating_alignment": False,
+    }
+    return template, values
+
+
+def main():
+    print(f"{'içerik':>8} {'eski (ms)':>12} {'derlenmiş (ms)':>16} {'hızlanma':>10}")
+    for content_kb in (16, 128, 512, 2048):
+        template, values = build_case(content_kb)
+        compiled = CompiledTemplate(template)
+        assert compiled.render(values) == legacy_render(template, values)
+
+        number = 50
+        legacy = min(timeit.repeat(lambda: legacy_render(template, values), number=number, repeat=5)) / number
+        fast = min(timeit.repeat(lambda: compiled.render(values), number=number, repeat=5)) / number
+        print(f"{content_kb:>6}KB {legacy * 1000:>12.3f} {fast * 1000:>16.3f} {legacy / fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""XML-RPC ve REST taşıma katmanlarının medya yükleme benchmark'ı.
+
+Yerel WordPress taklidine (fake_wordpress.py) farklı boyutlarda dosyalar yükler; süreyi ve Python
+tarafındaki bellek tepe değerini (tracemalloc) raporlar.
+
+Kullanım: python benchmarks/bench_wp_transports.py [--latency 0.02]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fake_wordpress  # noqa: E402
+from modules.wp_transports import RestTransport, XmlRpcTransport  # noqa: E402
+
+
+def measure(transport, path, repeat):
+    tracemalloc.start()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        transport.upload_media(path, os.path.basename(path), "image/jpeg")
+    elapsed = (time.perf_counter() - started) / repeat
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.0, help="Sunucu tarafı yapay gecikme (saniye)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    server = fake_wordpress.start(latency=args.latency)
+    transports = [
+        XmlRpcTransport(server.url, "user", "pass"),
+        RestTransport(server.url, "user", "pass"),
+    ]
+
+    print(f"{'boyut':>7} {'taşıma':>8} {'süre (ms)':>11} {'bellek tepe (MB)':>18}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for size_mb in (1, 5, 20):
+            path = os.path.join(temp_dir, f"photo-{size_mb}mb.jpg")
+            with open(path, "wb") as f:
+                f.write(os.urandom(size_mb * 1024 * 1024))
+
+            for transport in transports:
+                elapsed, peak = measure(transport, path, args.repeat)
+                print(f"{size_mb:>5}MB {transport.name:>8} {elapsed * 1000:>11.1f} {peak / 1024 / 1024:>18.1f}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""XML-RPC çağrılarının system.multicall ile gruplanmasının benchmark'ı.
+
+Yüksek gecikmeli yerel WordPress taklidine (fake_wordpress.py) eşzamanlı olarak yazı ve küçük medya
+gönderir; gruplama açık ve kapalıyken toplam süreyi ve sunucuya giden XML-RPC istek sayısını raporlar.
+Sunucunun aynı anda işleyebildiği istek sayısı --server-concurrency ile sınırlanabilir.
+
+Kullanım: python benchmarks/bench_xmlrpc_multicall.py [--latency 0.05] [--posts 40] [--workers 8]
+                                                      [--server-concurrency 2]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fake_wordpress  # noqa: E402
+from modules.wp_transports import XmlRpcTransport  # noqa: E402
+
+
+def publish_one(transport, image_path, index):
+    media = transport.upload_media(image_path, f"photo-{index}.jpg", "image/jpeg")
+    return transport.create_post({
+        'title': f"Yazı {index}",
+        'content': f"<p>İçerik {index}</p>",
+        'thumbnail': media['id'],
+        'tags': ["seyahat", f"etiket-{index % 5}"],
+    })
+
+
+def measure(server, batching, posts, workers, image_path):
+    transport = XmlRpcTransport(server.url, "user", "pass", batching=batching)
+    before = server.site.requests["xmlrpc"]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        post_ids = list(pool.map(lambda i: publish_one(transport, image_path, i), range(posts)))
+    elapsed = time.perf_counter() - started
+
+    assert len(set(post_ids)) == posts
+    return elapsed, server.site.requests["xmlrpc"] - before
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.05, help="Sunucu tarafı yapay gecikme (saniye)")
+    parser.add_argument("--posts", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--server-concurrency", type=int, default=2)
+    args = parser.parse_args()
+
+    server = fake_wordpress.start(latency=args.latency, max_concurrent=args.server_concurrency or None)
+
+    print(f"{'gruplama':>9} {'süre (s)':>9} {'XML-RPC isteği':>15}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        image_path = os.path.join(temp_dir, "photo.jpg")
+        with open(image_path, "wb") as f:
+            f.write(os.urandom(64 * 1024))
+
+        for batching in (False, True):
+            elapsed, request_count = measure(server, batching, args.posts, args.workers, image_path)
+            print(f"{'açık' if batching else 'kapalı':>9} {elapsed:>9.2f} {request_count:>15}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
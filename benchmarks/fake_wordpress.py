@@ -0,0 +1,231 @@
+"""Testler ve benchmark'lar için yerel WordPress taklidi.
+
+Hem XML-RPC (/xmlrpc.php) hem de REST API (/wp-json/wp/v2/media, /posts, /tags) uç noktalarını
+yanıtlar. Yüklenen dosyalar saklanmaz, yalnızca boyutları kaydedilir. İsteğe bağlı gecikme ile uzak
+bir sunucu, max_concurrent ile de az sayıda PHP işçisi olan bir barındırma taklit edilebilir.
+
+Kullanım:
+    server = start(port=0, latency=0.05)
+    ... server.url ...
+    server.shutdown()
+
+ya da tek başına: python benchmarks/fake_wordpress.py --port 8080
+"""
+import argparse
+import itertools
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xmlrpc.server import SimpleXMLRPCDispatcher
+
+XMLRPC_METHODS = ["wp.newPost", "wp.uploadFile", "wp.getTerms", "wp.newTerm", "system.multicall"]
+
+
+class FakeWordPress:
+    def __init__(self, latency=0.0, max_concurrent=None):
+        self.latency = latency
+        self.slots = threading.BoundedSemaphore(max_concurrent) if max_concurrent else None
+        self.ids = itertools.count(100)
+        self.lock = threading.Lock()
+        self.posts = {}
+        self.media = {}
+        self.tags = {}
+        self.requests = {"xmlrpc": 0, "rest": 0}
+        self.base_url = ""
+
+        self.dispatcher = SimpleXMLRPCDispatcher(allow_none=True, encoding="utf-8")
+        self.dispatcher.register_introspection_functions()
+        self.dispatcher.register_multicall_functions()
+        self.dispatcher.register_function(lambda: XMLRPC_METHODS, "mt.supportedMethods")
+        self.dispatcher.register_function(self._xmlrpc_new_post, "wp.newPost")
+        self.dispatcher.register_function(self._xmlrpc_upload_file, "wp.uploadFile")
+        self.dispatcher.register_function(self._xmlrpc_get_terms, "wp.getTerms")
+        self.dispatcher.register_function(self._xmlrpc_new_term, "wp.newTerm")
+
+    def _next_id(self):
+        with self.lock:
+            return next(self.ids)
+
+    def _store_media(self, name, size):
+        media_id = self._next_id()
+        url = f"{self.base_url}/wp-content/uploads/{media_id}-{name}"
+        self.media[media_id] = {"name": name, "size": size, "url": url}
+        return media_id, url
+
+    def _tag_id(self, name, create=True):
+        with self.lock:
+            for tag_id, tag_name in self.tags.items():
+                if tag_name.lower() == name.lower():
+                    return tag_id
+            if not create:
+                return None
+            tag_id = next(self.ids)
+            self.tags[tag_id] = name
+            return tag_id
+
+    # XML-RPC
+    def _xmlrpc_new_post(self, blog_id, username, password, content):
+        post_id = self._next_id()
+        for name in content.get("terms_names", {}).get("post_tag", []):
+            self._tag_id(name)
+        self.posts[post_id] = content
+        return str(post_id)
+
+    def _xmlrpc_upload_file(self, blog_id, username, password, data):
+        bits = data["bits"]
+        size = len(bits.data) if hasattr(bits, "data") else len(bits)
+        media_id, url = self._store_media(data["name"], size)
+        return {"id": str(media_id), "url": url, "file": data["name"], "type": data["type"]}
+
+    def _xmlrpc_get_terms(self, blog_id, username, password, taxonomy, filter=None):
+        search = (filter or {}).get("search", "").lower()
+        return [
+            {"term_id": str(tag_id), "name": name, "slug": name.lower(), "taxonomy": taxonomy,
+             "term_group": "0", "term_taxonomy_id": str(tag_id), "description": "", "parent": "0", "count": 0}
+            for tag_id, name in self.tags.items() if search in name.lower()
+        ]
+
+    def _xmlrpc_new_term(self, blog_id, username, password, content):
+        return str(self._tag_id(content["name"]))
+
+    # REST
+    @staticmethod
+    def _disposition_filename(disposition):
+        # WordPress gibi filename*= (RFC 5987) varsa onu, yoksa filename= değerini kullanır
+        params = {}
+        for part in disposition.split(";")[1:]:
+            key, _, value = part.strip().partition("=")
+            params[key.lower()] = value.strip().strip('"')
+        encoded = params.get("filename*", "")
+        if encoded.lower().startswith("utf-8''"):
+            return urllib.parse.unquote(encoded[7:])
+        return params.get("filename") or "upload"
+
+    def rest(self, method, path, query, body_reader, headers):
+        if path in ("/wp-json", "/wp-json/"):
+            return 200, {"name": "Fake WordPress", "namespaces": ["wp/v2"]}
+
+        if path == "/wp-json/wp/v2/media" and method == "POST":
+            # Gövde parça parça okunur; sunucu da dosyayı belleğe almaz
+            size = 0
+            for chunk in body_reader():
+                size += len(chunk)
+            name = self._disposition_filename(headers.get("Content-Disposition", ""))
+            media_id, url = self._store_media(name, size)
+            return 201, {"id": media_id, "source_url": url}
+
+        if path == "/wp-json/wp/v2/posts" and method == "POST":
+            payload = json.loads(b"".join(body_reader()) or b"{}")
+            post_id = self._next_id()
+            self.posts[post_id] = payload
+            return 201, {"id": post_id, "status": payload.get("status", "draft")}
+
+        if path == "/wp-json/wp/v2/tags" and method == "GET":
+            search = query.get("search", "").lower()
+            return 200, [{"id": tag_id, "name": name} for tag_id, name in self.tags.items() if search in name.lower()]
+
+        if path == "/wp-json/wp/v2/tags" and method == "POST":
+            payload = json.loads(b"".join(body_reader()) or b"{}")
+            if self._tag_id(payload["name"], create=False) is not None:
+                return 400, {"code": "term_exists", "message": "term_exists"}
+            return 201, {"id": self._tag_id(payload["name"]), "name": payload["name"]}
+
+        return 404, {"code": "rest_no_route", "message": "No route was found"}
+
+
+def _make_handler(site):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _body_chunks(self):
+            remaining = int(self.headers.get("Content-Length", 0))
+            while remaining > 0:
+                chunk = self.rfile.read(min(64 * 1024, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+        def _send(self, status, body, content_type):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        def _handle(self, method):
+            if site.slots is not None:
+                with site.slots:
+                    self._dispatch(method)
+            else:
+                self._dispatch(method)
+
+        def _dispatch(self, method):
+            if site.latency:
+                time.sleep(site.latency)
+
+            path, _, query_string = self.path.partition("?")
+            query = dict(part.split("=", 1) for part in query_string.split("&") if "=" in part)
+
+            if path == "/xmlrpc.php" and method == "POST":
+                site.requests["xmlrpc"] += 1
+                data = b"".join(self._body_chunks())
+                response = site.dispatcher._marshaled_dispatch(data)
+                self._send(200, response, "text/xml")
+                return
+
+            if path.startswith("/wp-content/uploads/"):
+                # Yüklenen dosyalar; silinen ek dosyalar (site.media'dan çıkarılanlar) 404 döner
+                media_id = path.rsplit("/", 1)[-1].split("-", 1)[0]
+                found = media_id.isdigit() and int(media_id) in site.media
+                self._send(200 if found else 404, b"", "application/octet-stream")
+                return
+
+            site.requests["rest"] += 1
+            status, payload = site.rest(method, path, query, self._body_chunks, self.headers)
+            self._send(status, json.dumps(payload).encode("utf-8"), "application/json")
+
+        def do_GET(self):
+            self._handle("GET")
+
+        def do_POST(self):
+            self._handle("POST")
+
+        def do_HEAD(self):
+            self._handle("HEAD")
+
+    return Handler
+
+
+def start(host="127.0.0.1", port=0, latency=0.0, max_concurrent=None):
+    """Sunucuyu arka planda başlatır; dönen nesnede .url ve .site bulunur."""
+    site = FakeWordPress(latency=latency, max_concurrent=max_concurrent)
+    server = ThreadingHTTPServer((host, port), _make_handler(site))
+    server.daemon_threads = True
+    server.site = site
+    server.url = f"http://{host}:{server.server_address[1]}"
+    site.base_url = server.url
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Yerel WordPress taklidi")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--max-concurrent", type=int, default=None)
+    args = parser.parse_args()
+
+    srv = start(args.host, args.port, args.latency, args.max_concurrent)
+    print(f"Sahte WordPress çalışıyor: {srv.url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        srv.shutdown()
@@ -1,34 +1,74 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, make_response, render_template, request, jsonify, stream_with_context
 from dotenv import load_dotenv
+from werkzeug.serving import is_running_from_reloader
 import os
 import json
-import requests
-from io import BytesIO
-from PIL import Image
+import shutil
+import tempfile
+import click
 # Güncellenmiş UI modülünü kullan
-from modules.ui_module import handle_form_submission
+from modules.ui_module import handle_form_submission, prepare_post, publish_prepared_post, PUBLISH_STAGES
 from modules.wordpress_module import WordpressClient
-from modules.image_module import fetch_multiple_images, fetch_and_resize_image
+from modules.image_module import fetch_multiple_images, fetch_multiple_images_preferred, fetch_and_resize_image
 from modules.translation_manager import TranslationManager
 from modules.template_manager import TemplateManager
 from modules.history_manager import HistoryManager
+from modules.image_cache import get_image_cache
+from modules.derivative_cache import get_derivative_cache
+from modules.renditions import get_rendition_engine
+from modules.response_cache import VersionedResponseCache
+from modules.services import init_services
+from modules.static_assets import StaticAssets, compress_response
+from modules.job_queue import JobQueue
+from modules.bulk_import import BulkPipeline, detect_format, iter_rows, open_text, summarize
 
 load_dotenv("config.env")
 
 app = Flask(__name__)
 
+# JS/CSS parmak izli adlarla ve önceden sıkıştırılmış olarak sunulur; büyük HTML/JSON yanıtları gzip'lenir
+static_assets = StaticAssets(app.static_folder, auto_reload=app.debug).init_app(app)
+app.after_request(compress_response)
+
 # Static klasörü oluştur
 os.makedirs("static/images", exist_ok=True)
 
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", 20))
+
+# Pano sayfası yalnızca geçmiş ya da şablonlar değiştiğinde yeniden üretilir
+page_cache = VersionedResponseCache()
+
 wp_client = WordpressClient(
     url=os.getenv("WP_URL"),
     username=os.getenv("WP_USER"),
     password=os.getenv("WP_APP_PASSWORD")
 )
 
-template_manager = TemplateManager()
-history_manager = HistoryManager()
-translation_manager = TranslationManager()
+# Yöneticiler uygulama ömrü boyunca bir kez kurulur ve form gönderimlerinde paylaşılır
+services = init_services(
+    history_manager=HistoryManager(),
+    template_manager=TemplateManager(),
+    translation_manager=TranslationManager(),
+    wp_client=wp_client
+).warm_up()
+
+template_manager = services.template_manager
+history_manager = services.history_manager
+translation_manager = services.translation_manager
+
+# Form gönderimleri kalıcı iş kuyruğuna alınır ve arka planda işlenir. İşçiler içe aktarmada değil,
+# yalnızca istekleri karşılayan süreçte başlatılır (yeniden yükleyicinin izleyici sürecinde başlamaz)
+job_queue = JobQueue(
+    handler=lambda payload, progress: handle_form_submission(payload, wp_client, services, progress=progress),
+    stages=PUBLISH_STAGES,
+    commit_stage="publishing"
+)
+
+
+@app.before_request
+def start_job_workers():
+    # flask run ve WSGI sunucularında ilk istekte başlatılır; sonraki çağrılar bir şey yapmaz
+    job_queue.start()
 
 
 @app.route('/', methods=['GET', 'POST'])
@@ -57,21 +97,137 @@ def index():
                 else:
                     form_data['content_images'] = []
 
-        result = handle_form_submission(form_data, wp_client)
-        return jsonify(result)
+        # Yayınlama arka planda yapılır; istemci durumu /jobs/<id> üzerinden takip eder
+        job_id = job_queue.enqueue(form_data)
+        return jsonify({
+            "status": "queued",
+            "job_id": job_id,
+            "status_url": f"/jobs/{job_id}"
+        }), 202
+
+    # GET isteği: sayfa geçmiş ve şablon sürümüne göre önbellekten sunulur; tarayıcıdaki kopya
+    # güncelse (If-None-Match) gövde gönderilmeden 304 döner
+    version = f"{history_manager.data_version()}.{template_manager.version()}.{static_assets.version}"
+    page = page_cache.get_or_render("index", version, render_dashboard)
+
+    response = make_response(page.body)
+    response.mimetype = "text/html"
+    response.set_etag(page.etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
 
-    # GET isteği için template ve geçmiş verileri hazırla
+
+def render_dashboard():
+    # Geçmişin yalnızca ilk sayfası ve liste sütunları gelir; içerik ve sonraki sayfalar /history'den alınır
     templates = template_manager.get_templates()
-    history = history_manager.get_posts_history()
+    history_page = history_manager.get_posts_page(limit=HISTORY_PAGE_SIZE)
     stats = history_manager.get_post_stats()
 
     return render_template('index.html',
                            templates=templates,
-                           history=history,
+                           history=history_page["posts"],
+                           history_next_cursor=history_page["next_cursor"],
                            stats=stats,
                            wp_url=os.getenv("WP_URL"))
 
 
+def _requested_fields():
+    fields = request.args.get("fields")
+    return [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+
+
+@app.route("/history")
+def history_list():
+    """İmleçle sayfalanmış geçmiş: ?limit=20&cursor=...&fields=title,status"""
+    try:
+        page = history_manager.get_posts_page(
+            limit=request.args.get("limit", HISTORY_PAGE_SIZE, type=int),
+            cursor=request.args.get("cursor"),
+            columns=_requested_fields()
+        )
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return jsonify(page)
+
+
+@app.route("/history/search")
+def history_search():
+    """Geçmişte tam metin arama: ?q=istanbul gezi&limit=20&offset=0"""
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"status": "error", "message": "Arama metni (q) gerekli"}), 400
+    result = history_manager.search_posts(
+        query,
+        limit=request.args.get("limit", HISTORY_PAGE_SIZE, type=int),
+        offset=request.args.get("offset", 0, type=int)
+    )
+    return jsonify(dict(result, query=query))
+
+
+@app.route("/history/<int:post_id>")
+def history_post(post_id):
+    """Tek yazı; ?fields=content ile yalnızca içerik istenebilir."""
+    post = history_manager.get_post(post_id, columns=_requested_fields())
+    if post is None:
+        return jsonify({"status": "error", "message": "Yazı bulunamadı"}), 404
+    return jsonify(post)
+
+
+@app.route("/jobs/<job_id>")
+def job_status(job_id):
+    job = job_queue.get_job(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "İş bulunamadı"}), 404
+    return jsonify(job)
+
+
+def build_bulk_pipeline():
+    """Toplu yayınlama için form gönderimiyle aynı hazırlama/yayınlama adımlarını kullanan boru hattı."""
+    return BulkPipeline(
+        prepare=lambda row: prepare_post(row, services),
+        publish=lambda prepared: publish_prepared_post(prepared, wp_client, services)
+    )
+
+
+@app.route("/bulk_publish", methods=["POST"])
+def bulk_publish():
+    # Yüklenen dosya (multipart ya da ham gövde) diske akıtılır; satırlar yanıt üretilirken oradan okunur
+    upload = request.files.get("file")
+    if upload:
+        fmt = request.args.get("format") or detect_format(upload.filename, upload.mimetype)
+        source_stream = upload.stream
+    else:
+        fmt = request.args.get("format") or detect_format(None, request.content_type)
+        source_stream = request.stream
+
+    binary_stream = tempfile.TemporaryFile()
+    shutil.copyfileobj(source_stream, binary_stream)
+    binary_stream.seek(0)
+
+    results = summarize(build_bulk_pipeline().run(iter_rows(open_text(binary_stream), fmt)))
+
+    def generate():
+        try:
+            for result in results:
+                yield json.dumps(result, ensure_ascii=False, default=str) + "\n"
+        finally:
+            binary_stream.close()
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+@app.cli.command("bulk-import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "fmt", type=click.Choice(["csv", "ndjson"]), default=None,
+              help="Dosya biçimi (varsayılan: uzantıdan belirlenir)")
+def bulk_import_command(path, fmt):
+    """CSV veya NDJSON dosyasındaki yazıları toplu olarak WordPress'e gönderir."""
+    fmt = fmt or detect_format(path)
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        for result in summarize(build_bulk_pipeline().run(iter_rows(f, fmt))):
+            click.echo(json.dumps(result, ensure_ascii=False, default=str))
+
+
 # Çeviri sisteminin durumunu değiştirmek için yeni bir route
 @app.route("/toggle_translation", methods=["POST"])
 def toggle_translation():
@@ -120,6 +276,34 @@ def translate_keywords():
         })
 
 
+@app.route("/translate_keywords_batch", methods=["POST"])
+def translate_keywords_batch():
+    data = request.get_json(silent=True) or {}
+    texts = data.get("texts", [])
+    if not isinstance(texts, list):
+        return jsonify({"status": "error", "message": "texts bir liste olmalıdır"}), 400
+
+    texts = [text for text in texts if isinstance(text, str)]
+
+    try:
+        translations = translation_manager.translate_many(texts)
+    except Exception as e:
+        print(f"Toplu çeviri hatası: {e}")
+        return jsonify({
+            "translations": {text: text for text in texts},
+            "translated": texts,
+            "error": f"Çeviri işlemi sırasında bir hata oluştu: {str(e)}"
+        })
+
+    response = {
+        "translations": translations,
+        "translated": [translations.get(text, text) for text in texts]
+    }
+    if not translation_manager.enabled:
+        response["translation_disabled"] = True
+    return jsonify(response)
+
+
 @app.route("/fetch_images")
 def fetch_images():
     keywords = request.args.get("keywords", "")
@@ -150,36 +334,57 @@ def fetch_images():
 
         return jsonify({"image_urls": image_urls, "image_sizes": image_sizes})
 
-    # Çeviri etkinse, aşağıdaki logik kullanılır
-    image_urls = []
-    image_sizes = []
-
-    # Önce çevrilmiş anahtar kelimelerle dene (eğer orijinal kelimelerden farklıysa)
+    # Çeviri etkinse, çevrilmiş ve orijinal kelimelerle aramalar paralel başlatılır.
+    # Çevrilmiş kelimelerin sonucu tercih edilir; sonuç yoksa orijinal kelimelerin sonucu kullanılır.
+    queries = []
     if translated_keywords and translated_keywords != keywords:
-        print(f"Çevrilmiş kelimelerle arama yapılıyor: {translated_keywords}")
-        image_urls, image_sizes = fetch_multiple_images(
-            translated_keywords,
-            count=8,
-            source=source,
-            min_width=min_width,
-            min_height=min_height
-        )
-
-    # Eğer çevrilmiş kelimelerle sonuç bulunmadıysa veya çeviri yapılmadıysa,
-    # orijinal kelimelerle tekrar dene
-    if not image_urls:
-        print(f"Orijinal kelimelerle arama yapılıyor: {keywords}")
-        image_urls, image_sizes = fetch_multiple_images(
-            keywords,
-            count=8,
-            source=source,
-            min_width=min_width,
-            min_height=min_height
-        )
+        queries.append(translated_keywords)
+    queries.append(keywords)
+
+    print(f"Paralel arama yapılıyor: {queries}")
+    image_urls, image_sizes, used_query = fetch_multiple_images_preferred(
+        queries,
+        count=8,
+        source=source,
+        min_width=min_width,
+        min_height=min_height
+    )
+    if used_query:
+        print(f"Sonuçlar şu kelimelerle bulundu: {used_query}")
 
     return jsonify({"image_urls": image_urls, "image_sizes": image_sizes})
 
 
+@app.route("/image_cache_stats")
+def image_cache_stats():
+    return jsonify(get_image_cache().stats())
+
+
+@app.route("/derivative_cache_stats")
+def derivative_cache_stats():
+    return jsonify(get_derivative_cache().stats())
+
+
+@app.route("/rendition_stats")
+def rendition_stats():
+    return jsonify(get_rendition_engine().stats())
+
+
+@app.route("/page_cache_stats")
+def page_cache_stats():
+    return jsonify(page_cache.stats())
+
+
+@app.route("/static_asset_stats")
+def static_asset_stats():
+    return jsonify(static_assets.stats())
+
+
+@app.route("/media_index_stats")
+def media_index_stats():
+    return jsonify(wp_client.media_index.stats())
+
+
 @app.route('/save_template', methods=['POST'])
 def save_template():
     try:
@@ -202,50 +407,24 @@ def resize_image():
         if not image_url:
             return jsonify({"status": "error", "message": "Görsel URL'i gereklidir"})
 
-        # Görsel indir
-        response = requests.get(image_url)
-        img = Image.open(BytesIO(response.content))
-
-        # Dosya adı oluştur
-        filename = f"resized_{os.path.basename(image_url)}"
-        if '?' in filename:
-            filename = filename.split('?')[0]
-
-        if not filename.endswith(('.jpg', '.jpeg', '.png')):
-            filename += '.jpg'
-
-        output_path = os.path.join('static', 'images', filename)
-
-        # Görsel boyutlandır
-        try:
-            if maintain_aspect:
-                # En-boy oranını koru
-                img.thumbnail((width, height), Image.Resampling.LANCZOS)
-            else:
-                # Tam boyutlandırma
-                img = img.resize((width, height), Image.Resampling.LANCZOS)
-        except AttributeError:
-            # Eski PIL sürümleri için
-            if maintain_aspect:
-                img.thumbnail((width, height), Image.LANCZOS)
-            else:
-                img = img.resize((width, height), Image.LANCZOS)
-
-        # Kaydet
-        img.save(output_path)
-
-        # Yeni boyutları al
-        new_size = img.size
+        # Aynı kaynak ve boyutlar için türev diskten sunulur; kaynak yalnızca değiştiyse yeniden işlenir
+        derivative = get_derivative_cache().get_or_create(
+            image_url, width, height, maintain_aspect, data.get('format')
+        )
 
         # URL döndür
         return jsonify({
             "status": "success",
-            "resized_url": f"/static/images/{filename}",
-            "new_size": new_size
+            "resized_url": derivative["url"],
+            "new_size": derivative["size"],
+            "cached": derivative["cached"],
+            "memory": derivative.get("memory")
         })
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)})
 
-
 if __name__ == '__main__':
+    # debug=True yeniden yükleyiciyle çalışır; bekleyen işler sunucu alt sürecinde hemen ele alınır
+    if is_running_from_reloader():
+        job_queue.start()
     app.run(debug=True)
\ No newline at end of file
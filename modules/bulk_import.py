@@ -0,0 +1,165 @@
+import csv
+import io
+import json
+import os
+import queue
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv("config.env")
+
+# Toplu içe aktarmada tanınan alanlar; diğer sütunlar da forma aynen geçirilir
+REQUIRED_FIELDS = ("title", "content", "keywords")
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None) -> str:
+    """Dosya adı veya içerik tipinden 'csv' ya da 'ndjson' biçimini belirler."""
+    name = (filename or "").lower()
+    content_type = (content_type or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in content_type or "jsonl" in content_type:
+        return "ndjson"
+    return "csv"
+
+
+def iter_rows(text_stream: Iterable[str], fmt: str) -> Iterator[Dict]:
+    """CSV veya NDJSON akışını satır satır okur; dosyanın tamamı belleğe alınmaz."""
+    if fmt == "ndjson":
+        for line in text_stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield {"_error": f"Geçersiz JSON satırı: {e}"}
+                continue
+            yield row if isinstance(row, dict) else {"_error": "Satır bir JSON nesnesi değil"}
+    else:
+        reader = csv.DictReader(text_stream)
+        for row in reader:
+            yield {key.strip(): (value or "").strip() for key, value in row.items() if key}
+
+
+def open_text(binary_stream, encoding: str = "utf-8-sig"):
+    """İkili akışı satır satır okunabilen metin akışına çevirir."""
+    return io.TextIOWrapper(binary_stream, encoding=encoding, newline="")
+
+
+class BulkPipeline:
+    """Satırları hazırlama ve yayınlama aşamalarından, her aşamada sınırlı eşzamanlılıkla geçirir.
+
+    Sonuçlar tamamlandıkça üretilir (generator). Aynı anda işlenen satır sayısı max_in_flight ile
+    sınırlıdır; tüketici yavaşsa okuma da bekler, böylece bellek kullanımı dosya boyutundan bağımsızdır.
+    """
+
+    def __init__(self, prepare: Callable[[Dict], Dict], publish: Callable[[Dict], Dict],
+                 prepare_workers: Optional[int] = None, publish_workers: Optional[int] = None,
+                 max_in_flight: Optional[int] = None):
+        self.prepare = prepare
+        self.publish = publish
+        self.prepare_workers = prepare_workers or int(os.getenv("BULK_PREPARE_WORKERS", 4))
+        self.publish_workers = publish_workers or int(os.getenv("BULK_PUBLISH_WORKERS", 2))
+        self.max_in_flight = max_in_flight or 2 * (self.prepare_workers + self.publish_workers)
+
+    @staticmethod
+    def _validate(row: Dict) -> Optional[str]:
+        if "_error" in row:
+            return row["_error"]
+        missing = [field for field in REQUIRED_FIELDS if not row.get(field)]
+        if missing:
+            return f"Eksik alanlar: {', '.join(missing)}"
+        return None
+
+    def run(self, rows: Iterable[Dict]) -> Iterator[Dict]:
+        results = queue.Queue()
+        slots = threading.BoundedSemaphore(self.max_in_flight)
+        stop = threading.Event()
+        feed_done = object()
+
+        prepare_pool = ThreadPoolExecutor(max_workers=self.prepare_workers, thread_name_prefix="bulk-prepare")
+        publish_pool = ThreadPoolExecutor(max_workers=self.publish_workers, thread_name_prefix="bulk-publish")
+
+        def finish(row_no, row, result):
+            result = dict(result)
+            result["row"] = row_no
+            result.setdefault("title", row.get("title"))
+            results.put(result)
+
+        def publish_stage(row_no, row, prepared):
+            try:
+                finish(row_no, row, self.publish(prepared))
+            except Exception as e:
+                traceback.print_exc()
+                finish(row_no, row, {"status": "error", "stage": "publish", "message": str(e)})
+
+        def prepare_stage(row_no, row):
+            try:
+                prepared = self.prepare(row)
+            except Exception as e:
+                traceback.print_exc()
+                finish(row_no, row, {"status": "error", "stage": "prepare", "message": str(e)})
+                return
+            publish_pool.submit(publish_stage, row_no, row, prepared)
+
+        def feeder():
+            count = 0
+            try:
+                for row_no, row in enumerate(rows, 1):
+                    slots.acquire()
+                    if stop.is_set():
+                        slots.release()
+                        break
+                    count += 1
+                    error = self._validate(row)
+                    if error:
+                        finish(row_no, row, {"status": "error", "stage": "validate", "message": error})
+                    else:
+                        prepare_pool.submit(prepare_stage, row_no, row)
+            except Exception as e:
+                traceback.print_exc()
+                count += 1
+                results.put({"row": None, "status": "error", "stage": "read", "message": str(e)})
+            results.put((feed_done, count))
+
+        feeder_thread = threading.Thread(target=feeder, name="bulk-feeder", daemon=True)
+        feeder_thread.start()
+
+        emitted = 0
+        total = None
+        try:
+            while total is None or emitted < total:
+                item = results.get()
+                if isinstance(item, tuple) and item[0] is feed_done:
+                    total = item[1]
+                    continue
+                emitted += 1
+                if item.get("row") is not None:
+                    slots.release()
+                yield item
+        finally:
+            # Tüketici erken durursa (ör. istemci bağlantıyı kapattı) yeni satır okunmaz
+            stop.set()
+            for _ in range(self.max_in_flight):
+                try:
+                    slots.release()
+                except ValueError:
+                    break
+            prepare_pool.shutdown(wait=False)
+            publish_pool.shutdown(wait=False)
+
+
+def summarize(results: Iterable[Dict]) -> Iterator[Dict]:
+    """Sonuçları aynen geçirir ve sonda bir özet satırı ekler."""
+    summary = {"total": 0, "succeeded": 0, "failed": 0}
+    for result in results:
+        summary["total"] += 1
+        if result.get("status") == "success":
+            summary["succeeded"] += 1
+        else:
+            summary["failed"] += 1
+        yield result
+    yield {"summary": summary}
@@ -0,0 +1,255 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from dotenv import load_dotenv
+
+from modules.http_client import get_http_client
+from modules.image_safety import stream_response_to_file
+from modules.renditions import FORMAT_EXTENSIONS, get_rendition_engine
+
+load_dotenv("config.env")
+
+
+def normalize_format(fmt: Optional[str], image_url: str) -> str:
+    """İstenen çıktı biçimini belirler; belirtilmemişse kaynak uzantısına göre png ya da jpeg seçilir."""
+    fmt = (fmt or "").lower().strip(".")
+    if fmt == "jpg":
+        fmt = "jpeg"
+    if fmt in FORMAT_EXTENSIONS:
+        return fmt
+    return "png" if urlparse(image_url).path.lower().endswith(".png") else "jpeg"
+
+
+class DerivativeCache:
+    """/resize_image türevlerini (kaynak URL, genişlik, yükseklik, oran, biçim) özetiyle diskte saklar.
+
+    Aynı istek tekrarlandığında dosya doğrudan diskten sunulur. Kaynak görsel revalidate_interval
+    dolduğunda ETag/Last-Modified ile koşullu olarak yeniden istenir; 304 yanıtında türev aynen kullanılır.
+    Dizin boyutu max_bytes'ı aşarsa en uzun süredir kullanılmayan türevler silinir.
+    """
+
+    def __init__(self, directory: str = os.path.join("static", "images", "derivatives"),
+                 db_file: str = "derivative_cache.db", max_bytes: Optional[int] = None,
+                 revalidate_interval: Optional[int] = None):
+        self.directory = directory
+        self.db_file = db_file
+        self.max_bytes = max_bytes or int(os.getenv("DERIVATIVE_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+        self.revalidate_interval = (revalidate_interval if revalidate_interval is not None
+                                    else int(os.getenv("DERIVATIVE_REVALIDATE_INTERVAL", 60 * 60)))
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+        # Aynı türev için eşzamanlı istekler kaynağı tek kez indirsin
+        self._key_locks = [threading.Lock() for _ in range(64)]
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_file, timeout=10)
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sources (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    version TEXT NOT NULL,
+                    checked_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS derivatives (
+                    cache_key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    source_version TEXT NOT NULL,
+                    width INTEGER NOT NULL,
+                    height INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_derivatives_last_access ON derivatives (last_access)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_derivatives_url ON derivatives (url)")
+
+    @staticmethod
+    def make_key(image_url: str, width: int, height: int, maintain_aspect: bool, fmt: str) -> str:
+        raw = json.dumps([image_url, int(width), int(height), bool(maintain_aspect), fmt])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def url_for(self, path: str) -> str:
+        return "/" + path.replace(os.sep, "/")
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get_or_create(self, image_url: str, width: int, height: int, maintain_aspect: bool = True,
+                      fmt: Optional[str] = None) -> Dict:
+        """Türevi önbellekten döndürür ya da kaynağı indirip oluşturur.
+
+        Dönen sözlükte path, url, size (genişlik, yükseklik) ve cached alanları, yeni oluşturulan türevlerde
+        ayrıca işlemin bellek ölçümü (memory) bulunur.
+        """
+        fmt = normalize_format(fmt, image_url)
+        key = self.make_key(image_url, width, height, maintain_aspect, fmt)
+
+        with self._key_locks[int(key[:8], 16) % len(self._key_locks)]:
+            with self._connect() as conn:
+                derivative = conn.execute(
+                    "SELECT path, source_version, width, height FROM derivatives WHERE cache_key = ?", (key,)
+                ).fetchone()
+                source = conn.execute(
+                    "SELECT etag, last_modified, version, checked_at FROM sources WHERE url = ?", (image_url,)
+                ).fetchone()
+
+            usable = (derivative is not None and source is not None
+                      and derivative[1] == source[2] and os.path.exists(derivative[0]))
+
+            if usable and time.time() - source[3] < self.revalidate_interval:
+                self._count("hits")
+                return self._serve(key, derivative)
+
+            # Türev kullanılabilir durumdaysa kaynak yalnızca değişmişse indirilir
+            headers = {}
+            if usable:
+                if source[0]:
+                    headers["If-None-Match"] = source[0]
+                if source[1]:
+                    headers["If-Modified-Since"] = source[1]
+
+            response = get_http_client().get(image_url, headers=headers, stream=True)
+            try:
+                if usable and response.status_code == 304:
+                    with self._connect() as conn:
+                        conn.execute("UPDATE sources SET checked_at = ? WHERE url = ?", (time.time(), image_url))
+                    self._count("revalidated")
+                    return self._serve(key, derivative)
+
+                response.raise_for_status()
+                self._count("misses")
+                return self._create(key, image_url, width, height, maintain_aspect, fmt, response, derivative)
+            finally:
+                response.close()
+
+    def _serve(self, key: str, derivative) -> Dict:
+        with self._connect() as conn:
+            conn.execute("UPDATE derivatives SET last_access = ? WHERE cache_key = ?", (time.time(), key))
+        return {"path": derivative[0], "url": self.url_for(derivative[0]),
+                "size": (derivative[2], derivative[3]), "cached": True}
+
+    def _create(self, key: str, image_url: str, width: int, height: int, maintain_aspect: bool, fmt: str,
+                response, old_derivative) -> Dict:
+        subdir = os.path.join(self.directory, key[:2])
+        os.makedirs(subdir, exist_ok=True)
+
+        # Kaynak diske akıtılır; boyutlandırma süreç havuzunda dosyadan yapılır
+        fd, source_path = tempfile.mkstemp(prefix="derivative-source-")
+        digest = hashlib.sha256()
+        try:
+            with os.fdopen(fd, "wb") as f:
+                stream_response_to_file(response, f, digest=digest)
+
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            version = etag or last_modified or digest.hexdigest()
+
+            # Kaynak sürümü dosya adına eklenir; kaynak değişince tarayıcı önbelleğindeki eski dosya kullanılmaz
+            version_tag = hashlib.sha256(version.encode("utf-8")).hexdigest()[:8]
+            path = os.path.join(subdir, f"{key}-{version_tag}.{FORMAT_EXTENSIONS[fmt]}")
+
+            # Yarım yazılmış dosya sunulmasın diye önce geçici dosyaya yazılır
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                result = get_rendition_engine().resize(source_path, temp_path, width, height,
+                                                       maintain_aspect, fmt)
+                new_size = result["size"]
+                os.replace(temp_path, path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        finally:
+            if os.path.exists(source_path):
+                os.remove(source_path)
+
+        if old_derivative and old_derivative[0] != path and os.path.exists(old_derivative[0]):
+            os.remove(old_derivative[0])
+
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO sources (url, etag, last_modified, version, checked_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (image_url, etag, last_modified, version, now))
+            conn.execute("""
+                INSERT OR REPLACE INTO derivatives
+                    (cache_key, url, path, source_version, width, height, size, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (key, image_url, path, version, new_size[0], new_size[1], os.path.getsize(path), now, now))
+            self._evict(conn, keep=key)
+
+        return {"path": path, "url": self.url_for(path), "size": new_size, "cached": False,
+                "memory": result["memory"]}
+
+    def _evict(self, conn, keep: Optional[str] = None) -> None:
+        """Toplam boyut sınırı aşılıyorsa en az kullanılan türevleri ve dosyalarını siler (keep hariç)."""
+        total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM derivatives").fetchone()[0]
+
+        while total_bytes > self.max_bytes:
+            row = conn.execute(
+                "SELECT cache_key, path, size FROM derivatives WHERE cache_key != ? ORDER BY last_access ASC LIMIT 1",
+                (keep or "",)
+            ).fetchone()
+            if not row:
+                break
+            conn.execute("DELETE FROM derivatives WHERE cache_key = ?", (row[0],))
+            if os.path.exists(row[1]):
+                os.remove(row[1])
+            total_bytes -= row[2]
+
+        # Türevi kalmayan kaynak kayıtları da silinir
+        conn.execute("DELETE FROM sources WHERE url NOT IN (SELECT DISTINCT url FROM derivatives)")
+
+    def stats(self) -> Dict:
+        with self._connect() as conn:
+            entries, total_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM derivatives"
+            ).fetchone()
+        with self._lock:
+            hits, misses, revalidated = self.hits, self.misses, self.revalidated
+        lookups = hits + misses + revalidated
+        return {
+            "hits": hits,
+            "misses": misses,
+            "revalidated": revalidated,
+            "hit_ratio": round((hits + revalidated) / lookups, 3) if lookups else 0,
+            "entries": entries,
+            "bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_derivative_cache() -> DerivativeCache:
+    """Uygulama genelinde paylaşılan DerivativeCache örneğini döndürür."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = DerivativeCache()
+    return _default_cache
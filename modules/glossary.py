@@ -0,0 +1,180 @@
+import json
+import os
+import re
+import threading
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv("config.env")
+
+# Yerleşik Türkçe-İngilizce sözlük
+DEFAULT_GLOSSARY = {
+    "gezilecek yerler": "places to visit",
+    "tatil": "vacation",
+    "gezi": "travel",
+    "tur": "tour",
+    "rehber": "guide",
+    "blog": "blog",
+    "tarih": "history",
+    "deniz": "sea",
+    "plaj": "beach",
+    "kültür": "culture",
+    "yemek": "food",
+    "otel": "hotel",
+    "müze": "museum",
+    "şehir": "city",
+    "doğa": "nature",
+    "manzara": "landscape",
+    "münih": "munich",
+    "berlin": "berlin",
+    "istanbul": "istanbul",
+    "antalya": "antalya",
+    "izmir": "izmir",
+    "paris": "paris",
+    "londra": "london",
+    "roma": "rome",
+    "atina": "athens",
+    "barselona": "barcelona",
+    "venedik": "venice",
+    "almanya": "germany",
+    "fransa": "france",
+    "italya": "italy",
+    "yunanistan": "greece",
+    "ispanya": "spain"
+}
+
+# 'İ'.lower() iki karakter üretir ve konumları kaydırır; bu yüzden önce tek karaktere eşlenir
+_CASE_FOLD_MAP = str.maketrans({"İ": "i"})
+
+
+def fold_case(text: str) -> str:
+    """Metni karşılaştırma için küçük harfe çevirir, uzunluğu koruyarak."""
+    return text.translate(_CASE_FOLD_MAP).lower()
+
+
+def _trie_to_pattern(node: Dict) -> str:
+    """Trie düğümünü, ortak önekleri paylaşan bir regex parçasına dönüştürür."""
+    is_end = "" in node
+    branches = [re.escape(ch) + _trie_to_pattern(child) for ch, child in sorted(node.items()) if ch != ""]
+
+    if not branches:
+        return ""
+
+    if len(branches) == 1 and not is_end:
+        return branches[0]
+
+    pattern = "(?:" + "|".join(branches) + ")"
+    # Açgözlü '?' sayesinde önce en uzun eşleşme denenir
+    return pattern + "?" if is_end else pattern
+
+
+class Glossary:
+    """Bir kez derlenen, tek geçişte çoklu kelime eşleştirmesi yapan sözlük motoru.
+
+    Tüm terimler ortak önekleri paylaşan tek bir regex'e (trie-regex) derlenir. Eşleşme kelime
+    sınırlarına duyarlıdır, büyük/küçük harften bağımsızdır ve her konumda en uzun terimi seçer.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, str]] = None):
+        self._entries = {}
+        self._pattern = None
+        self.update(entries if entries is not None else DEFAULT_GLOSSARY)
+
+    def update(self, entries: Dict[str, str]) -> None:
+        for source, target in entries.items():
+            source = " ".join(fold_case(str(source)).split())
+            if source:
+                self._entries[source] = str(target)
+        self._compile()
+
+    def _compile(self) -> None:
+        trie = {}
+        for term in self._entries:
+            node = trie
+            for ch in term:
+                node = node.setdefault(ch, {})
+            node[""] = True
+
+        if not trie:
+            self._pattern = None
+            return
+
+        self._pattern = re.compile(r"(?<!\w)" + _trie_to_pattern(trie) + r"(?!\w)")
+
+    def load_file(self, path: str) -> int:
+        """Harici sözlük dosyasını yükler (.json sözlük ya da her satırı 'tr<TAB>en' olan metin dosyası)."""
+        entries = {}
+        if path.endswith(".json"):
+            with open(path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.rstrip("\n")
+                    if not line or line.startswith("#") or "\t" not in line:
+                        continue
+                    source, target = line.split("\t", 1)
+                    entries[source] = target.strip()
+
+        self.update(entries)
+        return len(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, term: str) -> bool:
+        return fold_case(term) in self._entries
+
+    @staticmethod
+    def _match_case(original: str, replacement: str) -> str:
+        if original.isupper() and len(original) > 1:
+            return replacement.upper()
+        if original[:1].isupper():
+            return replacement[:1].upper() + replacement[1:]
+        return replacement
+
+    def translate(self, text: str) -> str:
+        """Metindeki sözlük terimlerini tek geçişte İngilizce karşılıklarıyla değiştirir."""
+        if not text or self._pattern is None:
+            return text
+
+        lowered = fold_case(text)
+        # Küçük harfe çevirme uzunluğu değiştirdiyse konumlar kayar; bu durumda küçük harfli metin üzerinde çalış
+        base = text if len(lowered) == len(text) else lowered
+
+        parts = []
+        last = 0
+        for match in self._pattern.finditer(lowered):
+            start, end = match.span()
+            parts.append(base[last:start])
+            parts.append(self._match_case(base[start:end], self._entries[match.group(0)]))
+            last = end
+
+        if not parts:
+            return text
+
+        parts.append(base[last:])
+        return "".join(parts)
+
+
+_default_glossary = None
+_default_glossary_lock = threading.Lock()
+
+
+def get_glossary() -> Glossary:
+    """Uygulama genelinde paylaşılan sözlüğü döndürür; GLOSSARY_FILE tanımlıysa onu da yükler."""
+    global _default_glossary
+    if _default_glossary is None:
+        with _default_glossary_lock:
+            if _default_glossary is None:
+                glossary = Glossary()
+                glossary_file = os.getenv("GLOSSARY_FILE")
+                if glossary_file and os.path.exists(glossary_file):
+                    try:
+                        count = glossary.load_file(glossary_file)
+                        print(f"{count} sözlük terimi {glossary_file} dosyasından yüklendi.")
+                    except Exception as e:
+                        print(f"Sözlük dosyası yükleme hatası: {e}")
+                _default_glossary = glossary
+    return _default_glossary
@@ -1,70 +1,666 @@
+import base64
+import html
+import re
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime
 import json
 import os
+import queue
+import threading
+
+from modules.near_duplicates import (DUPLICATE_THRESHOLD, estimate_similarity, lsh_buckets, minhash_signature,
+                                     signature_from_blob, signature_to_blob)
+
+# Geçmiş API'sinde istenebilecek sütunlar; liste görünümünde içerik (content) varsayılan olarak gelmez
+HISTORY_COLUMNS = ("id", "title", "content", "keywords", "image_url", "wordpress_id",
+                   "created_at", "status", "template_used")
+LIST_COLUMNS = ("id", "title", "keywords", "image_url", "wordpress_id", "created_at", "status", "template_used")
+MAX_PAGE_SIZE = 100
+# Yakın kopya aramasında imzası karşılaştırılacak en fazla aday (en çok bant paylaşanlar önce)
+MAX_DUPLICATE_CANDIDATES = 200
+
+# Arama sonuçlarında başlık ve anahtar kelime eşleşmeleri içerikteki eşleşmelerden ağır basar (bm25 ağırlıkları)
+SEARCH_RANK = "bm25(10.0, 5.0, 1.0)"
+# Özet içindeki eşleşme işaretleri; HTML kaçışından sonra <mark> ile değiştirilir
+_MARK_OPEN, _MARK_CLOSE = "\x02", "\x03"
+
+_HTML_SKIP_PATTERN = re.compile(r"<!--.*?-->|<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_HTML_TAG_PATTERN = re.compile(r"<[^>]+>")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_SEARCH_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def html_to_text(content):
+    """HTML içeriği arama dizini için düz metne çevirir (posts.content_text sütununa yazılır)."""
+    if not content:
+        return ""
+    text = _HTML_SKIP_PATTERN.sub(" ", content)
+    text = _HTML_TAG_PATTERN.sub(" ", text)
+    return _WHITESPACE_PATTERN.sub(" ", html.unescape(text)).strip()
+
+
+def signature_text(title, keywords, content):
+    """Yakın kopya imzasına giren metin: kullanıcının başlığı, anahtar kelimeleri ve içeriği.
+
+    Şablonla üretilen HTML kullanılmaz; her yazıda tekrarlanan şablon metni ilgisiz yazıları benzer gösterir.
+    """
+    return " ".join(part for part in (title or "", keywords or "", html_to_text(content)) if part)
+
+
+def build_match_query(query):
+    """Kullanıcı girdisini güvenli bir FTS5 sorgusuna çevirir; son kelime önek olarak aranır.
+
+    FTS5 sözdizimi (OR, NEAR, tırnak, sütun filtresi) kullanıcıya açılmaz; her kelime tırnaklanır ve
+    tüm kelimelerin geçtiği yazılar döner. Aranacak kelime yoksa None döner.
+    """
+    terms = _SEARCH_TERM_PATTERN.findall(query or "")
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+# Şema sürümleri: (sürüm, açıklama, SQL ifadeleri). Uygulanan son sürüm PRAGMA user_version'da tutulur.
+# Yeni bir değişiklik için listenin sonuna bir sonraki sürüm numarasıyla ekleme yapılır; eski girdiler değiştirilmez.
+MIGRATIONS = [
+    (1, "posts tablosu", [
+        """
+        CREATE TABLE IF NOT EXISTS posts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            keywords TEXT NOT NULL,
+            image_url TEXT,
+            wordpress_id INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            status TEXT DEFAULT 'published',
+            template_used TEXT
+        )
+        """,
+    ]),
+    (2, "geçmiş listesi ve durum filtreleri için indeksler", [
+        "CREATE INDEX IF NOT EXISTS idx_posts_created_at ON posts (created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_posts_status ON posts (status)",
+    ]),
+    (3, "istatistik özet tabloları ve tetikleyicileri", [
+        """
+        CREATE TABLE IF NOT EXISTS post_daily_counts (
+            day TEXT PRIMARY KEY,
+            post_count INTEGER NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS post_totals (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total_posts INTEGER NOT NULL,
+            active_days INTEGER NOT NULL
+        )
+        """,
+        # Mevcut kayıtlar için özetleri bir kez hesapla
+        "DELETE FROM post_daily_counts",
+        """
+        INSERT INTO post_daily_counts (day, post_count)
+        SELECT DATE(created_at), COUNT(*) FROM posts WHERE created_at IS NOT NULL GROUP BY DATE(created_at)
+        """,
+        """
+        INSERT OR REPLACE INTO post_totals (id, total_posts, active_days)
+        VALUES (1, (SELECT COUNT(*) FROM posts), (SELECT COUNT(*) FROM post_daily_counts))
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS posts_stats_insert AFTER INSERT ON posts
+        BEGIN
+            UPDATE post_totals SET active_days = active_days + 1
+            WHERE NEW.created_at IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM post_daily_counts WHERE day = DATE(NEW.created_at));
+            INSERT INTO post_daily_counts (day, post_count)
+            SELECT DATE(NEW.created_at), 1 WHERE NEW.created_at IS NOT NULL
+            ON CONFLICT(day) DO UPDATE SET post_count = post_count + 1;
+            UPDATE post_totals SET total_posts = total_posts + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS posts_stats_delete AFTER DELETE ON posts
+        BEGIN
+            UPDATE post_daily_counts SET post_count = post_count - 1 WHERE day = DATE(OLD.created_at);
+            UPDATE post_totals SET
+                total_posts = total_posts - 1,
+                active_days = active_days - (
+                    SELECT COUNT(*) FROM post_daily_counts WHERE day = DATE(OLD.created_at) AND post_count <= 0
+                );
+            DELETE FROM post_daily_counts WHERE day = DATE(OLD.created_at) AND post_count <= 0;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS posts_stats_update AFTER UPDATE OF created_at ON posts
+        WHEN DATE(OLD.created_at) IS NOT DATE(NEW.created_at)
+        BEGIN
+            UPDATE post_daily_counts SET post_count = post_count - 1 WHERE day = DATE(OLD.created_at);
+            UPDATE post_totals SET active_days = active_days - (
+                SELECT COUNT(*) FROM post_daily_counts WHERE day = DATE(OLD.created_at) AND post_count <= 0
+            );
+            DELETE FROM post_daily_counts WHERE day = DATE(OLD.created_at) AND post_count <= 0;
+            UPDATE post_totals SET active_days = active_days + 1
+            WHERE NEW.created_at IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM post_daily_counts WHERE day = DATE(NEW.created_at));
+            INSERT INTO post_daily_counts (day, post_count)
+            SELECT DATE(NEW.created_at), 1 WHERE NEW.created_at IS NOT NULL
+            ON CONFLICT(day) DO UPDATE SET post_count = post_count + 1;
+        END
+        """,
+    ]),
+    # html_to_text() SQL fonksiyonu yalnızca geçiş sırasında kaydedilir; tetikleyiciler sürüm 7'de değiştirildi
+    (4, "başlık, anahtar kelime ve içerik için tam metin arama dizini", [
+        # Aksanlar katlanır (şehir ~ sehir); 2-3 harflik önekler ayrıca dizinlenir, önek aramaları (ist*) hızlanır
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+            title, keywords, body,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3 4'
+        )
+        """,
+        f"INSERT INTO posts_fts (posts_fts, rank) VALUES ('rank', '{SEARCH_RANK}')",
+        # Mevcut kayıtları dizine ekle
+        "DELETE FROM posts_fts",
+        """
+        INSERT INTO posts_fts (rowid, title, keywords, body)
+        SELECT id, title, keywords, html_to_text(content) FROM posts
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON posts
+        BEGIN
+            INSERT INTO posts_fts (rowid, title, keywords, body)
+            VALUES (NEW.id, NEW.title, NEW.keywords, html_to_text(NEW.content));
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS posts_fts_delete AFTER DELETE ON posts
+        BEGIN
+            DELETE FROM posts_fts WHERE rowid = OLD.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS posts_fts_update AFTER UPDATE OF title, keywords, content ON posts
+        BEGIN
+            DELETE FROM posts_fts WHERE rowid = OLD.id;
+            INSERT INTO posts_fts (rowid, title, keywords, body)
+            VALUES (NEW.id, NEW.title, NEW.keywords, html_to_text(NEW.content));
+        END
+        """,
+        "INSERT INTO posts_fts (posts_fts) VALUES ('optimize')",
+    ]),
+    # İmzalar Python'da hesaplanır; mevcut yazılar için HistoryManager arka planda doldurur
+    (5, "yakın kopya tespiti için MinHash imzaları ve LSH kovaları", [
+        """
+        CREATE TABLE IF NOT EXISTS post_minhash (
+            post_id INTEGER PRIMARY KEY,
+            signature BLOB
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS post_lsh_buckets (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            post_id INTEGER NOT NULL,
+            PRIMARY KEY (band, bucket, post_id)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_post_lsh_buckets_post ON post_lsh_buckets (post_id)",
+        """
+        CREATE TRIGGER IF NOT EXISTS posts_minhash_delete AFTER DELETE ON posts
+        BEGIN
+            DELETE FROM post_lsh_buckets WHERE post_id = OLD.id;
+            DELETE FROM post_minhash WHERE post_id = OLD.id;
+        END
+        """,
+        # Metni değişen yazının imzası geçersizleşir; bir sonraki doldurmada yeniden hesaplanır
+        """
+        CREATE TRIGGER IF NOT EXISTS posts_minhash_update AFTER UPDATE OF title, content ON posts
+        BEGIN
+            DELETE FROM post_lsh_buckets WHERE post_id = OLD.id;
+            DELETE FROM post_minhash WHERE post_id = OLD.id;
+        END
+        """,
+    ]),
+    # Yazılara her yazımda artan sayaç; başka süreçlerden (toplu içe aktarma) yapılan değişiklikleri de kapsar
+    (6, "önbellek doğrulaması için veri sürümü", [
+        """
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+        """,
+        "INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)",
+        """
+        CREATE TRIGGER IF NOT EXISTS posts_version_insert AFTER INSERT ON posts
+        BEGIN
+            UPDATE data_version SET version = version + 1 WHERE id = 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS posts_version_delete AFTER DELETE ON posts
+        BEGIN
+            UPDATE data_version SET version = version + 1 WHERE id = 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS posts_version_update AFTER UPDATE ON posts
+        BEGIN
+            UPDATE data_version SET version = version + 1 WHERE id = 1;
+        END
+        """,
+    ]),
+    # Düz metin save_post içinde Python'da hesaplanır; tetikleyiciler yalnızca yerleşik SQL kullanır, böylece
+    # sqlite3 kabuğu gibi başka istemciler de posts tablosuna yazabilir (content_text boşsa HTML dizinlenir)
+    (7, "arama dizini için düz metin sütunu", [
+        "ALTER TABLE posts ADD COLUMN content_text TEXT",
+        "UPDATE posts SET content_text = html_to_text(content)",
+        "DROP TRIGGER IF EXISTS posts_fts_insert",
+        "DROP TRIGGER IF EXISTS posts_fts_update",
+        """
+        CREATE TRIGGER posts_fts_insert AFTER INSERT ON posts
+        BEGIN
+            INSERT INTO posts_fts (rowid, title, keywords, body)
+            VALUES (NEW.id, NEW.title, NEW.keywords, COALESCE(NEW.content_text, NEW.content));
+        END
+        """,
+        """
+        CREATE TRIGGER posts_fts_update AFTER UPDATE OF title, keywords, content, content_text ON posts
+        BEGIN
+            DELETE FROM posts_fts WHERE rowid = OLD.id;
+            INSERT INTO posts_fts (rowid, title, keywords, body)
+            SELECT id, title, keywords, COALESCE(content_text, content) FROM posts WHERE id = NEW.id;
+        END
+        """,
+        # content_text'e dokunmadan içeriği değiştiren istemcilerde eski düz metin dizinde kalmasın; güncelleme
+        # tetikleyicisi satırın son halini okuduğundan tetikleyicilerin çalışma sırası sonucu değiştirmez
+        """
+        CREATE TRIGGER posts_content_text_reset AFTER UPDATE OF content ON posts
+        WHEN NEW.content IS NOT OLD.content AND NEW.content_text IS OLD.content_text
+        BEGIN
+            UPDATE posts SET content_text = NULL WHERE id = NEW.id;
+        END
+        """,
+    ]),
+    # Yayın işleri aynı veritabanında tutulur (modules/job_queue.py); eski kurulumlarda tablo zaten olabilir
+    (8, "arka plan yayın işleri kuyruğu", [
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            stage TEXT,
+            stages TEXT,
+            result TEXT,
+            error TEXT,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL,
+            updated_at REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at)",
+    ]),
+    # Çalışan işi hangi sürecin yürüttüğü ve son yaşam sinyali; süresi dolmayan işler yeniden kuyruğa alınmaz
+    (9, "yayın işleri için sahip ve yaşam sinyali (kira)", [
+        "ALTER TABLE jobs ADD COLUMN owner TEXT",
+        "ALTER TABLE jobs ADD COLUMN heartbeat_at REAL",
+    ]),
+    # İmza şablon HTML'inden değil kullanıcının girdisinden (başlık, anahtar kelimeler, içerik) hesaplanır;
+    # imza yöntemi de değiştiği için eski imzalar silinir ve arka planda yeniden hesaplanır
+    (10, "yakın kopya imzası için kullanıcı metni", [
+        "ALTER TABLE posts ADD COLUMN signature_text TEXT",
+        "DELETE FROM post_lsh_buckets",
+        "DELETE FROM post_minhash",
+        "DROP TRIGGER IF EXISTS posts_minhash_update",
+        """
+        CREATE TRIGGER posts_minhash_update AFTER UPDATE OF title, keywords, content, signature_text ON posts
+        BEGIN
+            DELETE FROM post_lsh_buckets WHERE post_id = OLD.id;
+            DELETE FROM post_minhash WHERE post_id = OLD.id;
+        END
+        """,
+    ]),
+    # Yayın adımına girildiği an kaydedilir; kirası dolan böyle bir iş yeniden çalıştırılmaz (çift yazı riski)
+    (11, "yayın işleri için yayın başlangıcı işareti", [
+        "ALTER TABLE jobs ADD COLUMN commit_started_at REAL",
+    ]),
+]
+
+
+def migrate(conn):
+    """Uygulanmamış şema sürümlerini sırayla, her birini ayrı bir işlemde uygular.
+
+    Veritabanını açan her bileşen (HistoryManager, JobQueue) bunu çağırır; hangisi önce açarsa şemayı o günceller.
+    """
+    current = conn.execute("PRAGMA user_version").fetchone()[0]
+    # Eski sürümlerin düz metin doldurmaları Python fonksiyonunu kullanır; tetikleyiciler kullanmaz
+    conn.create_function("html_to_text", 1, html_to_text, deterministic=True)
+    for version, description, statements in MIGRATIONS:
+        if version <= current:
+            continue
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Aynı anda başlayan başka bir süreç bu sürümü uygulamış olabilir
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+                conn.rollback()
+                continue
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        print(f"Geçmiş veritabanı şeması güncellendi: sürüm {version} ({description})")
 
 
 class HistoryManager:
-    def __init__(self):
-        self.db_file = "posts_history.db"
+    """Yayınlanan yazıların geçmişi (posts_history.db).
+
+    Bağlantılar her istekte açılmaz; WAL kipinde açılmış bağlantılar bir havuzda tutulur ve her biri aynı
+    anda yalnızca bir iş parçacığı tarafından kullanılır. İstatistikler tetikleyicilerle güncellenen özet
+    tablolardan okunduğundan geçmiş büyüdükçe yavaşlamaz.
+
+    Arama dizinine giren düz metin (content_text) ve yakın kopya imzaları save_post içinde hesaplanır.
+    Başka yollarla eklenen yazıların imzaları backfill_signatures ile tamamlanır.
+    """
+
+    def __init__(self, db_file="posts_history.db", pool_size=None):
+        self.db_file = db_file
+        self.pool_size = pool_size or int(os.getenv("HISTORY_DB_POOL_SIZE", 8))
+        self.search_rank_limit = int(os.getenv("HISTORY_SEARCH_RANK_LIMIT", 10000))
+        # Son kullanılan bağlantı önce verilir (LIFO); boşta bekleyen fazla bağlantılar kapanır
+        self._pool = queue.LifoQueue()
         self._init_db()
 
+    def _open_connection(self):
+        # Havuzdaki bağlantılar farklı iş parçacıklarında (sırayla) kullanılabilir
+        conn = sqlite3.connect(self.db_file, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        """Havuzdan bir bağlantı alır; blok sonunda işlemi onaylar (hata varsa geri alır) ve geri bırakır."""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._open_connection()
+
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.row_factory = None
+            if self._pool.qsize() < self.pool_size:
+                self._pool.put(conn)
+            else:
+                conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
     def _init_db(self):
-        with sqlite3.connect(self.db_file) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS posts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    content TEXT NOT NULL,
-                    keywords TEXT NOT NULL,
-                    image_url TEXT,
-                    wordpress_id INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    status TEXT DEFAULT 'published',
-                    template_used TEXT
-                )
-            """)
+        with self._connection() as conn:
+            migrate(conn)
+            missing = conn.execute("""
+                SELECT 1 FROM posts AS p LEFT JOIN post_minhash AS m ON m.post_id = p.id
+                WHERE m.post_id IS NULL LIMIT 1
+            """).fetchone()
+        if missing:
+            # İmzası olmayan eski yazılar başlangıcı geciktirmeden arka planda işlenir
+            threading.Thread(target=self.backfill_signatures, name="history-minhash-backfill", daemon=True).start()
+
+    def schema_version(self):
+        with self._connection() as conn:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def data_version(self):
+        """Yazılar her eklendiğinde, silindiğinde ya da güncellendiğinde artan sayaç (yanıt önbellekleri için)."""
+        with self._connection() as conn:
+            return conn.execute("SELECT version FROM data_version WHERE id = 1").fetchone()[0]
+
+
+    @staticmethod
+    def _store_signature(conn, post_id, signature):
+        # Yazı bu arada silindiyse ya da imzası başka bir yoldan eklendiyse hiçbir şey yazılmaz
+        stored = conn.execute("""
+            INSERT OR IGNORE INTO post_minhash (post_id, signature)
+            SELECT ?, ? WHERE EXISTS (SELECT 1 FROM posts WHERE id = ?)
+        """, (post_id, signature_to_blob(signature) if signature else None, post_id)).rowcount
+        if stored and signature:
+            conn.executemany("INSERT OR IGNORE INTO post_lsh_buckets (band, bucket, post_id) VALUES (?, ?, ?)",
+                             ((band, bucket, post_id) for band, bucket in enumerate(lsh_buckets(signature))))
 
     def save_post(self, post_data, wordpress_id):
-        with sqlite3.connect(self.db_file) as conn:
-            conn.execute("""
-                INSERT INTO posts (title, content, keywords, image_url, wordpress_id, template_used)
-                VALUES (?, ?, ?, ?, ?, ?)
+        """Yazıyı kaydeder. post_data['source_content'] kullanıcının şablon uygulanmadan önceki içeriğidir;
+        yakın kopya imzası onunla hesaplanır (verilmezse şablonlu içerik kullanılır)."""
+        # İmza yazma işlemi başlamadan hesaplanır; veritabanı kilidi CPU işi boyunca tutulmaz
+        content_text = html_to_text(post_data['content'])
+        text = signature_text(post_data['title'], post_data['keywords'],
+                              post_data.get('source_content', post_data['content']))
+        signature = minhash_signature(text)
+        with self._connection() as conn:
+            post_id = conn.execute("""
+                INSERT INTO posts (title, content, content_text, signature_text, keywords, image_url, wordpress_id,
+                                   template_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 post_data['title'],
                 post_data['content'],
+                content_text,
+                text,
                 post_data['keywords'],
                 post_data.get('image_url', ''),
                 wordpress_id,
                 post_data.get('template', 'default')
-            ))
+            )).lastrowid
+            self._store_signature(conn, post_id, signature)
+        return post_id
+
+    def backfill_signatures(self, batch_size=200):
+        """İmzası olmayan yazıların MinHash imzalarını parti parti hesaplar; işlenen yazı sayısını döndürür."""
+        processed = 0
+        last_id = 0
+        while True:
+            with self._connection() as conn:
+                rows = conn.execute("""
+                    SELECT p.id, p.signature_text, p.title, p.keywords, p.content FROM posts AS p
+                    LEFT JOIN post_minhash AS m ON m.post_id = p.id
+                    WHERE m.post_id IS NULL AND p.id > ?
+                    ORDER BY p.id LIMIT ?
+                """, (last_id, batch_size)).fetchall()
+            if not rows:
+                break
+
+            # Kullanıcı metni saklanmamış eski yazılarda yalnızca şablonlu içerik vardır
+            signatures = [(post_id, minhash_signature(text or signature_text(title, keywords, content)))
+                          for post_id, text, title, keywords, content in rows]
+            with self._connection() as conn:
+                for post_id, signature in signatures:
+                    self._store_signature(conn, post_id, signature)
+            processed += len(rows)
+            last_id = rows[-1][0]
+
+        if processed:
+            print(f"Yakın kopya imzaları hesaplandı: {processed} yazı")
+        return processed
+
+    def find_near_duplicates(self, title, content, keywords="", threshold=None, limit=5):
+        """Metni verilen yazıya benzeyen (tahmini Jaccard >= threshold) kayıtlı yazıları döndürür.
+
+        content kullanıcının şablon uygulanmamış içeriğidir; save_post'taki source_content ile aynı olmalıdır.
+
+        Tüm geçmiş taranmaz: yalnızca LSH kovalarından en az birini paylaşan adayların imzaları okunur,
+        bu yüzden süre geçmiş büyüklüğüyle değil aday sayısıyla orantılıdır.
+        """
+        threshold = DUPLICATE_THRESHOLD if threshold is None else threshold
+        signature = minhash_signature(signature_text(title, keywords, content))
+        if signature is None:
+            return []
+
+        buckets = list(enumerate(lsh_buckets(signature)))
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(f"""
+                WITH probe (band, bucket) AS (VALUES {", ".join("(?, ?)" for _ in buckets)})
+                SELECT c.shared, m.signature, p.id, p.title, p.wordpress_id, p.created_at, p.status
+                FROM (
+                    SELECT b.post_id, COUNT(*) AS shared
+                    FROM probe JOIN post_lsh_buckets AS b ON b.band = probe.band AND b.bucket = probe.bucket
+                    GROUP BY b.post_id
+                    ORDER BY shared DESC
+                    LIMIT ?
+                ) AS c
+                JOIN post_minhash AS m ON m.post_id = c.post_id
+                JOIN posts AS p ON p.id = c.post_id
+            """, [value for pair in buckets for value in pair] + [MAX_DUPLICATE_CANDIDATES]).fetchall()
+
+        duplicates = []
+        for row in rows:
+            similarity = estimate_similarity(signature, signature_from_blob(row["signature"]))
+            if similarity >= threshold:
+                duplicate = {key: row[key] for key in ("id", "title", "wordpress_id", "created_at", "status")}
+                duplicate["similarity"] = round(similarity, 3)
+                duplicates.append(duplicate)
+        duplicates.sort(key=lambda item: item["similarity"], reverse=True)
+        return duplicates[:limit]
 
     def get_posts_history(self, limit=50):
-        with sqlite3.connect(self.db_file) as conn:
+        with self._connection() as conn:
             conn.row_factory = sqlite3.Row
+            # (created_at, id) indeksi sayesinde sıralama için tablo taranmaz
             cursor = conn.execute("""
-                SELECT * FROM posts 
-                ORDER BY created_at DESC 
+                SELECT * FROM posts
+                ORDER BY created_at DESC, id DESC
                 LIMIT ?
             """, (limit,))
             return [dict(row) for row in cursor.fetchall()]
 
+    @staticmethod
+    def _select_columns(columns, default):
+        """İstenen sütunları izin verilenlerle sınırlar; sayfalama için id ve created_at her zaman eklenir."""
+        if not columns:
+            columns = default
+        selected = [column for column in HISTORY_COLUMNS if column in set(columns)]
+        for required in ("created_at", "id"):
+            if required not in selected:
+                selected.insert(0, required)
+        return selected
+
+    @staticmethod
+    def encode_cursor(created_at, post_id):
+        raw = json.dumps([created_at, post_id]).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            created_at, post_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            return str(created_at), int(post_id)
+        except (ValueError, TypeError):
+            raise ValueError("Geçersiz sayfa imleci")
+
+    def get_posts_page(self, limit=20, cursor=None, columns=None):
+        """(created_at, id) üzerinde imleçle sayfalanmış geçmiş döndürür.
+
+        OFFSET kullanılmaz; her sayfa bir önceki sayfanın son satırından indeksle devam eder, bu yüzden
+        sayfa derinliği sorgu süresini etkilemez. Dönen sözlükte posts ve next_cursor bulunur.
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        selected = self._select_columns(columns, LIST_COLUMNS)
+
+        query = f"SELECT {', '.join(selected)} FROM posts"
+        params = []
+        if cursor:
+            query += " WHERE (created_at, id) < (?, ?)"
+            params.extend(self.decode_cursor(cursor))
+        query += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        # Bir fazla satır, sonraki sayfanın olup olmadığını anlamak için
+        params.append(limit + 1)
+
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = [dict(row) for row in conn.execute(query, params).fetchall()]
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self.encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+        return {"posts": rows, "next_cursor": next_cursor}
+
+    def get_post(self, post_id, columns=None):
+        """Tek bir yazıyı döndürür; içerik gibi büyük alanlar yalnızca istendiğinde okunur."""
+        selected = self._select_columns(columns, HISTORY_COLUMNS)
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute(f"SELECT {', '.join(selected)} FROM posts WHERE id = ?", (post_id,)).fetchone()
+        return dict(row) if row else None
+
+    def search_posts(self, query, limit=20, offset=0):
+        """Başlık, anahtar kelime ve içerikte tam metin arama yapar; sonuçlar bm25 puanına göre sıralanır.
+
+        Sıralama puana göre yapıldığından sayfalama OFFSET iledir; yalnızca istenen sayfa için posts
+        tablosuna ve özet üretimine gidilir. Eşleşme sayısı search_rank_limit'i aşan (neredeyse her yazıda
+        geçen) aramalarda bm25 ayırt edici değildir ve tüm eşleşmeleri puanlamak pahalıdır; bu durumda
+        sonuçlar en yeniden eskiye sıralanır. Dönen sözlükte results, total, ranked ve next_offset bulunur.
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        offset = max(0, int(offset))
+        match = build_match_query(query)
+        if match is None:
+            return {"results": [], "total": 0, "ranked": True, "next_offset": None}
+
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
+            # Sayım dizindeki eşleşme listelerinden yapılır; puan hesaplanmaz
+            total = conn.execute("SELECT COUNT(*) FROM posts_fts WHERE posts_fts MATCH ?", (match,)).fetchone()[0]
+            ranked = total <= self.search_rank_limit
+            order = "rank" if ranked else "rowid DESC"
+            rows = conn.execute(f"""
+                SELECT p.id, p.title, p.keywords, p.image_url, p.wordpress_id, p.created_at, p.status,
+                       p.template_used, m.score, m.snippet
+                FROM (
+                    SELECT rowid, rank AS score,
+                           snippet(posts_fts, 2, '{_MARK_OPEN}', '{_MARK_CLOSE}', '…', 16) AS snippet
+                    FROM posts_fts
+                    WHERE posts_fts MATCH ?
+                    ORDER BY {order}
+                    LIMIT ? OFFSET ?
+                ) AS m
+                JOIN posts AS p ON p.id = m.rowid
+                ORDER BY {"m.score" if ranked else "m.rowid DESC"}
+            """, (match, limit, offset)).fetchall()
+
+        results = []
+        for row in rows:
+            result = dict(row)
+            # İçerik metni kaçışlanır; yalnızca eşleşme işaretleri HTML olarak döner
+            result["snippet"] = (html.escape(result["snippet"] or "")
+                                 .replace(_MARK_OPEN, "<mark>").replace(_MARK_CLOSE, "</mark>"))
+            results.append(result)
+        next_offset = offset + limit if offset + limit < total else None
+        return {"results": results, "total": total, "ranked": ranked, "next_offset": next_offset}
+
     def get_post_stats(self):
-        with sqlite3.connect(self.db_file) as conn:
+        with self._connection() as conn:
             conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
-                SELECT 
-                    COUNT(*) as total_posts,
-                    COUNT(DISTINCT DATE(created_at)) as active_days,
-                    ROUND(CAST(COUNT(*) AS FLOAT) / NULLIF(COUNT(DISTINCT DATE(created_at)), 0), 1) as avg_posts_per_day
-                FROM posts
-            """)
-            result = cursor.fetchone()
+            # Özet tablo tetikleyicilerle güncel tutulur; tek satır okunur
+            result = conn.execute("SELECT total_posts, active_days FROM post_totals WHERE id = 1").fetchone()
             if result:
                 return {
                     'total_posts': result['total_posts'],
                     'active_days': result['active_days'],
-                    'avg_posts_per_day': result['avg_posts_per_day'] or 0
+                    'avg_posts_per_day': round(result['total_posts'] / result['active_days'], 1)
+                    if result['active_days'] else 0
                 }
             return {
                 'total_posts': 0,
@@ -73,9 +669,9 @@ class HistoryManager:
             }
 
     def delete_post(self, post_id):
-        with sqlite3.connect(self.db_file) as conn:
+        with self._connection() as conn:
             conn.execute("DELETE FROM posts WHERE id = ?", (post_id,))
 
     def update_post_status(self, post_id, status):
-        with sqlite3.connect(self.db_file) as conn:
-            conn.execute("UPDATE posts SET status = ? WHERE id = ?", (status, post_id))
\ No newline at end of file
+        with self._connection() as conn:
+            conn.execute("UPDATE posts SET status = ? WHERE id = ?", (status, post_id))
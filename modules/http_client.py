@@ -0,0 +1,137 @@
+import os
+import threading
+import urllib.parse
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dotenv import load_dotenv
+
+load_dotenv("config.env")
+
+# Host bazlı varsayılan ayarlar: (bağlantı zaman aşımı, okuma zaman aşımı) ve havuz boyutu
+DEFAULT_HOST_SETTINGS = {
+    "api.pexels.com": {"timeout": (3.05, 15), "pool_maxsize": 10},
+    "api.unsplash.com": {"timeout": (3.05, 15), "pool_maxsize": 10},
+    "api.mymemory.translated.net": {"timeout": (3.05, 10), "pool_maxsize": 4},
+}
+
+# Yeniden denemeye değer HTTP durum kodları
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class HttpClient:
+    """Tüm dış HTTP çağrıları için host bazlı keep-alive havuzlu ortak istemci."""
+
+    def __init__(self, pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None,
+                 max_retries: Optional[int] = None, backoff_factor: Optional[float] = None,
+                 default_timeout=None, host_settings: Optional[Dict] = None):
+        self.pool_connections = pool_connections or _env_int("HTTP_POOL_CONNECTIONS", 10)
+        self.pool_maxsize = pool_maxsize or _env_int("HTTP_POOL_MAXSIZE", 10)
+        self.max_retries = max_retries if max_retries is not None else _env_int("HTTP_MAX_RETRIES", 2)
+        self.backoff_factor = backoff_factor if backoff_factor is not None else _env_float("HTTP_BACKOFF_FACTOR", 0.3)
+        self.default_timeout = default_timeout or (3.05, _env_float("HTTP_READ_TIMEOUT", 30))
+
+        self.host_settings = {host: dict(settings) for host, settings in DEFAULT_HOST_SETTINGS.items()}
+        for host, settings in (host_settings or {}).items():
+            self.host_settings.setdefault(host, {}).update(settings)
+
+        self._session = None
+        self._lock = threading.Lock()
+
+    def _build_retry(self) -> Retry:
+        # Yalnızca idempotent istekler tekrar denenir; Retry-After başlığına uyulur
+        return Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=self.max_retries,
+            status=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(["HEAD", "GET", "OPTIONS"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+
+    def _build_session(self) -> requests.Session:
+        session = requests.Session()
+        retry = self._build_retry()
+
+        # Varsayılan adaptör: bilinmeyen hostlar için
+        default_adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                                      pool_maxsize=self.pool_maxsize,
+                                      max_retries=retry)
+        session.mount("https://", default_adapter)
+        session.mount("http://", default_adapter)
+
+        # Bilinen API hostları için ayrı havuzlar
+        for host, settings in self.host_settings.items():
+            adapter = HTTPAdapter(pool_connections=1,
+                                  pool_maxsize=settings.get("pool_maxsize", self.pool_maxsize),
+                                  max_retries=retry)
+            session.mount(f"https://{host}", adapter)
+            session.mount(f"http://{host}", adapter)
+
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._build_session()
+        return self._session
+
+    def timeout_for(self, url: str):
+        """URL'nin hostuna göre zaman aşımı değerini döndürür."""
+        host = urllib.parse.urlsplit(url).hostname or ""
+        settings = self.host_settings.get(host)
+        if settings and "timeout" in settings:
+            return settings["timeout"]
+        return self.default_timeout
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout_for(url)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Uygulama genelinde paylaşılan HttpClient örneğini döndürür."""
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = HttpClient()
+    return _default_client
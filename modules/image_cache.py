@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv("config.env")
+
+
+def normalize_keywords(keywords: str) -> str:
+    """Anahtar kelimeleri önbellek anahtarı için normalize eder (küçük harf, tek boşluk, virgül düzeni)."""
+    parts = [" ".join(part.lower().split()) for part in keywords.split(",")]
+    return ", ".join(part for part in parts if part)
+
+
+class ImageSearchCache:
+    """Pexels/Unsplash arama sonuçları için SQLite tabanlı, TTL ve LRU sınırlı önbellek."""
+
+    def __init__(self, db_file: str = "image_search_cache.db", ttl: Optional[int] = None,
+                 max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.db_file = db_file
+        self.ttl = ttl if ttl is not None else int(os.getenv("IMAGE_CACHE_TTL", 24 * 60 * 60))
+        self.max_entries = max_entries or int(os.getenv("IMAGE_CACHE_MAX_ENTRIES", 5000))
+        self.max_bytes = max_bytes or int(os.getenv("IMAGE_CACHE_MAX_BYTES", 20 * 1024 * 1024))
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_file, timeout=10)
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS image_search_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    keywords TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    min_width INTEGER NOT NULL,
+                    min_height INTEGER NOT NULL,
+                    payload TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_image_search_cache_last_access
+                ON image_search_cache (last_access)
+            """)
+
+    @staticmethod
+    def make_key(source: str, keywords: str, count: int, min_width: int, min_height: int) -> str:
+        raw = json.dumps([source, normalize_keywords(keywords), int(count), int(min_width), int(min_height)],
+                         ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, source: str, keywords: str, count: int, min_width: int,
+            min_height: int) -> Optional[Tuple[List[str], List[Tuple[int, int]]]]:
+        """Önbellekte geçerli bir kayıt varsa (image_urls, image_sizes) döndürür, yoksa None."""
+        key = self.make_key(source, keywords, count, min_width, min_height)
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT payload, created_at FROM image_search_cache WHERE cache_key = ?", (key,)
+                ).fetchone()
+
+                if row and now - row[1] <= self.ttl:
+                    conn.execute("UPDATE image_search_cache SET last_access = ? WHERE cache_key = ?", (now, key))
+                    payload = json.loads(row[0])
+                    with self._lock:
+                        self.hits += 1
+                    return payload["image_urls"], [tuple(size) for size in payload["image_sizes"]]
+
+                if row:
+                    # Süresi dolmuş kayıt
+                    conn.execute("DELETE FROM image_search_cache WHERE cache_key = ?", (key,))
+        except Exception as e:
+            print(f"Görsel önbelleği okuma hatası: {e}")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, source: str, keywords: str, count: int, min_width: int, min_height: int,
+            image_urls: List[str], image_sizes: List[Tuple[int, int]]) -> None:
+        key = self.make_key(source, keywords, count, min_width, min_height)
+        payload = json.dumps({"image_urls": image_urls, "image_sizes": [list(size) for size in image_sizes]},
+                             ensure_ascii=False)
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO image_search_cache
+                        (cache_key, source, keywords, count, min_width, min_height, payload, size, created_at, last_access)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (key, source, normalize_keywords(keywords), int(count), int(min_width), int(min_height),
+                      payload, len(payload.encode("utf-8")), now, now))
+                self._evict(conn)
+        except Exception as e:
+            print(f"Görsel önbelleği yazma hatası: {e}")
+
+    def _evict(self, conn) -> None:
+        """Süresi dolan kayıtları siler, ardından sınırlar aşılıyorsa en az kullanılanları çıkarır."""
+        conn.execute("DELETE FROM image_search_cache WHERE created_at < ?", (time.time() - self.ttl,))
+
+        total_entries, total_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM image_search_cache"
+        ).fetchone()
+
+        while total_entries > self.max_entries or total_bytes > self.max_bytes:
+            row = conn.execute(
+                "SELECT cache_key, size FROM image_search_cache ORDER BY last_access ASC LIMIT 1"
+            ).fetchone()
+            if not row:
+                break
+            conn.execute("DELETE FROM image_search_cache WHERE cache_key = ?", (row[0],))
+            total_entries -= 1
+            total_bytes -= row[1]
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM image_search_cache")
+
+    def stats(self) -> Dict:
+        with self._connect() as conn:
+            entries, total_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM image_search_cache"
+            ).fetchone()
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0,
+            "entries": entries,
+            "bytes": total_bytes,
+        }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_image_cache() -> ImageSearchCache:
+    """Uygulama genelinde paylaşılan ImageSearchCache örneğini döndürür."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = ImageSearchCache()
+    return _default_cache
@@ -1,12 +1,19 @@
-import requests
-from PIL import Image
-from io import BytesIO
 import os
+import tempfile
 from dotenv import load_dotenv
 import urllib.parse  # URL encoding için eklendi
+from modules.http_client import get_http_client
+from modules.image_cache import get_image_cache
+from modules.image_safety import stream_response_to_file
+from modules.renditions import get_rendition_engine
+from concurrent.futures import ThreadPoolExecutor
 
 load_dotenv("config.env")
 
+# Paralel görsel aramaları için paylaşılan iş parçacığı havuzu
+_search_executor = ThreadPoolExecutor(max_workers=int(os.getenv("IMAGE_SEARCH_WORKERS", 8)),
+                                      thread_name_prefix="image-search")
+
 
 def fetch_image_url(keywords, source="pexels", min_width=800, min_height=600):
     """Pexels veya Unsplash'tan minimum boyut kriterini karşılayan resim URL'sini alır."""
@@ -26,7 +33,7 @@ def fetch_image_url(keywords, source="pexels", min_width=800, min_height=600):
             api_url = f"https://api.pexels.com/v1/search?query={encoded_keywords}&per_page=15"
 
             print(f"Pexels API isteği gönderiliyor: {api_url}")
-            response = requests.get(api_url, headers=headers, timeout=15)
+            response = get_http_client().get(api_url, headers=headers)
 
             if response.status_code != 200:
                 print(f"Pexels API yanıt kodu hatalı: {response.status_code}")
@@ -67,7 +74,7 @@ def fetch_image_url(keywords, source="pexels", min_width=800, min_height=600):
             api_url = f"https://api.unsplash.com/photos/random?query={encoded_keywords}&count=10&client_id={access_key}"
 
             print(f"Unsplash API isteği gönderiliyor: {api_url}")
-            response = requests.get(api_url, timeout=15)
+            response = get_http_client().get(api_url)
 
             if response.status_code != 200:
                 print(f"Unsplash API yanıt kodu hatalı: {response.status_code}")
@@ -100,11 +107,72 @@ def fetch_image_url(keywords, source="pexels", min_width=800, min_height=600):
     return None, None
 
 
-def fetch_multiple_images(keywords, count=3, source="pexels", min_width=800, min_height=600):
-    """Pexels veya Unsplash'tan minimum boyut kriterini karşılayan birden fazla resim URL'si alır."""
+def fetch_multiple_images(keywords, count=3, source="pexels", min_width=800, min_height=600, use_cache=True):
+    """Pexels veya Unsplash'tan minimum boyut kriterini karşılayan birden fazla resim URL'si alır.
+
+    Aynı arama daha önce yapıldıysa sonuç görsel arama önbelleğinden döner ve API kotası harcanmaz.
+    """
     if not keywords:
         return [], []
 
+    if not use_cache:
+        return _search_multiple_images(keywords, count, source, min_width, min_height)
+
+    cache = get_image_cache()
+    cached = cache.get(source, keywords, count, min_width, min_height)
+    if cached is not None:
+        print(f"Görsel araması önbellekten bulundu: {keywords} ({source})")
+        return cached
+
+    image_urls, image_sizes = _search_multiple_images(keywords, count, source, min_width, min_height)
+
+    # Boş sonuçlar (API anahtarı eksik, hata vb.) önbelleğe alınmaz
+    if image_urls:
+        cache.set(source, keywords, count, min_width, min_height, image_urls, image_sizes)
+
+    return image_urls, image_sizes
+
+
+def fetch_multiple_images_preferred(queries, count=3, source="pexels", min_width=800, min_height=600):
+    """Birden fazla sorguyu paralel başlatır ve tercih sırasına göre ilk sonuç veren sorgunun görsellerini döndürür.
+
+    queries listesinin sırası tercih sırasıdır. Daha öncelikli bir sorgu sonuç verdiğinde geri kalanlar
+    beklenmez; henüz başlamamış olanlar iptal edilir, çalışanların sonuçları yok sayılır.
+    Dönüş değeri (image_urls, image_sizes, kullanılan_sorgu) şeklindedir.
+    """
+    # Boş ve tekrar eden sorguları çıkar, sırayı koru
+    unique_queries = []
+    for query in queries:
+        if query and query not in unique_queries:
+            unique_queries.append(query)
+
+    if not unique_queries:
+        return [], [], None
+
+    futures = [
+        _search_executor.submit(fetch_multiple_images, query, count, source, min_width, min_height)
+        for query in unique_queries
+    ]
+
+    try:
+        for query, future in zip(unique_queries, futures):
+            try:
+                image_urls, image_sizes = future.result()
+            except Exception as e:
+                print(f"Paralel görsel arama hatası ({query}): {e}")
+                continue
+
+            if image_urls:
+                return image_urls, image_sizes, query
+    finally:
+        for future in futures:
+            future.cancel()
+
+    return [], [], None
+
+
+def _search_multiple_images(keywords, count, source, min_width, min_height):
+    """Görsel API'sine doğrudan arama isteği gönderir."""
     image_urls = []
     image_sizes = []
 
@@ -121,7 +189,7 @@ def fetch_multiple_images(keywords, count=3, source="pexels", min_width=800, min
             api_url = f"https://api.pexels.com/v1/search?query={encoded_keywords}&per_page={count * 3}"
 
             print(f"Pexels API isteği gönderiliyor (çoklu görseller): {api_url}")
-            response = requests.get(api_url, headers=headers, timeout=15)
+            response = get_http_client().get(api_url, headers=headers)
 
             if response.status_code != 200:
                 print(f"Pexels API yanıt kodu hatalı: {response.status_code}")
@@ -179,7 +247,7 @@ def fetch_multiple_images(keywords, count=3, source="pexels", min_width=800, min
             api_url = f"https://api.unsplash.com/photos/random?query={encoded_keywords}&count={count * 2}&client_id={access_key}"
 
             print(f"Unsplash API isteği gönderiliyor (çoklu görseller): {api_url}")
-            response = requests.get(api_url, timeout=15)
+            response = get_http_client().get(api_url)
 
             if response.status_code != 200:
                 print(f"Unsplash API yanıt kodu hatalı: {response.status_code}")
@@ -239,23 +307,29 @@ def fetch_and_resize_image(keywords, source="pexels", target_width=800, target_h
         return None
 
     try:
-        img_response = requests.get(image_url)
-        img = Image.open(BytesIO(img_response.content))
-
         # Klasörün var olduğundan emin ol
         os.makedirs("static/images", exist_ok=True)
 
         resized_img_path = f"static/images/{keywords.replace(' ', '_')}_{source}.jpg"
 
-        # PIL sürümüne göre doğru yöntemi kullan
+        # Görsel diske indirilir, boyutlandırma istek iş parçacığında değil süreç havuzunda yapılır
+        fd, temp_path = tempfile.mkstemp(prefix="fetch-resize-")
         try:
-            img = img.resize((target_width, target_height), Image.Resampling.LANCZOS)  # Python 3.10+ için
-        except AttributeError:
-            img = img.resize((target_width, target_height), Image.LANCZOS)  # Eski PIL sürümleri için
-
-        img.save(resized_img_path)
+            # Dosya tanıtıcısı hemen nesneye bağlanır; indirme hata verse de kapanır
+            with os.fdopen(fd, "wb") as f:
+                img_response = get_http_client().get(image_url, stream=True)
+                try:
+                    img_response.raise_for_status()
+                    stream_response_to_file(img_response, f)
+                finally:
+                    img_response.close()
+
+            get_rendition_engine().resize(temp_path, resized_img_path, target_width, target_height,
+                                          maintain_aspect=False, fmt="jpeg")
+        finally:
+            os.remove(temp_path)
 
         return resized_img_path
     except Exception as e:
         print(f"Görsel indirme/boyutlandırma hatası: {e}")
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,131 @@
+import os
+import sys
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+from dotenv import load_dotenv
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+load_dotenv("config.env")
+
+# İndirilen bir görselin en fazla bayt sayısı ve çözülmüş görselin en fazla piksel sayısı
+MAX_DOWNLOAD_BYTES = int(os.getenv("IMAGE_MAX_DOWNLOAD_BYTES", 30 * 1024 * 1024))
+MAX_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", 40_000_000))
+
+
+class ImageLimitError(Exception):
+    """Görsel indirme boyutu ya da piksel sınırı aşıldı."""
+
+
+def stream_response_to_file(response, fileobj, max_bytes: Optional[int] = None, digest=None) -> int:
+    """HTTP yanıt gövdesini parça parça dosyaya yazar; max_bytes aşılırsa ImageLimitError fırlatır."""
+    max_bytes = max_bytes or MAX_DOWNLOAD_BYTES
+
+    content_length = response.headers.get("Content-Length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise ImageLimitError(f"Görsel çok büyük: {int(content_length)} bayt (sınır {max_bytes})")
+
+    # Content-Length yanlış ya da eksik olabilir; okunan bayt sayısı ayrıca sayılır
+    total = 0
+    for chunk in response.iter_content(chunk_size=64 * 1024):
+        total += len(chunk)
+        if total > max_bytes:
+            raise ImageLimitError(f"Görsel indirme sınırı aşıldı ({max_bytes} bayt)")
+        if digest is not None:
+            digest.update(chunk)
+        fileobj.write(chunk)
+    return total
+
+
+def image_buffer_bytes(img) -> int:
+    """Çözülmüş görselin bellekte kapladığı yaklaşık bayt sayısı."""
+    bands = len(img.getbands())
+    bits = 1 if img.mode == "1" else (16 if img.mode.startswith("I;16") else (32 if img.mode in ("I", "F") else 8))
+    return img.size[0] * img.size[1] * max(1, bands * bits // 8)
+
+
+def open_image(path: str, target_size: Optional[Tuple[int, int]] = None, max_pixels: Optional[int] = None):
+    """Görseli yalnızca başlığını okuyarak açar, piksel sınırını denetler ve JPEG'i hedefe yakın çözer.
+
+    JPEG'lerde draft() ile çözme 1/2, 1/4 ya da 1/8 ölçekte yapılır; hedef boyuttan küçük olmayan en
+    küçük ölçek seçildiğinden kalite kaybı olmaz, tam çözünürlüklü bitmap hiç oluşturulmaz.
+    """
+    max_pixels = max_pixels or MAX_PIXELS
+    try:
+        img = Image.open(path)
+    except Image.DecompressionBombError as e:
+        # Pillow'un kendi sınırı (varsayılanın iki katı) bizimkinden önce devreye girebilir
+        raise ImageLimitError(str(e)) from e
+    width, height = img.size
+    if width * height > max_pixels:
+        img.close()
+        raise ImageLimitError(f"Görsel piksel sınırını aşıyor: {width}x{height} (sınır {max_pixels} piksel)")
+
+    if target_size and img.format == "JPEG":
+        img.draft(None, target_size)
+    return img
+
+
+def _read_peak_rss() -> Optional[int]:
+    # Linux'ta /proc/self/status içindeki VmHWM, süreç belleğinin tepe değeridir
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss() -> bool:
+    # Linux 4.0+: clear_refs'e 5 yazmak VmHWM'yi mevcut kullanıma sıfırlar
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class PeakMemory:
+    """İşlem süresince sürecin bellek tepe değerini ölçer (with bloğu).
+
+    Tepe değer sıfırlanabiliyorsa (Linux) yalnızca bu işleme ait tepe, sıfırlanamıyorsa sürecin
+    başından beri görülen en yüksek RSS raporlanır.
+    """
+
+    def __init__(self):
+        self.per_operation = False
+        self.start_rss = None
+        self.peak_rss = None
+        self.peak_image_bytes = 0
+
+    def track(self, img) -> None:
+        """Ara görsellerin bellek karşılığını kaydeder."""
+        self.peak_image_bytes = max(self.peak_image_bytes, image_buffer_bytes(img))
+
+    def __enter__(self):
+        self.per_operation = _reset_peak_rss()
+        self.start_rss = _read_peak_rss()
+        return self
+
+    def __exit__(self, *exc):
+        self.peak_rss = _read_peak_rss()
+        if self.peak_rss is None and resource is not None:
+            # /proc yoksa getrusage (Linux'ta KB, macOS'ta bayt)
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            self.peak_rss = max_rss if sys.platform == "darwin" else max_rss * 1024
+        return False
+
+    def report(self) -> Dict:
+        return {
+            "peak_rss_bytes": self.peak_rss,
+            "rss_growth_bytes": (self.peak_rss - self.start_rss) if self.per_operation and self.start_rss else None,
+            "peak_image_bytes": self.peak_image_bytes,
+            "per_operation": self.per_operation,
+        }
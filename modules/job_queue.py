@@ -0,0 +1,260 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from modules.history_manager import migrate
+
+load_dotenv("config.env")
+
+
+class JobQueue:
+    """posts_history.db içinde kalıcı tutulan iş kuyruğu ve bu işleri yürüten iş parçacığı havuzu.
+
+    Her iş bir yükü (payload) ve aşama bazında ilerleme bilgisini saklar. Çalışan işler onu yürüten
+    sürecin kimliğini (owner) taşır ve süreç yaşadıkça yaşam sinyali (heartbeat_at) yenilenir. Yalnızca
+    sinyali kira süresinden (JOB_LEASE_SECONDS) eski olan, yani sahibi çökmüş ya da kapanmış işler
+    yeniden kuyruğa alınır; aynı veritabanını kullanan başka bir canlı sürecin işine dokunulmaz.
+
+    commit_stage verilirse işleyici o aşamaya geçtiğinde zaman damgası (commit_started_at) kaydedilir ve
+    kayıt yazılamazsa işleyici devam etmez. Bu aşamaya girmiş bir işin kirası dolarsa dış sistemde yarım
+    kalmış olabileceği için yeniden çalıştırılmaz, "needs_review" durumuna alınır.
+    """
+
+    def __init__(self, handler: Callable, db_file: str = "posts_history.db", workers: Optional[int] = None,
+                 stages: Optional[List[str]] = None, poll_interval: float = 5.0,
+                 commit_stage: Optional[str] = None):
+        self.handler = handler
+        self.db_file = db_file
+        self.workers = workers or int(os.getenv("PUBLISH_WORKERS", 2))
+        self.stages = stages or []
+        self.poll_interval = poll_interval
+        self.commit_stage = commit_stage
+        self.lease_seconds = float(os.getenv("JOB_LEASE_SECONDS", 60))
+        # Yeniden yükleyici ya da çok süreçli sunucuda her süreç ayrı bir sahip kimliği alır
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._wakeup = threading.Condition()
+        self._stopping = False
+        # Yaşam sinyali iş parçacığı _wakeup'ı beklemez; yeni iş bildirimi bir işçi yerine onu uyandırmasın
+        self._stopped = threading.Event()
+        self._threads = []
+        self._claim_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._started = False
+
+        self._init_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        # jobs tablosu geçmiş veritabanının şema sürümleriyle birlikte oluşturulur
+        with self._connect() as conn:
+            migrate(conn)
+
+    def start(self):
+        """Yaşam sinyali iş parçacığını ve işçi iş parçacıklarını başlatır; tekrar çağrılırsa bir şey yapmaz."""
+        if self._started:
+            return self
+        with self._start_lock:
+            if self._started:
+                return self
+            self._start_threads()
+            self._started = True
+        return self
+
+    def _start_threads(self):
+        heartbeat = threading.Thread(target=self._heartbeat_loop, name="publish-heartbeat", daemon=True)
+        heartbeat.start()
+        self._threads.append(heartbeat)
+
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"publish-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+        self._stopped.set()
+
+    def enqueue(self, payload: Dict, kind: str = "publish") -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        stages = {stage: "pending" for stage in self.stages}
+        with self._connect() as conn:
+            conn.execute("""
+                INSERT INTO jobs (id, kind, payload, status, stages, created_at, updated_at)
+                VALUES (?, ?, ?, 'queued', ?, ?, ?)
+            """, (job_id, kind, json.dumps(payload, ensure_ascii=False, default=str),
+                  json.dumps(stages), now, now))
+
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute("""
+                SELECT id, kind, status, stage, stages, result, error,
+                       created_at, started_at, finished_at, updated_at
+                FROM jobs WHERE id = ?
+            """, (job_id,)).fetchone()
+
+        if row is None:
+            return None
+
+        job = dict(row)
+        job["stages"] = json.loads(job["stages"]) if job["stages"] else {}
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def _requeue_expired(self, conn, now: float) -> int:
+        # Sinyali olmayan eski kayıtlarda son güncelleme zamanı esas alınır
+        deadline = now - self.lease_seconds
+
+        # Yayına başlamış işler tekrar çalıştırılırsa aynı yazı ikinci kez yayınlanabilir; elle kontrol beklenir
+        held = conn.execute("""
+            UPDATE jobs SET status = 'needs_review', owner = NULL, heartbeat_at = NULL,
+                   error = ?, finished_at = ?, updated_at = ?
+            WHERE status = 'running' AND commit_started_at IS NOT NULL AND COALESCE(heartbeat_at, updated_at) < ?
+        """, ("İş yayın sırasında yarım kaldı; yazının WordPress'te oluşup oluşmadığını kontrol edin",
+              now, now, deadline)).rowcount
+        if held:
+            print(f"Yayın sırasında kirası dolan {held} iş kontrol için bekletiliyor")
+
+        return conn.execute("""
+            UPDATE jobs SET status = 'queued', stage = NULL, owner = NULL, heartbeat_at = NULL, updated_at = ?
+            WHERE status = 'running' AND COALESCE(heartbeat_at, updated_at) < ?
+        """, (now, deadline)).rowcount
+
+    def _claim_next(self) -> Optional[sqlite3.Row]:
+        # Aynı işin iki işçi tarafından alınmaması için seçme ve işaretleme tek işlemde yapılır
+        with self._claim_lock:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                requeued = self._requeue_expired(conn, time.time())
+                if requeued:
+                    print(f"Kira süresi dolan {requeued} iş yeniden kuyruğa alındı")
+                row = conn.execute("""
+                    SELECT id, payload FROM jobs WHERE status = 'queued'
+                    ORDER BY created_at LIMIT 1
+                """).fetchone()
+                if row is not None:
+                    now = time.time()
+                    conn.execute("""
+                        UPDATE jobs SET status = 'running', owner = ?, heartbeat_at = ?, started_at = ?, updated_at = ?
+                        WHERE id = ?
+                    """, (self.owner, now, now, now, row["id"]))
+                conn.commit()
+                return row
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+
+    def _update_stage(self, job_id: str, stage: str, state: str = "running"):
+        with self._connect() as conn:
+            row = conn.execute("SELECT stages FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            stages = json.loads(row["stages"]) if row and row["stages"] else {}
+
+            # Önceki aşamaları tamamlandı olarak işaretle
+            for name, value in stages.items():
+                if name == stage:
+                    break
+                if value in ("pending", "running"):
+                    stages[name] = "done"
+            stages[stage] = state
+
+            now = time.time()
+            conn.execute("""
+                UPDATE jobs SET stage = ?, stages = ?, updated_at = ?,
+                       commit_started_at = CASE WHEN ? THEN COALESCE(commit_started_at, ?) ELSE commit_started_at END
+                WHERE id = ?
+            """, (stage, json.dumps(stages), now, stage == self.commit_stage, now, job_id))
+
+    def _finish(self, job_id: str, status: str, result=None, error: Optional[str] = None):
+        with self._connect() as conn:
+            row = conn.execute("SELECT stages FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            stages = json.loads(row["stages"]) if row and row["stages"] else {}
+            for name, value in stages.items():
+                if value == "running":
+                    stages[name] = "done" if status == "succeeded" else "failed"
+                elif value == "pending" and status == "succeeded":
+                    stages[name] = "skipped"
+
+            now = time.time()
+            finished = conn.execute("""
+                UPDATE jobs SET status = ?, stages = ?, result = ?, error = ?, finished_at = ?, updated_at = ?
+                WHERE id = ? AND owner = ?
+            """, (status, json.dumps(stages), json.dumps(result, ensure_ascii=False, default=str),
+                  error, now, now, job_id, self.owner)).rowcount
+        if not finished:
+            print(f"İşin kirası başka bir sürece geçmiş, sonuç kaydedilmedi ({job_id})")
+
+    def _heartbeat(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status = 'running'",
+                                (time.time(), self.owner)).rowcount
+
+    def _heartbeat_loop(self):
+        # Kira süresi içinde birkaç kez yenilenir; tek bir gecikmiş yazma işi kaybettirmez
+        interval = self.lease_seconds / 3
+        while not self._stopped.wait(interval):
+            try:
+                self._heartbeat()
+            except Exception as e:
+                print(f"İş yaşam sinyali yazılamadı: {e}")
+
+    def _worker_loop(self):
+        while True:
+            with self._wakeup:
+                if self._stopping:
+                    return
+
+            try:
+                job = self._claim_next()
+            except Exception as e:
+                print(f"İş kuyruğu okuma hatası: {e}")
+                job = None
+
+            if job is None:
+                with self._wakeup:
+                    if self._stopping:
+                        return
+                    self._wakeup.wait(self.poll_interval)
+                continue
+
+            self._run_job(job["id"], json.loads(job["payload"]))
+
+    def _run_job(self, job_id: str, payload: Dict):
+        def progress(stage):
+            try:
+                self._update_stage(job_id, stage)
+            except Exception as e:
+                print(f"İş ilerlemesi kaydedilemedi ({job_id}): {e}")
+                # İşaret kaydedilmeden dış sisteme gönderim yapılmamalı
+                if stage == self.commit_stage:
+                    raise
+
+        try:
+            result = self.handler(payload, progress=progress)
+            status = "succeeded" if isinstance(result, dict) and result.get("status") == "success" else "failed"
+            error = None if status == "succeeded" else (result or {}).get("message")
+            self._finish(job_id, status, result=result, error=error)
+        except Exception as e:
+            traceback.print_exc()
+            self._finish(job_id, "failed", error=str(e))
@@ -0,0 +1,116 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Dosyanın SHA-256 özetini parça parça okuyarak hesaplar."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MediaIndex:
+    """Görsel içeriğinin SHA-256 özetini (site bazında) WordPress ek dosyası kimliği ve URL'sine eşler.
+
+    Aynı görsel aynı siteye daha önce yüklendiyse yeniden yüklemek yerine mevcut ek dosya kullanılır.
+    """
+
+    def __init__(self, db_file: str = "media_index.db"):
+        self.db_file = db_file
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_file, timeout=10)
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS media (
+                    site_url TEXT NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    attachment_id TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    name TEXT,
+                    size INTEGER,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL,
+                    use_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (site_url, sha256)
+                )
+            """)
+
+    def lookup(self, site_url: str, sha256: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT attachment_id, url FROM media WHERE site_url = ? AND sha256 = ?",
+                (site_url, sha256)
+            ).fetchone()
+            if row:
+                conn.execute("""
+                    UPDATE media SET use_count = use_count + 1, last_used_at = ?
+                    WHERE site_url = ? AND sha256 = ?
+                """, (time.time(), site_url, sha256))
+
+        with self._lock:
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if row:
+            return {'id': row[0], 'url': row[1]}
+        return None
+
+    def store(self, site_url: str, sha256: str, attachment_id, url: str,
+              name: Optional[str] = None, size: Optional[int] = None) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO media
+                    (site_url, sha256, attachment_id, url, name, size, created_at, last_used_at, use_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)
+            """, (site_url, sha256, str(attachment_id), url, name, size, now, now))
+
+    def forget(self, site_url: str, sha256: str) -> None:
+        """WordPress'te silinmiş bir ek dosyanın kaydını kaldırır."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM media WHERE site_url = ? AND sha256 = ?", (site_url, sha256))
+
+    def stats(self) -> Dict:
+        with self._connect() as conn:
+            entries, total_bytes, reuses = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(use_count - 1), 0) FROM media"
+            ).fetchone()
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0,
+            "entries": entries,
+            "bytes": total_bytes,
+            "total_reuses": reuses,
+        }
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_media_index() -> MediaIndex:
+    """Uygulama genelinde paylaşılan MediaIndex örneğini döndürür."""
+    global _default_index
+    if _default_index is None:
+        with _default_index_lock:
+            if _default_index is None:
+                _default_index = MediaIndex()
+    return _default_index
@@ -0,0 +1,98 @@
+import hashlib
+import os
+import re
+from array import array
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv("config.env")
+
+# Benzerlik eşiği (tahmini Jaccard) ve eşiği aşan yazılar için davranış: flag (uyar ve yayınla),
+# block (yayınlama) ya da off (denetleme)
+DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", 0.7))
+DUPLICATE_ACTION = os.getenv("DUPLICATE_ACTION", "flag").lower()
+
+# Art arda gelen SHINGLE_SIZE kelime bir parça (shingle) sayılır
+SHINGLE_SIZE = 3
+# İmza tek geçişte üretilir (one permutation hashing): her parçanın 64 bit özetinin alt 7 biti 128 kovadan
+# birini seçer, kovada üst bitlerin en küçüğü tutulur. Her kova ayrı bir permütasyonun min-hash'i gibi
+# davranır; maliyet parça sayısıyla doğrusaldır (128 permütasyonda parça başına 128 çarpma yerine 1 işlem).
+# 128 min-hash değeri 32 banda (her biri 4 değer) bölünür. İki yazının en az bir bantta aynı kovaya düşme
+# olasılığı 1 - (1 - J^4)^32: J=0.7'de %99.9, J=0.5'te %87, J=0.3'te %23. Böylece yalnızca benzer olması
+# muhtemel yazıların imzaları karşılaştırılır; eşik 0.5'in altına indirilirse bazı eşleşmeler kaçabilir.
+NUM_PERM = 128
+LSH_BANDS = 32
+LSH_ROWS = NUM_PERM // LSH_BANDS
+
+_MAX_HASH = 0xFFFFFFFF
+_BIN_BITS = NUM_PERM.bit_length() - 1
+# Boş kova komşusundan değer ödünç alırken uzaklığa göre eklenen sabit (altın oran)
+_DENSIFY_STEP = 0x9E3779B1
+
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def shingles(text: str) -> set:
+    """Metni küçük harfe çevirip kelime parçalarına (shingle) böler; her parça 64 bit özetle temsil edilir."""
+    words = _WORD_PATTERN.findall(text.lower())
+    if not words:
+        return set()
+    if len(words) < SHINGLE_SIZE:
+        pieces = {" ".join(words)}
+    else:
+        pieces = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    return {int.from_bytes(hashlib.blake2b(piece.encode("utf-8"), digest_size=8).digest(), "little")
+            for piece in pieces}
+
+
+def minhash_signature(text: str) -> Optional[List[int]]:
+    """Metnin MinHash imzasını döndürür; metinde kelime yoksa None."""
+    hashes = shingles(text)
+    if not hashes:
+        return None
+
+    bins = [None] * NUM_PERM
+    for h in hashes:
+        index = h & (NUM_PERM - 1)
+        value = (h >> _BIN_BITS) & _MAX_HASH
+        current = bins[index]
+        if current is None or value < current:
+            bins[index] = value
+
+    # Kısa metinlerde boş kalan kovalar sağdaki ilk dolu kovadan doldurulur (döngüsel); iki metin için aynı
+    # kural uygulandığından eşit kova oranı yine Jaccard benzerliğini tahmin eder
+    signature = []
+    for index in range(NUM_PERM):
+        distance = 0
+        value = bins[index]
+        while value is None:
+            distance += 1
+            value = bins[(index + distance) % NUM_PERM]
+        signature.append((value + distance * _DENSIFY_STEP) & _MAX_HASH)
+    return signature
+
+
+def lsh_buckets(signature: List[int]) -> List[int]:
+    """İmzanın her bandı için kova numarası (64 bit işaretli tamsayı, SQLite INTEGER'a sığar)."""
+    buckets = []
+    for band in range(LSH_BANDS):
+        values = array("I", signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]).tobytes()
+        digest = hashlib.blake2b(values, digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, "little", signed=True))
+    return buckets
+
+
+def estimate_similarity(a: List[int], b: List[int]) -> float:
+    """İki imzanın eşit değerlerinin oranı; Jaccard benzerliğinin tahminidir."""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def signature_to_blob(signature: List[int]) -> bytes:
+    return array("I", signature).tobytes()
+
+
+def signature_from_blob(blob: bytes) -> List[int]:
+    signature = array("I")
+    signature.frombytes(blob)
+    return signature.tolist()
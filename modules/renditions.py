@@ -0,0 +1,257 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from PIL import Image
+from dotenv import load_dotenv
+
+from modules.http_client import get_http_client
+from modules.image_safety import ImageLimitError, PeakMemory, open_image, stream_response_to_file
+
+load_dotenv("config.env")
+
+FORMAT_EXTENSIONS = {"jpeg": "jpg", "png": "png", "webp": "webp"}
+
+# Görseller içerik sütunundan geniş gösterilmez; tarayıcı bu genişliğe göre srcset'ten seçim yapar
+DEFAULT_SIZES = "(max-width: 800px) 100vw, 800px"
+
+# Image.Resampling Pillow 9.1 ile geldi; requirements.txt'teki 8.3.2'de filtre doğrudan Image üzerindedir
+LANCZOS = getattr(Image, "Resampling", Image).LANCZOS
+
+
+def _env_list(name: str, default: str) -> List[str]:
+    return [item.strip().lower() for item in os.getenv(name, default).split(",") if item.strip()]
+
+
+def _save(img, path: str, fmt: str, quality: int) -> None:
+    if fmt == "jpeg" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    options = {"quality": quality} if fmt in ("jpeg", "webp") else {}
+    if fmt == "jpeg":
+        options["progressive"] = True
+    img.save(path, format=fmt.upper(), **options)
+
+
+def resize_to_file(source_path: str, output_path: str, width: int, height: int,
+                   maintain_aspect: bool, fmt: str, quality: int = 85) -> Dict:
+    """Görseli boyutlandırıp kaydeder; yeni boyutu ve bellek ölçümünü döndürür (işçi süreçte çalışır)."""
+    with PeakMemory() as memory:
+        # JPEG hedef boyuta yakın ölçekte çözülür; tam çözünürlüklü bitmap oluşturulmaz
+        with open_image(source_path, (width, height)) as img:
+            memory.track(img)
+            if maintain_aspect:
+                # En-boy oranını koru
+                img.thumbnail((width, height), LANCZOS)
+            else:
+                # Tam boyutlandırma; önce tam sayı katsayıyla hızlı küçültme (reduce), sonra LANCZOS
+                img = img.resize((width, height), LANCZOS, reducing_gap=3.0)
+            memory.track(img)
+            _save(img, output_path, fmt, quality)
+            size = img.size
+    return {"size": size, "memory": memory.report()}
+
+
+def render_renditions(source_path: str, output_dir: str, base_name: str, widths: List[int],
+                      formats: List[str], quality: int = 82) -> Dict:
+    """Kaynak görselin her genişlik ve biçim için bir kopyasını üretir (işçi süreçte çalışır).
+
+    Kaynaktan geniş kopyalar üretilmez; kaynak en küçük genişlikten darsa kendi genişliğinde tek kopya yapılır.
+    """
+    renditions = []
+    with PeakMemory() as memory:
+        with open_image(source_path) as img:
+            source_width, source_height = img.size
+            targets = sorted({w for w in widths if w < source_width} | {min(max(widths), source_width)})
+
+            # JPEG en büyük kopyaya yetecek en küçük ölçekte çözülür
+            if img.format == "JPEG":
+                img.draft(None, (targets[-1], max(1, round(source_height * targets[-1] / source_width))))
+            img.load()
+            memory.track(img)
+
+            # Büyükten küçüğe inilir; her kopya bir önceki büyük kopyadan küçültülür
+            current = img
+            for width in reversed(targets):
+                height = max(1, round(source_height * width / source_width))
+                if current.size != (width, height):
+                    current = current.resize((width, height), LANCZOS, reducing_gap=3.0)
+                    memory.track(current)
+                for fmt in formats:
+                    path = os.path.join(output_dir, f"{base_name}-{width}.{FORMAT_EXTENSIONS[fmt]}")
+                    _save(current, path, fmt, quality)
+                    renditions.append({"path": path, "width": width, "height": height, "format": fmt})
+
+    renditions.sort(key=lambda item: (item["format"], item["width"]))
+    return {"renditions": renditions, "memory": memory.report()}
+
+
+def build_srcset(renditions: Iterable[Dict], fmt: str) -> str:
+    """Belirtilen biçimdeki kopyalardan 'url 480w, url 800w' biçiminde srcset değeri üretir."""
+    return ", ".join(f"{item['url']} {item['width']}w" for item in renditions if item["format"] == fmt)
+
+
+class RenditionEngine:
+    """Görsellerin farklı genişlik ve biçimlerde (JPEG, WebP) kopyalarını bir süreç havuzunda üretir.
+
+    LANCZOS küçültme CPU yoğun olduğundan istek iş parçacıklarında değil ayrı süreçlerde yapılır; böylece
+    GIL Flask iş parçacıklarını bekletmez. Üretilen kopyalar kaynak URL'nin özetiyle diskte saklanır.
+    """
+
+    def __init__(self, directory: str = os.path.join("static", "images", "renditions"),
+                 widths: Optional[List[int]] = None, formats: Optional[List[str]] = None,
+                 max_workers: Optional[int] = None, quality: Optional[int] = None):
+        self.directory = directory
+        self.widths = widths or [int(w) for w in _env_list("RENDITION_WIDTHS", "480,800,1200")]
+        # wp:image içinde <picture> kullanılamadığından yazılarda tek biçimli srcset kullanılır
+        # (bkz. TemplateManager._format_image_tag); varsayılan JPEG, RENDITION_FORMATS=webp ile WebP
+        self.formats = formats or [f for f in _env_list("RENDITION_FORMATS", "jpeg") if f in FORMAT_EXTENSIONS]
+        self.max_workers = max_workers or int(os.getenv("RENDITION_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+        self.quality = quality or int(os.getenv("RENDITION_QUALITY", 82))
+
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+        # İşlem başına bellek ölçümlerinin özeti
+        self._stats_lock = threading.Lock()
+        self._stats = {"operations": 0, "rejected": 0, "max_peak_rss_bytes": 0, "max_rss_growth_bytes": 0,
+                       "max_peak_image_bytes": 0, "last": None}
+        # Aynı görselin kopyaları eşzamanlı iki istekte birden üretilmesin
+        self._key_locks = [threading.Lock() for _ in range(64)]
+        # İndirmeler G/Ç bekler; süreç havuzunu beslemek için ayrı iş parçacıkları kullanılır
+        self._download_executor = ThreadPoolExecutor(max_workers=int(os.getenv("RENDITION_DOWNLOAD_WORKERS", 4)),
+                                                     thread_name_prefix="rendition-download")
+        os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    # Uygulama süreci çok iş parçacıklıdır; fork edilen çocuk başka bir iş parçacığının tuttuğu
+                    # kilitle (G/Ç, sqlite, logging) açılıp kilitlenebilir. Bu yüzden varsayılan forkserver
+                    method = os.getenv("RENDITION_START_METHOD", "forkserver")
+                    if method not in multiprocessing.get_all_start_methods():
+                        method = "spawn"
+                    context = multiprocessing.get_context(method)
+                    if method == "forkserver":
+                        # Sunucu süreci yalnızca bu modülü (ve Pillow'u) yükler; işçiler ondan hızlıca çatallanır
+                        context.set_forkserver_preload([__name__])
+                    self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        return self._pool
+
+    def url_for(self, path: str) -> str:
+        return "/" + path.replace(os.sep, "/")
+
+    def _record(self, operation: str, memory: Optional[Dict]) -> None:
+        with self._stats_lock:
+            if memory is None:
+                self._stats["rejected"] += 1
+                return
+            self._stats["operations"] += 1
+            self._stats["max_peak_rss_bytes"] = max(self._stats["max_peak_rss_bytes"], memory["peak_rss_bytes"] or 0)
+            self._stats["max_rss_growth_bytes"] = max(self._stats["max_rss_growth_bytes"],
+                                                      memory["rss_growth_bytes"] or 0)
+            self._stats["max_peak_image_bytes"] = max(self._stats["max_peak_image_bytes"], memory["peak_image_bytes"])
+            self._stats["last"] = dict(memory, operation=operation)
+
+    def _run(self, operation: str, fn, *args) -> Dict:
+        try:
+            result = self.pool.submit(fn, *args).result()
+        except ImageLimitError:
+            self._record(operation, None)
+            raise
+        self._record(operation, result["memory"])
+        return result
+
+    def resize(self, source_path: str, output_path: str, width: int, height: int,
+               maintain_aspect: bool = True, fmt: str = "jpeg") -> Dict:
+        """Tek bir boyutlandırmayı süreç havuzunda yapar; {'size', 'memory'} döndürür."""
+        return self._run("resize", resize_to_file, source_path, output_path, width, height, maintain_aspect, fmt)
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            return dict(self._stats, workers=self.max_workers)
+
+    def _manifest_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key, "manifest.json")
+
+    def _load_manifest(self, key: str) -> Optional[List[Dict]]:
+        try:
+            with open(self._manifest_path(key), "r", encoding="utf-8") as f:
+                renditions = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if all(os.path.exists(item["path"]) for item in renditions):
+            return renditions
+        return None
+
+    def render_file(self, source_path: str, key: str) -> List[Dict]:
+        """Yerel dosyanın kopyalarını üretir; aynı anahtar için daha önce üretilmişse diskten döndürür."""
+        with self._key_locks[int(key[:8], 16) % len(self._key_locks)]:
+            renditions = self._load_manifest(key)
+            if renditions is not None:
+                return renditions
+            return self._render_file(source_path, key)
+
+    def _render_file(self, source_path: str, key: str) -> List[Dict]:
+        output_dir = os.path.dirname(self._manifest_path(key))
+        os.makedirs(output_dir, exist_ok=True)
+        renditions = self._run("renditions", render_renditions, source_path, output_dir, key[:12],
+                               self.widths, self.formats, self.quality)["renditions"]
+        for item in renditions:
+            item["url"] = self.url_for(item["path"])
+
+        # Kopyalar tamamlandıktan sonra yazılır; yarım kalan üretim önbellekten sunulmaz
+        with open(self._manifest_path(key), "w", encoding="utf-8") as f:
+            json.dump(renditions, f)
+        return renditions
+
+    def render_url(self, image_url: str) -> List[Dict]:
+        """Uzak görseli indirip kopyalarını üretir; hata durumunda boş liste döndürür."""
+        key = hashlib.sha256(image_url.encode("utf-8")).hexdigest()
+        renditions = self._load_manifest(key)
+        if renditions is not None:
+            return renditions
+
+        temp_dir = tempfile.mkdtemp(prefix="rendition-")
+        try:
+            source_path = os.path.join(temp_dir, "source")
+            response = get_http_client().get(image_url, stream=True)
+            try:
+                response.raise_for_status()
+                with open(source_path, "wb") as f:
+                    stream_response_to_file(response, f)
+            finally:
+                response.close()
+            return self.render_file(source_path, key)
+        except Exception as e:
+            print(f"Görsel kopyaları üretilemedi ({image_url}): {e}")
+            return []
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def render_many(self, image_urls: Iterable[str]) -> Dict[str, List[Dict]]:
+        """Birden fazla görselin kopyalarını eşzamanlı üretir; {url: kopyalar} döndürür."""
+        unique_urls = list(dict.fromkeys(url for url in image_urls if url))
+        futures = {url: self._download_executor.submit(self.render_url, url) for url in unique_urls}
+        return {url: future.result() for url, future in futures.items() if future.result()}
+
+
+_default_engine = None
+_default_engine_lock = threading.Lock()
+
+
+def get_rendition_engine() -> RenditionEngine:
+    """Uygulama genelinde paylaşılan RenditionEngine örneğini döndürür."""
+    global _default_engine
+    if _default_engine is None:
+        with _default_engine_lock:
+            if _default_engine is None:
+                _default_engine = RenditionEngine()
+    return _default_engine
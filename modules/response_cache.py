@@ -0,0 +1,51 @@
+import hashlib
+import threading
+from typing import Callable, Dict, NamedTuple
+
+
+class CachedResponse(NamedTuple):
+    version: str
+    etag: str
+    body: bytes
+
+
+class VersionedResponseCache:
+    """Veri sürümüne bağlı, bellekte tutulan yanıt önbelleği.
+
+    Her anahtar için yalnızca son sürümün yanıtı saklanır; sürüm değişmedikçe sayfa yeniden üretilmez.
+    ETag gövdenin özetidir, bu yüzden yeniden başlatmadan sonra aynı içerik aynı ETag'i alır.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, CachedResponse] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_etag(body: bytes) -> str:
+        return hashlib.blake2b(body, digest_size=12).hexdigest()
+
+    def get_or_render(self, key: str, version: str, render: Callable[[], str]) -> CachedResponse:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version:
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # Üretim kilit dışında yapılır; aynı sürüm için eşzamanlı iki üretim aynı sonucu verir
+        body = render().encode("utf-8")
+        entry = CachedResponse(version, self.make_etag(body), body)
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "versions": {key: entry.version for key, entry in self._entries.items()},
+            }
@@ -0,0 +1,48 @@
+import threading
+
+from modules.history_manager import HistoryManager
+from modules.template_manager import TemplateManager
+from modules.translation_manager import TranslationManager
+from modules.http_client import get_http_client
+
+
+class ServiceContainer:
+    """Uygulama başlarken bir kez kurulan ve istekler arasında paylaşılan yöneticiler."""
+
+    def __init__(self, history_manager=None, template_manager=None, translation_manager=None, wp_client=None):
+        self.history_manager = history_manager or HistoryManager()
+        self.template_manager = template_manager or TemplateManager()
+        self.translation_manager = translation_manager or TranslationManager()
+        self.wp_client = wp_client
+
+    def warm_up(self):
+        """İlk isteğin maliyetini düşürmek için önbellekleri önceden doldurur."""
+        try:
+            self.template_manager.get_templates()
+            # HTTP oturumu ve bağlantı havuzları burada kurulur
+            get_http_client().session
+        except Exception as e:
+            print(f"Servis ısındırma hatası: {e}")
+        return self
+
+
+_services = None
+_services_lock = threading.Lock()
+
+
+def init_services(**kwargs) -> ServiceContainer:
+    """Uygulama genelindeki servis kabını kurar ve döndürür."""
+    global _services
+    with _services_lock:
+        _services = ServiceContainer(**kwargs)
+    return _services
+
+
+def get_services() -> ServiceContainer:
+    """Kurulmuş servis kabını döndürür; henüz kurulmadıysa varsayılanlarla kurar."""
+    global _services
+    if _services is None:
+        with _services_lock:
+            if _services is None:
+                _services = ServiceContainer()
+    return _services
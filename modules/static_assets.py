@@ -0,0 +1,196 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+from typing import Dict, NamedTuple, Optional
+
+from dotenv import load_dotenv
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:  # İsteğe bağlı; yoksa yalnızca gzip sunulur
+    brotli = None
+
+load_dotenv("config.env")
+
+# Parmak izi verilen ve önceden sıkıştırılan dosya türleri; görseller (static/images) dinamik üretilir, dokunulmaz
+ASSET_EXTENSIONS = (".js", ".css", ".svg")
+SKIP_DIRS = ("images",)
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Dinamik yanıtlardan yalnızca bu türler ve bu boyutun üzerindekiler sıkıştırılır
+COMPRESSIBLE_MIMETYPES = ("text/html", "application/json")
+GZIP_MIN_BYTES = int(os.getenv("GZIP_MIN_BYTES", 1024))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", 6))
+
+
+class Asset(NamedTuple):
+    filename: str
+    fingerprinted: str
+    mimetype: str
+    etag: str
+    mtime_ns: int
+    # Kodlama adı ("identity", "gzip", "br") -> gövde
+    variants: Dict[str, bytes]
+
+
+def _build_asset(static_folder: str, filename: str) -> Asset:
+    path = os.path.join(static_folder, filename)
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+
+    root, ext = os.path.splitext(filename)
+    variants = {"identity": data, "gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(data, quality=11)
+    # Sıkıştırılmış hali daha büyükse (çok küçük dosyalar) o kodlama sunulmaz
+    variants = {name: body for name, body in variants.items() if name == "identity" or len(body) < len(data)}
+
+    return Asset(
+        filename=filename,
+        fingerprinted=f"{root}.{digest[:10]}{ext}",
+        mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+        etag=digest[:24],
+        mtime_ns=os.stat(path).st_mtime_ns,
+        variants=variants,
+    )
+
+
+class StaticAssets:
+    """static/ altındaki JS/CSS dosyalarına içerik özetiyle parmak izli ad verir ve sıkıştırılmış hallerini sunar.
+
+    Şablonlardaki url_for('static', filename='js/app.js') çağrıları js/app.<özet>.js adresini üretir. Ad
+    içerik değişince değiştiği için bu adresler bir yıl, yeniden doğrulanmadan önbellekte tutulabilir.
+    gzip (ve brotli kuruluysa br) halleri başlangıçta bir kez hazırlanır.
+    """
+
+    def __init__(self, static_folder: str, auto_reload: bool = False):
+        self.static_folder = static_folder
+        # Geliştirme kipinde dosya değişiklikleri yeniden başlatmadan algılanır
+        self.auto_reload = auto_reload
+        self._assets: Dict[str, Asset] = {}
+        self._by_fingerprint: Dict[str, Asset] = {}
+        self._lock = threading.Lock()
+
+    def build(self) -> "StaticAssets":
+        assets = {}
+        for dirpath, dirnames, filenames in os.walk(self.static_folder):
+            if dirpath == self.static_folder:
+                dirnames[:] = [name for name in dirnames if name not in SKIP_DIRS]
+            for name in filenames:
+                if name.endswith(ASSET_EXTENSIONS):
+                    filename = os.path.relpath(os.path.join(dirpath, name), self.static_folder).replace(os.sep, "/")
+                    assets[filename] = _build_asset(self.static_folder, filename)
+        with self._lock:
+            self._assets = assets
+            self._by_fingerprint = {asset.fingerprinted: asset for asset in assets.values()}
+        return self
+
+    def _refresh(self, asset: Asset) -> Asset:
+        try:
+            mtime_ns = os.stat(os.path.join(self.static_folder, asset.filename)).st_mtime_ns
+        except OSError:
+            return asset
+        if mtime_ns == asset.mtime_ns:
+            return asset
+        updated = _build_asset(self.static_folder, asset.filename)
+        with self._lock:
+            self._assets[asset.filename] = updated
+            self._by_fingerprint[updated.fingerprinted] = updated
+        return updated
+
+    def fingerprint(self, filename: str) -> Optional[str]:
+        asset = self._assets.get(filename)
+        if asset is None:
+            return None
+        if self.auto_reload:
+            asset = self._refresh(asset)
+        return asset.fingerprinted
+
+    def lookup(self, fingerprinted: str) -> Optional[Asset]:
+        return self._by_fingerprint.get(fingerprinted)
+
+    @property
+    def version(self) -> str:
+        """Tüm parmak izlerinin özeti; varlıklar değişince değişir (sayfa önbelleği anahtarı için)."""
+        with self._lock:
+            names = sorted(asset.fingerprinted for asset in self._assets.values())
+        return hashlib.sha256("\n".join(names).encode("utf-8")).hexdigest()[:12]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "brotli": brotli is not None,
+                "assets": {
+                    asset.filename: {
+                        "url": asset.fingerprinted,
+                        "bytes": {name: len(body) for name, body in asset.variants.items()},
+                    }
+                    for asset in self._assets.values()
+                },
+            }
+
+    def init_app(self, app) -> "StaticAssets":
+        """url_for('static', ...) adreslerini parmak izli adlara çevirir ve static görünümünü sarmalar."""
+        self.build()
+        original_static = app.view_functions["static"]
+
+        def url_defaults(endpoint, values):
+            if endpoint == "static" and "filename" in values:
+                fingerprinted = self.fingerprint(values["filename"])
+                if fingerprinted:
+                    values["filename"] = fingerprinted
+
+        def static(filename):
+            asset = self.lookup(filename)
+            if asset is None:
+                # Parmak izsiz adlar ve görseller Flask'ın varsayılan işleyicisiyle sunulur
+                return original_static(filename=filename)
+            return self.asset_response(asset)
+
+        app.url_defaults(url_defaults)
+        app.view_functions["static"] = static
+        return self
+
+    @staticmethod
+    def asset_response(asset: Asset):
+        encoding = "identity"
+        for name in ("br", "gzip"):
+            if name in asset.variants and request.accept_encodings.quality(name) > 0:
+                encoding = name
+                break
+
+        response = Response(asset.variants[encoding], mimetype=asset.mimetype)
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        # Her kodlama ayrı bir gösterimdir; ETag'leri de farklıdır
+        response.set_etag(asset.etag if encoding == "identity" else f"{asset.etag}-{encoding}")
+        return response.make_conditional(request)
+
+
+def compress_response(response):
+    """Büyük HTML ve JSON yanıtlarını istemci destekliyorsa gzip ile sıkıştırır (after_request)."""
+    if (response.direct_passthrough or response.is_streamed or response.status_code != 200
+            or "Content-Encoding" in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    if request.accept_encodings.quality("gzip") <= 0:
+        return response
+
+    data = response.get_data()
+    if len(data) < GZIP_MIN_BYTES:
+        return response
+
+    response.set_data(gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0))
+    response.headers["Content-Encoding"] = "gzip"
+    # Sıkıştırılmış gövde bayt bayt aynı olmadığından güçlü ETag zayıfa çevrilir; If-None-Match yine eşleşir
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
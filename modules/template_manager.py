@@ -3,12 +3,71 @@ import os
 from datetime import datetime
 import html
 import re
+import threading
+import time
 from typing import Dict, List, Optional
 
+from modules.renditions import DEFAULT_SIZES, build_srcset
+
+
+PLACEHOLDER_PATTERN = re.compile(r'@(\w+)@')
+
+# Eski '{name}' biçimindeki yer tutucular
+LEGACY_PLACEHOLDER_PATTERN = re.compile(r'\{\s*(\w+)\s*\}')
+
+# WordPress blok yorumları: <!-- wp:ns/name {"json":"attrs"} /-->
+# Öznitelik JSON'u, ardından '-->' gelen ilk '}' karakterinde biter (WordPress blok ayrıştırıcısıyla aynı kural)
+WP_BLOCK_COMMENT_PATTERN = re.compile(
+    r'<!--\s+(?P<closer>/)?wp:(?P<name>(?:[a-z][a-z0-9_-]*/)?[a-z][a-z0-9_-]*)\s+'
+    r'(?P<attrs>\{(?:[^}]|\}(?!\s+/?-->))*\}\s+)?(?P<void>/)?-->',
+    re.DOTALL
+)
+
+# JSON içindeki string değerleri
+JSON_STRING_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"')
+
+
+class CompiledTemplate:
+    """'@değişken@' şablonunun sabit metin ve yer tutucu parçalarına ayrılmış hali.
+
+    Render tek geçişte yapılır: parçalar sırayla doldurulur ve bir kez birleştirilir. Yerine konan
+    değerler tekrar taranmadığı için bir değerin içindeki '@x@' metni başka bir değişkenle değişmez.
+    """
+
+    __slots__ = ("source", "literals", "slots")
+
+    def __init__(self, source: str):
+        self.source = source
+        # re.split yakalama grubuyla [sabit, isim, sabit, isim, ..., sabit] listesi üretir
+        parts = PLACEHOLDER_PATTERN.split(source)
+        self.literals = parts[0::2]
+        self.slots = parts[1::2]
+
+    def render(self, values: Dict) -> str:
+        literals = self.literals
+        out = [literals[0]]
+        for i, name in enumerate(self.slots, 1):
+            if name in values:
+                out.append(str(values[name]))
+            out.append(literals[i])
+        return ''.join(out)
+
 
 class TemplateManager:
-    def __init__(self):
+    def __init__(self, reload_check_interval: Optional[float] = None):
         self.templates_file = "templates/saved_templates.json"
+        # Dosya değişikliği en fazla bu sıklıkta (saniye) kontrol edilir
+        self.reload_check_interval = (reload_check_interval if reload_check_interval is not None
+                                      else float(os.getenv("TEMPLATE_RELOAD_INTERVAL", 2)))
+
+        self._templates = None
+        self._normalized = {}
+        self._compiled = {}
+        self._file_signature = None
+        self._last_check = 0.0
+        self._version = 0
+        self._lock = threading.RLock()
+
         self._ensure_template_file_exists()
 
     def _ensure_template_file_exists(self):
@@ -21,7 +80,14 @@ class TemplateManager:
                     }
                 }, f, ensure_ascii=False, indent=2)
 
-    def get_templates(self) -> Dict:
+    def _get_file_signature(self):
+        try:
+            stat = os.stat(self.templates_file)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def _read_templates_file(self) -> Dict:
         try:
             with open(self.templates_file, 'r', encoding='utf-8') as f:
                 content = f.read()
@@ -36,6 +102,62 @@ class TemplateManager:
             print(f"Şablon okuma hatası: {e}")
             return {"default": self._get_default_template()}
 
+    def _normalize_content(self, template_content: str) -> str:
+        """Şablon içeriğini render için hazır '@' biçimine getirir."""
+        # Convert older templates using curly braces to our new format with '@' delimiters
+        if "{" in template_content and "}" in template_content:
+            # Replace simple variable placeholders but preserve WordPress block attributes
+            return self._convert_to_at_format(template_content)
+        return template_content
+
+    def _set_templates(self, templates: Dict, signature) -> None:
+        self._templates = templates
+        self._normalized = {
+            name: self._normalize_content(template.get("content", ""))
+            for name, template in templates.items()
+        }
+        self._compiled = {name: CompiledTemplate(content) for name, content in self._normalized.items()}
+        self._file_signature = signature
+        self._last_check = time.monotonic()
+        self._version += 1
+
+    def _ensure_loaded(self) -> None:
+        """Şablonlar bellekte yoksa ya da dosya değiştiyse yeniden yükler."""
+        with self._lock:
+            now = time.monotonic()
+            if self._templates is not None and now - self._last_check < self.reload_check_interval:
+                return
+
+            signature = self._get_file_signature()
+            if self._templates is not None and signature == self._file_signature:
+                self._last_check = now
+                return
+
+            self._set_templates(self._read_templates_file(), signature)
+
+    def get_templates(self) -> Dict:
+        self._ensure_loaded()
+        with self._lock:
+            return dict(self._templates)
+
+    def version(self) -> int:
+        """Şablonlar her kaydedildiğinde ya da dosya dışarıdan değişip yeniden yüklendiğinde artan sayaç."""
+        self._ensure_loaded()
+        with self._lock:
+            return self._version
+
+    def get_normalized_content(self, template_name: str) -> Optional[str]:
+        """Şablonun '@' biçimine çevrilmiş içeriğini bellekten döndürür."""
+        self._ensure_loaded()
+        with self._lock:
+            return self._normalized.get(template_name)
+
+    def get_compiled_template(self, template_name: str) -> Optional[CompiledTemplate]:
+        """Şablonun derlenmiş (parçalara ayrılmış) halini bellekten döndürür."""
+        self._ensure_loaded()
+        with self._lock:
+            return self._compiled.get(template_name)
+
     def _get_default_template(self) -> Dict:
         return {
             "name": "Varsayılan Blog Şablonu",
@@ -58,43 +180,47 @@ class TemplateManager:
 
     def save_template(self, name: str, content: str) -> None:
         try:
-            templates = self.get_templates()
-            # Convert '{' and '}' style placeholders to '@' style for new templates
-            content = content.replace("{", "@").replace("}", "@")
+            with self._lock:
+                templates = self.get_templates()
+                # Dönüşüm kayıt sırasında bir kez yapılır; kaydedilen içerik zaten '@' biçimindedir
+                content = self._normalize_content(content)
 
-            templates[name] = {
-                "name": name,
-                "content": content,
-                "created_at": datetime.now().isoformat()
-            }
+                templates[name] = {
+                    "name": name,
+                    "content": content,
+                    "created_at": datetime.now().isoformat()
+                }
 
-            with open(self.templates_file, 'w', encoding='utf-8') as f:
-                json.dump({"templates": templates}, f, ensure_ascii=False, indent=2)
+                with open(self.templates_file, 'w', encoding='utf-8') as f:
+                    json.dump({"templates": templates}, f, ensure_ascii=False, indent=2)
+
+                # Bellekteki kopyayı güncelle, dosyayı yeniden okumaya gerek yok
+                self._set_templates(templates, self._get_file_signature())
 
         except Exception as e:
             raise Exception(f"Şablon kaydetme hatası: {str(e)}")
 
     def apply_template(self, template_name: str, **kwargs) -> str:
         try:
-            templates = self.get_templates()
-            if template_name not in templates:
-                template_name = "default"
-
-            template_content = templates[template_name]["content"]
-
-            # Convert older templates using curly braces to our new format with '@' delimiters
-            if "{" in template_content and "}" in template_content:
-                # Replace simple variable placeholders but preserve WordPress block attributes
-                template_content = self._convert_to_at_format(template_content)
+            # Şablon bellekten, önceden derlenmiş haliyle alınır
+            compiled = self.get_compiled_template(template_name)
+            if compiled is None:
+                compiled = self.get_compiled_template("default")
+            if compiled is None:
+                compiled = CompiledTemplate(self._normalize_content(self._get_default_template()["content"]))
 
             # Resim hizalaması
             image_alignment = kwargs.get('image_alignment', 'none')
 
+            # Görsellerin önceden üretilmiş kopyaları ({url: kopyalar}); varsa srcset/sizes eklenir
+            image_renditions = kwargs.pop('image_renditions', None) or {}
+
             # Görselleri HTML formatına dönüştür
             kwargs['featured_image'] = self._format_featured_image(
                 kwargs.get('featured_image', ''),
                 kwargs.get('title', ''),
-                image_alignment
+                image_alignment,
+                image_renditions.get(kwargs.get('featured_image'))
             )
 
             if 'content_images' in kwargs and kwargs['content_images']:
@@ -148,13 +274,14 @@ class TemplateManager:
                         if img_align == 'bottom':
                             # Yazının en altına ekle
                             formatted_images.append(
-                                self._format_bottom_image(img_url, f"İçerik görseli {i}")
+                                self._format_bottom_image(img_url, f"İçerik görseli {i}", image_renditions.get(img_url))
                             )
                         else:
                             # Boş URL kontrolü
                             if img_url:
                                 formatted_images.append(
-                                    self._format_content_image(img_url, f"İçerik görseli {i}", img_align)
+                                    self._format_content_image(img_url, f"İçerik görseli {i}", img_align,
+                                                               image_renditions.get(img_url))
                                 )
                     except Exception as e:
                         print(f"Görsel formatlarken hata: {e}, data: {img_data}")
@@ -175,15 +302,8 @@ class TemplateManager:
             # Image_alignment değerini template'e ekle
             kwargs['image_alignment'] = image_alignment
 
-            # Now replace all @variable@ style placeholders
-            for key, value in kwargs.items():
-                placeholder = f"@{key}@"
-                template_content = template_content.replace(placeholder, str(value))
-
-            # Remove any remaining @variable@ placeholders with empty strings
-            template_content = re.sub(r'@\w+@', '', template_content)
-
-            return template_content
+            # Tüm @variable@ yer tutucularını tek geçişte doldur; bilinmeyenler boş kalır
+            return compiled.render(kwargs)
 
         except Exception as e:
             import traceback
@@ -199,35 +319,53 @@ class TemplateManager:
             return simple_content
 
     def _convert_to_at_format(self, template_content):
-        """Convert curly brace format to @ format, preserving WordPress block attributes."""
-        # First protect WordPress block attributes with a special marker
-        protected_content = re.sub(
-            r'(<!-- wp:.*?)(\{.*?\})(.*?-->)',
-            lambda m: m.group(1) + '__PROTECTED__' + str(hash(m.group(2))) + '__PROTECTED__' + m.group(3),
-            template_content
-        )
-
-        # Now convert regular variable placeholders
-        protected_content = re.sub(
-            r'\{([^{}]*)\}',
-            r'@\1@',
-            protected_content
-        )
-
-        # Restore protected WordPress block attributes
-        for match in re.finditer(r'__PROTECTED__(-?\d+)__PROTECTED__', protected_content):
-            hash_value = match.group(1)
-            for original_match in re.finditer(r'(<!-- wp:.*?)(\{.*?\})(.*?-->)', template_content):
-                if str(hash(original_match.group(2))) == hash_value:
-                    protected_content = protected_content.replace(
-                        f'__PROTECTED__{hash_value}__PROTECTED__',
-                        original_match.group(2)
-                    )
-                    break
-
-        return protected_content
-
-    def _format_featured_image(self, image_url: str, alt_text: str = '', alignment: str = 'none') -> str:
+        """Convert curly brace format to @ format, preserving WordPress block attributes.
+
+        The template is tokenized into plain text and WordPress block comments in a single pass.
+        Plain text gets '{name}' placeholders converted; block attribute JSON is kept as-is except
+        for placeholders inside its string values (e.g. {"align":"{image_alignment}"}).
+        """
+        parts = []
+        last = 0
+        for match in WP_BLOCK_COMMENT_PATTERN.finditer(template_content):
+            parts.append(LEGACY_PLACEHOLDER_PATTERN.sub(r'@\1@', template_content[last:match.start()]))
+
+            attrs = match.group('attrs')
+            if attrs:
+                converted_attrs = JSON_STRING_PATTERN.sub(
+                    lambda m: LEGACY_PLACEHOLDER_PATTERN.sub(r'@\1@', m.group(0)),
+                    attrs
+                )
+                parts.append(template_content[match.start():match.start('attrs')])
+                parts.append(converted_attrs)
+                parts.append(template_content[match.end('attrs'):match.end()])
+            else:
+                parts.append(match.group(0))
+            last = match.end()
+
+        parts.append(LEGACY_PLACEHOLDER_PATTERN.sub(r'@\1@', template_content[last:]))
+        return ''.join(parts)
+
+    def _format_image_tag(self, image_url: str, alt_text: str, css_class: str, renditions=None) -> str:
+        """<img> etiketini üretir; kopyalar varsa srcset/sizes ve boyut öznitelikleri eklenir.
+
+        Görseller wp:image blokları içinde yer alır; Gutenberg bu blokta <picture> kabul etmediğinden biçim
+        seçimi <source> ile değil, tek biçimli srcset ile yapılır (JPEG/PNG varsa o, yoksa ilk biçim).
+        """
+        img_attrs = f'src="{image_url}" alt="{html.escape(alt_text)}" class="{css_class}"'
+        if not renditions:
+            return f"<img {img_attrs}/>"
+
+        fallback = [item for item in renditions if item['format'] in ('jpeg', 'png')]
+        fmt = (fallback or renditions)[0]['format']
+        candidates = [item for item in renditions if item['format'] == fmt]
+        largest = max(candidates, key=lambda item: item['width'])
+        img_attrs += (f' srcset="{build_srcset(candidates, fmt)}" sizes="{DEFAULT_SIZES}"'
+                      f' width="{largest["width"]}" height="{largest["height"]}"')
+        return f"<img {img_attrs}/>"
+
+    def _format_featured_image(self, image_url: str, alt_text: str = '', alignment: str = 'none',
+                               renditions=None) -> str:
         if not image_url:
             return ''
 
@@ -235,24 +373,25 @@ class TemplateManager:
 
         # JSON içindeki çift tırnak kaçış karakterlerini düzgünce formatla
         return f"""<figure class="wp-block-image {align_class}">
-    <img src="{image_url}" alt="{html.escape(alt_text)}" class="featured-image wp-post-image"/>
+    {self._format_image_tag(image_url, alt_text, "featured-image wp-post-image", renditions)}
 </figure>"""
 
-    def _format_content_image(self, image_url: str, alt_text: str = '', alignment: str = 'none') -> str:
+    def _format_content_image(self, image_url: str, alt_text: str = '', alignment: str = 'none',
+                              renditions=None) -> str:
         align_class = f"align{alignment}" if alignment != 'none' else ""
 
         # Use double braces for JSON literals in WordPress blocks
         return f"""<!-- wp:image {{"align":"{alignment}"}} -->
 <figure class="wp-block-image {align_class}">
-    <img src="{image_url}" alt="{html.escape(alt_text)}" class="content-image"/>
+    {self._format_image_tag(image_url, alt_text, "content-image", renditions)}
 </figure>
 <!-- /wp:image -->"""
 
-    def _format_bottom_image(self, image_url: str, alt_text: str = '') -> str:
+    def _format_bottom_image(self, image_url: str, alt_text: str = '', renditions=None) -> str:
         # Yazının altına eklenen görseller için özel format
         return f"""<!-- wp:image {{"align":"center"}} -->
 <figure class="wp-block-image aligncenter">
-    <img src="{image_url}" alt="{html.escape(alt_text)}" class="content-image bottom-image"/>
+    {self._format_image_tag(image_url, alt_text, "content-image bottom-image", renditions)}
 </figure>
 <!-- /wp:image -->"""
 
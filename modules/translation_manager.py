@@ -1,45 +1,45 @@
-import json
 import os
+import threading
 import time
 import requests
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from modules.http_client import get_http_client
+from modules.translation_store import TranslationStore
+from modules.glossary import get_glossary
 
 
 class TranslationManager:
-    def __init__(self):
-        self.cache_file = "translation_cache.json"
-        self._load_cache()
+    def __init__(self, store=None, glossary=None):
+        self.store = store or TranslationStore()
+        self.glossary = glossary or get_glossary()
         self.translation_errors = 0
         self.max_errors = 3
         self.last_error_time = 0
+        # translate_many çevirileri iş parçacıklarında yapar; hata sayacı bu kilitle güncellenir
+        self._error_lock = threading.Lock()
 
         # Çeviri sistemi varsayılan olarak deaktif
         self.enabled = False
 
-    def _load_cache(self):
-        """Çeviri önbelleğini yükle."""
-        try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    self._cache = json.load(f)
-            else:
-                self._cache = {}
-        except Exception as e:
-            print(f"Önbellek yükleme hatası: {e}")
-            self._cache = {}
-
-    def _save_cache(self):
-        """Çeviri önbelleğini kaydet."""
-        try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self._cache, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Önbellek kaydetme hatası: {e}")
-
     def reset_error_count(self):
         """Hata sayacını sıfırla."""
-        self.translation_errors = 0
-        self.last_error_time = 0
+        with self._error_lock:
+            self.translation_errors = 0
+            self.last_error_time = 0
+
+    def _record_error(self):
+        with self._error_lock:
+            self.translation_errors += 1
+            self.last_error_time = time.time()
+
+    def _errors_exceeded(self):
+        """Son hatadan beri 15 dakika geçtiyse sayacı sıfırlar; arka arkaya çok fazla hata varsa True döner."""
+        with self._error_lock:
+            if self.last_error_time > 0 and time.time() - self.last_error_time > 900:
+                print("Hata sayacı sıfırlandı, çeviri tekrar denenecek.")
+                self.translation_errors = 0
+            return self.translation_errors >= self.max_errors
 
     def set_enabled(self, enabled):
         """Çeviri sistemini etkinleştir/devre dışı bırak."""
@@ -58,72 +58,25 @@ class TranslationManager:
             return text
 
         # Cache kontrolü
-        if text in self._cache:
-            print(f"Çeviri önbellekten bulundu: {text} -> {self._cache[text]}")
-            return self._cache[text]
-
-        # Son hatadan bu yana belirli bir süre geçtiyse hata sayacını sıfırla (15 dakika)
-        current_time = time.time()
-        if self.last_error_time > 0 and current_time - self.last_error_time > 900:
-            print("Hata sayacı sıfırlandı, çeviri tekrar denenecek.")
-            self.translation_errors = 0
+        cached = self.store.get(text)
+        if cached is not None:
+            print(f"Çeviri önbellekten bulundu: {text} -> {cached}")
+            return cached
 
-        # Arka arkaya çok fazla hata olduysa çeviriden vazgeç
-        if self.translation_errors >= self.max_errors:
+        # Arka arkaya çok fazla hata olduysa çeviriden vazgeç (15 dakika sonra yeniden denenir)
+        if self._errors_exceeded():
             print(f"Çok fazla çeviri hatası - çeviri devre dışı, orijinal metin kullanılıyor: {text}")
             return text
 
         try:
             print(f"Çevriliyor: {text}")
-            # Bilinen Türkçe-İngilizce çevirimlerinden bazılarını kontrol et
-            tr_to_en = {
-                "gezilecek yerler": "places to visit",
-                "tatil": "vacation",
-                "gezi": "travel",
-                "tur": "tour",
-                "rehber": "guide",
-                "blog": "blog",
-                "tarih": "history",
-                "deniz": "sea",
-                "plaj": "beach",
-                "kültür": "culture",
-                "yemek": "food",
-                "otel": "hotel",
-                "müze": "museum",
-                "şehir": "city",
-                "doğa": "nature",
-                "manzara": "landscape",
-                "münih": "munich",
-                "berlin": "berlin",
-                "istanbul": "istanbul",
-                "antalya": "antalya",
-                "izmir": "izmir",
-                "paris": "paris",
-                "londra": "london",
-                "roma": "rome",
-                "atina": "athens",
-                "barselona": "barcelona",
-                "venedik": "venice",
-                "almanya": "germany",
-                "fransa": "france",
-                "italya": "italy",
-                "yunanistan": "greece",
-                "ispanya": "spain"
-                # İhtiyaca göre daha fazla kelime eklenebilir
-            }
-
-            # Basit kelime çevirisi
+            # Bilinen Türkçe-İngilizce çevirimlerini derlenmiş sözlükle tek geçişte uygula
             original_text = text  # Orijinal metni saklayalım
-            lower_text = text.lower()
-
-            for tr_word, en_word in tr_to_en.items():
-                if tr_word in lower_text:
-                    text = text.replace(tr_word, en_word)
+            text = self.glossary.translate(text)
 
             # Eğer basit çeviri sonucunda metin değiştiyse, önbelleğe kaydet ve döndür
             if text != original_text:
-                self._cache[original_text] = text
-                self._save_cache()
+                self.store.set(original_text, text)
                 return text
 
             # Çeviri API dene
@@ -133,12 +86,11 @@ class TranslationManager:
                 api_url = f"https://api.mymemory.translated.net/get?q={encoded_text}&langpair=tr|en"
 
                 print(f"API isteği gönderiliyor: {api_url}")
-                response = requests.get(api_url, timeout=10)
+                response = get_http_client().get(api_url)
 
                 if response.status_code != 200:
                     print(f"API yanıt kodu hatalı: {response.status_code}")
-                    self.translation_errors += 1
-                    self.last_error_time = time.time()
+                    self._record_error()
                     return text
 
                 result = response.json()
@@ -147,36 +99,72 @@ class TranslationManager:
                     translated_text = result["responseData"]["translatedText"]
 
                     # Sonucu önbelleğe kaydet
-                    self._cache[original_text] = translated_text
-                    self._save_cache()
+                    self.store.set(original_text, translated_text)
 
                     # Hata sayacını sıfırla
-                    self.translation_errors = 0
-                    self.last_error_time = 0
+                    self.reset_error_count()
 
                     return translated_text
                 else:
                     # API yanıt hatası, detaylı bilgi alalım
                     error_msg = result.get("responseDetails", "Bilinmeyen API hatası")
                     print(f"API yanıt hatası: {error_msg}")
-                    self.translation_errors += 1
-                    self.last_error_time = time.time()
+                    self._record_error()
                     return text
 
             except requests.exceptions.RequestException as req_error:
                 print(f"HTTP istek hatası: {req_error}")
-                self.translation_errors += 1
-                self.last_error_time = time.time()
+                self._record_error()
                 return text
 
             except Exception as api_error:
                 print(f"Çeviri API hatası: {api_error}")
-                self.translation_errors += 1
-                self.last_error_time = time.time()
+                self._record_error()
                 return text
 
         except Exception as e:
             print(f"Genel çeviri hatası: {e}")
-            self.translation_errors += 1
-            self.last_error_time = time.time()
-            return text  # Hata durumunda orijinal metni döndür
\ No newline at end of file
+            self._record_error()
+            return text  # Hata durumunda orijinal metni döndür
+
+    def translate_many(self, texts, max_workers=None):
+        """Birden fazla metni tek seferde çevirir ve {orijinal: çeviri} sözlüğü döndürür.
+
+        Tekrarlanan metinler bir kez işlenir. Önbellekte veya sözlükte bulunanlar hemen yanıtlanır,
+        yalnızca kalanlar sınırlı sayıda eşzamanlı API isteğiyle çevrilir.
+        """
+        # Sırayı koruyarak tekilleştir
+        unique_texts = list(dict.fromkeys(t for t in texts if isinstance(t, str)))
+
+        if not self.enabled:
+            return {text: text for text in unique_texts}
+
+        results = {}
+        misses = []
+
+        for text in unique_texts:
+            if not text.strip():
+                results[text] = text
+                continue
+
+            cached = self.store.get(text)
+            if cached is not None:
+                results[text] = cached
+                continue
+
+            glossary_result = self.glossary.translate(text)
+            if glossary_result != text:
+                self.store.set(text, glossary_result)
+                results[text] = glossary_result
+                continue
+
+            misses.append(text)
+
+        if misses:
+            print(f"Toplu çeviri: {len(unique_texts)} metin, {len(misses)} tanesi API ile çevrilecek")
+            workers = max_workers or int(os.getenv("TRANSLATION_BATCH_WORKERS", 4))
+            with ThreadPoolExecutor(max_workers=min(workers, len(misses))) as executor:
+                for text, translated in zip(misses, executor.map(self.translate_to_english, misses)):
+                    results[text] = translated
+
+        return {text: results[text] for text in unique_texts}
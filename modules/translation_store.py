@@ -0,0 +1,173 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv("config.env")
+
+
+class TranslationStore:
+    """SQLite tabanlı çeviri deposu.
+
+    Önde sınırlı bir bellek içi LRU bulunur; aramalar yalnızca gerektiğinde veritabanına gider.
+    Yeni çeviriler toplu olarak (write-behind) yazılır, böylece her çeviri tüm dosyayı yeniden yazmaz.
+    """
+
+    def __init__(self, db_file: str = "translation_cache.db", legacy_json_file: Optional[str] = "translation_cache.json",
+                 lru_size: Optional[int] = None, batch_size: Optional[int] = None,
+                 flush_interval: Optional[float] = None):
+        self.db_file = db_file
+        self.legacy_json_file = legacy_json_file
+        self.lru_size = lru_size or int(os.getenv("TRANSLATION_LRU_SIZE", 2048))
+        self.batch_size = batch_size or int(os.getenv("TRANSLATION_WRITE_BATCH", 50))
+        self.flush_interval = flush_interval or float(os.getenv("TRANSLATION_FLUSH_INTERVAL", 2.0))
+
+        self._lru = OrderedDict()
+        self._pending = {}
+        self._lock = threading.RLock()
+        self._flush_timer = None
+
+        self._init_db()
+        self._migrate_legacy_json()
+        atexit.register(self.flush)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_file, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS translations (
+                    source_text TEXT PRIMARY KEY,
+                    translated_text TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS store_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+
+    def _migrate_legacy_json(self):
+        """Eski translation_cache.json dosyasını bir kez veritabanına aktarır."""
+        if not self.legacy_json_file or not os.path.exists(self.legacy_json_file):
+            return
+
+        with self._connect() as conn:
+            done = conn.execute(
+                "SELECT value FROM store_meta WHERE key = 'legacy_json_migrated'"
+            ).fetchone()
+            if done:
+                return
+
+            try:
+                with open(self.legacy_json_file, 'r', encoding='utf-8') as f:
+                    legacy = json.load(f)
+            except Exception as e:
+                print(f"Eski çeviri önbelleği okunamadı, aktarım atlandı: {e}")
+                return
+
+            now = time.time()
+            # Mevcut kayıtlar korunur; eski dosya yalnızca eksik olanları doldurur
+            conn.executemany(
+                "INSERT OR IGNORE INTO translations (source_text, translated_text, updated_at) VALUES (?, ?, ?)",
+                ((str(k), str(v), now) for k, v in legacy.items())
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('legacy_json_migrated', ?)",
+                (str(now),)
+            )
+            print(f"{len(legacy)} çeviri {self.legacy_json_file} dosyasından aktarıldı.")
+
+    def _remember(self, key: str, value: str) -> None:
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def get(self, text: str) -> Optional[str]:
+        with self._lock:
+            if text in self._lru:
+                self._lru.move_to_end(text)
+                return self._lru[text]
+            if text in self._pending:
+                return self._pending[text]
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT translated_text FROM translations WHERE source_text = ?", (text,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        with self._lock:
+            self._remember(text, row[0])
+        return row[0]
+
+    def __contains__(self, text: str) -> bool:
+        return self.get(text) is not None
+
+    def set(self, text: str, translated: str) -> None:
+        with self._lock:
+            self._remember(text, translated)
+            self._pending[text] = translated
+
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+            else:
+                self._schedule_flush_locked()
+
+    def _schedule_flush_locked(self) -> None:
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def set_many(self, items: Dict[str, str]) -> None:
+        for text, translated in items.items():
+            self.set(text, translated)
+
+    def flush(self) -> None:
+        """Bekleyen çevirileri veritabanına yazar."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        if not self._pending:
+            return
+
+        pending = self._pending
+        self._pending = {}
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO translations (source_text, translated_text, updated_at) VALUES (?, ?, ?)",
+                    ((k, v, now) for k, v in pending.items())
+                )
+        except Exception as e:
+            print(f"Çeviri deposu yazma hatası: {e}")
+            # Yazılamayan kayıtları bir sonraki denemeye bırak; yeni yazma gelmese de zamanlayıcı yeniden dener
+            pending.update(self._pending)
+            self._pending = pending
+            self._schedule_flush_locked()
+
+    def __len__(self) -> int:
+        self.flush()
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
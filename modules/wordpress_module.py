@@ -1,65 +1,300 @@
-from wordpress_xmlrpc import Client, WordPressPost
-from wordpress_xmlrpc.methods.posts import NewPost
-from wordpress_xmlrpc.methods.media import UploadFile
-from wordpress_xmlrpc.methods import taxonomies
-from wordpress_xmlrpc.methods import posts
+import html
+import mimetypes
 import os
+import re
+import shutil
+import tempfile
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from modules.media_index import file_sha256, get_media_index
+from modules.http_client import get_http_client
+from modules.image_safety import stream_response_to_file
+from modules.wp_transports import XmlRpcTransport, create_transport
+
+# İçerikteki <img src="..."> değerleri
+IMG_SRC_PATTERN = re.compile(r'(<img\b[^>]*?\bsrc=)(["\'])(.*?)\2', re.IGNORECASE | re.DOTALL)
+
+# <img>/<source> srcset="url 480w, url 800w" değerleri
+SRCSET_PATTERN = re.compile(r'(\bsrcset=)(["\'])(.*?)\2', re.IGNORECASE | re.DOTALL)
+
+# srcset taşıyabilen etiketler ve adaylarının tümü düşerse kaldırılacak öznitelikler
+SRCSET_TAG_PATTERN = re.compile(r'<(img|source)\b[^>]*>', re.IGNORECASE)
+EMPTY_SRCSET_ATTRS_PATTERN = re.compile(r'\s+(?:srcset|sizes)=(["\']).*?\1', re.IGNORECASE | re.DOTALL)
+
+# <img class="..."> değeri
+CLASS_ATTR_PATTERN = re.compile(r'(\bclass=)(["\'])(.*?)\2', re.IGNORECASE | re.DOTALL)
 
 
 class WordpressClient:
-    def __init__(self, url, username, password):
-        self.client = Client(url + "/xmlrpc.php", username, password)
+    def __init__(self, url, username, password, media_index=None, transport=None):
+        self.site_url = url.rstrip('/')
+        self.media_index = media_index or get_media_index()
+        self.username = username
+        self.password = password
+
+        # REST veya XML-RPC; WP_TRANSPORT ayarıyla seçilir (varsayılan: REST erişilebilirse REST).
+        # Seçim ağ isteği gerektirebildiği için nesne kurulurken değil ilk kullanımda yapılır
+        self._transport = transport
+        self._transport_lock = threading.Lock()
+
+        # Uzak görsellerin indirilip yüklenmesi için sınırlı iş parçacığı havuzu
+        self._upload_executor = ThreadPoolExecutor(max_workers=int(os.getenv("WP_UPLOAD_WORKERS", 4)),
+                                                   thread_name_prefix="wp-upload")
+
+    @property
+    def transport(self):
+        if self._transport is None:
+            with self._transport_lock:
+                if self._transport is None:
+                    self._transport = create_transport(self.site_url, self.username, self.password)
+                    print(f"WordPress taşıma katmanı: {self._transport.name}")
+        return self._transport
+
+    @property
+    def client(self):
+        """Geriye dönük uyumluluk için XML-RPC istemcisi (yalnızca XML-RPC taşımasında)."""
+        if isinstance(self.transport, XmlRpcTransport):
+            return self.transport.get_client()
+        return None
 
     def upload_image(self, image_path):
-        """WordPress'e resmi yükler ve ek dosya kimliğini döndürür."""
+        """WordPress'e resmi yükler ve ek dosya kimliğini döndürür.
+
+        Aynı içerik bu siteye daha önce yüklendiyse yükleme yapılmaz, mevcut ek dosya döndürülür.
+        """
         if not os.path.exists(image_path):
             return None
 
-        with open(image_path, 'rb') as img:
-            data = {
-                'name': os.path.basename(image_path),
-                'type': 'image/jpeg',  # PNG kullanıyorsan image/png yap
-                'bits': img.read(),
-            }
+        try:
+            sha256 = file_sha256(image_path)
+            cached = self.media_index.lookup(self.site_url, sha256)
+            if cached and self._attachment_exists(cached['url']):
+                print(f"Görsel daha önce yüklenmiş, yeniden kullanılıyor: {cached['url']}")
+                return cached
+            if cached:
+                # Ek dosya WordPress'te silinmiş; kayıt kaldırılır ve görsel yeniden yüklenir
+                print(f"Daha önce yüklenen görsel WordPress'te bulunamadı, yeniden yükleniyor: {cached['url']}")
+                self.media_index.forget(self.site_url, sha256)
+        except Exception as e:
+            print(f"Medya indeksi hatası: {e}")
+            sha256 = None
+
+        name = os.path.basename(image_path)
+        try:
+            response = self.transport.upload_media(
+                image_path, name, mimetypes.guess_type(image_path)[0] or 'image/jpeg'
+            )
+        except Exception as e:
+            print(f"Resim yükleme hatası: {e}")
+            return None
 
+        if sha256:
             try:
-                response = self.client.call(UploadFile(data))
-                return {
-                    'id': response['id'],
-                    'url': response['url']  # Resim URL'sini de döndür
-                }
+                self.media_index.store(self.site_url, sha256, response['id'], response['url'],
+                                       name=name, size=os.path.getsize(image_path))
             except Exception as e:
-                print(f"Resim yükleme hatası: {e}")
-                return None
+                print(f"Medya indeksi kaydetme hatası: {e}")
+
+        return {
+            'id': response['id'],
+            'url': response['url']  # Resim URL'sini de döndür
+        }
+
+    @staticmethod
+    def _attachment_exists(url):
+        """Medya indeksindeki dosyanın sitede hâlâ durduğunu HEAD isteğiyle doğrular.
+
+        Yalnızca 404/410 silinmiş sayılır; ağ hatasında kayıt kullanılmaya devam eder.
+        """
+        try:
+            response = get_http_client().request('HEAD', url, allow_redirects=True)
+            response.close()
+        except Exception as e:
+            print(f"Ek dosya doğrulanamadı ({url}): {e}")
+            return True
+        return response.status_code not in (404, 410)
+
+    def _download_to_temp(self, image_url):
+        """Uzak görseli belleğe almadan geçici bir dosyaya akıtır ve dosya yolunu döndürür."""
+        response = get_http_client().get(image_url, stream=True)
+        try:
+            response.raise_for_status()
+
+            name = os.path.basename(urllib.parse.urlsplit(image_url).path) or "image"
+            if not os.path.splitext(name)[1]:
+                content_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+                name += mimetypes.guess_extension(content_type) or '.jpg'
+
+            temp_dir = tempfile.mkdtemp(prefix="wp-upload-")
+            temp_path = os.path.join(temp_dir, name)
+            try:
+                with open(temp_path, 'wb') as f:
+                    # Boyut sınırı aşılırsa indirme kesilir (IMAGE_MAX_DOWNLOAD_BYTES)
+                    stream_response_to_file(response, f)
+            except Exception:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+                raise
+            return temp_path
+        finally:
+            response.close()
+
+    def upload_remote_image(self, image_url):
+        """Uzak görseli indirip WordPress'e yükler; {'id', 'url'} ya da None döndürür."""
+        temp_path = None
+        try:
+            # İçerikten alınan adresler HTML kaçışlı olabilir (&amp;)
+            temp_path = self._download_to_temp(html.unescape(image_url))
+            return self.upload_image(temp_path)
+        except Exception as e:
+            print(f"Uzak görsel yükleme hatası ({image_url}): {e}")
+            return None
+        finally:
+            if temp_path:
+                shutil.rmtree(os.path.dirname(temp_path), ignore_errors=True)
+
+    def _is_remote_url(self, url):
+        # Zaten bu sitede bulunan görseller yeniden yüklenmez
+        return (isinstance(url, str) and url.startswith(('http://', 'https://'))
+                and not url.startswith(self.site_url + '/'))
+
+    @staticmethod
+    def _srcset_candidates(srcset):
+        """'url 480w, url 800w' değerini [(url, tanımlayıcı)] listesine ayırır."""
+        candidates = []
+        for candidate in srcset.split(','):
+            parts = candidate.strip().split(None, 1)
+            if parts:
+                candidates.append((parts[0], parts[1] if len(parts) > 1 else ''))
+        return candidates
+
+    @staticmethod
+    def _local_static_path(url):
+        # Uygulamanın ürettiği görsel kopyaları (/static/...) yerel dosyadan yüklenir
+        if not isinstance(url, str) or not url.startswith('/static/'):
+            return None
+        path = url.lstrip('/')
+        return path if os.path.exists(path) else None
+
+    @staticmethod
+    def _collect_uploads(futures):
+        uploaded = {}
+        for url, future in futures.items():
+            result = future.result()
+            if result:
+                uploaded[url] = result
+        return uploaded
+
+    def _submit_local_uploads(self, image_urls):
+        unique_urls = list(dict.fromkeys(url for url in image_urls if self._local_static_path(url)))
+        return {url: self._upload_executor.submit(self.upload_image, self._local_static_path(url))
+                for url in unique_urls}
+
+    def upload_local_images(self, image_urls):
+        """srcset içindeki yerel görsel kopyalarını eşzamanlı yükler ve {url: {'id', 'url'}} döndürür."""
+        return self._collect_uploads(self._submit_local_uploads(image_urls))
+
+    def upload_remote_images(self, image_urls):
+        """Uzak görselleri eşzamanlı yükler ve {orijinal_url: {'id', 'url'}} sözlüğü döndürür."""
+        unique_urls = list(dict.fromkeys(url for url in image_urls if self._is_remote_url(url)))
+        futures = {url: self._upload_executor.submit(self.upload_remote_image, url) for url in unique_urls}
+        return self._collect_uploads(futures)
+
+    @staticmethod
+    def _add_class(tag, class_name):
+        match = CLASS_ATTR_PATTERN.search(tag)
+        if match is None:
+            return re.sub(r'^<img\b', f'<img class="{class_name}"', tag, count=1, flags=re.IGNORECASE)
+        if class_name in match.group(3).split():
+            return tag
+        value = f"{match.group(3)} {class_name}".strip()
+        return f"{tag[:match.start()]}{match.group(1)}{match.group(2)}{value}{match.group(2)}{tag[match.end():]}"
+
+    @classmethod
+    def rewrite_image_sources(cls, content, uploaded):
+        """İçerikteki <img src> ve srcset adreslerini yüklenen WordPress medya adresleriyle değiştirir.
+
+        Yüklenemeyen yerel kopyalar (/static/...) yayınlanan yazıda çalışmayacağından srcset'ten çıkarılır.
+        Hiç aday kalmazsa <img> srcset/sizes olmadan yalnızca src ile kalır, <source> etiketi kaldırılır.
+        src'si yüklenen ek dosyaya çevrilen <img> wp-image-{id} sınıfını alır; srcset'i olmayan böyle bir
+        görsele WordPress yazıyı gösterirken kendi ara boyutlarından srcset ekler.
+        """
+        attachment_ids = {media['url']: media['id'] for media in uploaded.values()}
+
+        def replace(match):
+            media = uploaded.get(match.group(3))
+            if not media:
+                return match.group(0)
+            return f"{match.group(1)}{match.group(2)}{media['url']}{match.group(2)}"
+
+        def replace_tag(tag_match):
+            has_candidates = []
+
+            def replace_srcset(match):
+                candidates = []
+                for url, descriptor in cls._srcset_candidates(match.group(3)):
+                    if url in uploaded:
+                        url = uploaded[url]['url']
+                    elif not url.startswith(('http://', 'https://', '//')):
+                        continue
+                    candidates.append(f"{url} {descriptor}".strip())
+                has_candidates.append(bool(candidates))
+                return f"{match.group(1)}{match.group(2)}{', '.join(candidates)}{match.group(2)}"
+
+            tag = SRCSET_PATTERN.sub(replace_srcset, tag_match.group(0))
+            if has_candidates and not any(has_candidates):
+                if tag_match.group(1).lower() == 'source':
+                    return ''
+                tag = EMPTY_SRCSET_ATTRS_PATTERN.sub('', tag)
+
+            src = IMG_SRC_PATTERN.match(tag)
+            if src and src.group(3) in attachment_ids:
+                tag = cls._add_class(tag, f"wp-image-{attachment_ids[src.group(3)]}")
+            return tag
+
+        content = IMG_SRC_PATTERN.sub(replace, content) if uploaded else content
+        return SRCSET_TAG_PATTERN.sub(replace_tag, content)
 
     def upload_post(self, title, content, image_path, publish_date, tags=None):
         """WordPress'e yazıyı ek dosya kimliği ile birlikte yükler."""
-        post = WordPressPost()
-        post.title = title
-        post.post_status = "publish"  # Zamanlamak istersen "future" kullan
+        post = {
+            'title': title,
+            'status': "publish",  # Zamanlamak istersen "future" kullan
+        }
 
         if publish_date:
-            post.date = publish_date
-
-        # Önce resmi yükle
-        image_data = None
-        if image_path and os.path.exists(image_path):
-            image_data = self.upload_image(image_path)
-        elif isinstance(image_path, str) and image_path.startswith('http'):
-            # Doğrudan URL olarak geçildi
-            post.content = content
-        else:
-            post.content = content
+            post['date'] = publish_date
+
+        # Önce resmi yükle. Öne çıkan görsel ve içerikteki uzak görseller birlikte, eşzamanlı yüklenir
+        featured_is_local = bool(image_path) and os.path.exists(image_path)
+        featured_future = self._upload_executor.submit(self.upload_image, image_path) if featured_is_local else None
+
+        # srcset içindeki yerel görsel kopyaları (yalnızca IMAGE_RENDITIONS=1 iken bulunur) da WordPress'e yüklenir
+        srcset_urls = [url for match in SRCSET_PATTERN.finditer(content)
+                       for url, _ in self._srcset_candidates(match.group(3))]
+        local_futures = self._submit_local_uploads(srcset_urls)
+
+        remote_urls = [image_path] if isinstance(image_path, str) and not featured_is_local else []
+        remote_urls += [match.group(3) for match in IMG_SRC_PATTERN.finditer(content)]
+        uploaded = self.upload_remote_images(remote_urls)
+        uploaded.update(self._collect_uploads(local_futures))
+        content = self.rewrite_image_sources(content, uploaded)
+
+        image_data = featured_future.result() if featured_future else None
+        if not featured_is_local and image_path in uploaded:
+            # Uzak öne çıkan görsel içerikte zaten yer aldığı için yalnızca öne çıkan görsel olarak ayarlanır
+            post['thumbnail'] = uploaded[image_path]['id']
 
         if image_data:
             # Öne çıkan görsel olarak ayarla
-            post.thumbnail = image_data['id']
+            post['thumbnail'] = image_data['id']
 
             # İçeriğin başına resmi HTML olarak ekle
-            img_html = f'<img src="{image_data["url"]}" alt="{title}" class="wp-post-image"/>'
-            post.content = img_html + content
+            img_html = (f'<img src="{image_data["url"]}" alt="{title}"'
+                        f' class="wp-post-image wp-image-{image_data["id"]}"/>')
+            post['content'] = img_html + content
         else:
-            post.content = content
+            post['content'] = content
 
         # Etiketleri ekle
         if tags:
@@ -69,12 +304,10 @@ class WordpressClient:
             else:
                 tag_list = tags
 
-            post.terms_names = {
-                'post_tag': tag_list
-            }
+            post['tags'] = [tag for tag in tag_list if tag]
 
         try:
-            post_id = self.client.call(NewPost(post))
+            post_id = self.transport.create_post(post)
             return post_id
         except Exception as e:
             print(f"İçerik yükleme hatası: {e}")
@@ -0,0 +1,415 @@
+import os
+import threading
+import time
+import unicodedata
+import urllib.parse
+import xmlrpc.client
+from datetime import timezone
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+from wordpress_xmlrpc import Client, WordPressPost
+from wordpress_xmlrpc.exceptions import InvalidCredentialsError, XmlrpcDisabledError
+from wordpress_xmlrpc.methods.posts import NewPost
+from wordpress_xmlrpc.methods.media import UploadFile
+from dotenv import load_dotenv
+
+from modules.http_client import get_http_client
+
+load_dotenv("config.env")
+
+
+class TransportError(Exception):
+    """WordPress taşıma katmanı hatası."""
+
+
+def _content_disposition(name: str) -> str:
+    """Medya yüklemesi için Content-Disposition başlığı; ASCII dışı adlar RFC 5987 ile kodlanır.
+
+    HTTP başlıkları latin-1 ile gönderildiğinden Türkçe karakterli ad doğrudan yazılamaz. Adın aksanları
+    atılmış ASCII hali filename=, asıl hali filename*= ile verilir; WordPress ikincisini tercih eder.
+    """
+    # Noktasız ı ayrışmaz; atılmaması için önce i'ye çevrilir
+    ascii_name = unicodedata.normalize('NFKD', name.replace('ı', 'i')).encode('ascii', 'ignore').decode('ascii')
+    ascii_name = ascii_name.replace('"', '').replace('\\', '').strip() or 'upload'
+    if ascii_name == name:
+        return f'attachment; filename="{name}"'
+    return f"attachment; filename=\"{ascii_name}\"; filename*=UTF-8''{urllib.parse.quote(name, safe='')}"
+
+
+def _to_gmt(date):
+    """Yayın tarihini saat dilimsiz GMT'ye çevirir; saat dilimsiz tarihler zaten GMT kabul edilir."""
+    if date.tzinfo is not None:
+        return date.astimezone(timezone.utc).replace(tzinfo=None)
+    return date
+
+
+def _fault_to_exception(fault_code, fault_string):
+    # wordpress_xmlrpc.Client.call ile aynı eşleme
+    if fault_code == 403:
+        return InvalidCredentialsError(fault_string)
+    if fault_code == 405:
+        return XmlrpcDisabledError(fault_string)
+    return xmlrpc.client.Fault(fault_code, fault_string)
+
+
+class XmlRpcBatcher:
+    """Farklı iş parçacıklarından gelen bağımsız XML-RPC çağrılarını system.multicall ile gruplar.
+
+    Çağıran bir Future alır. Kısa bir bekleme süresi (max_delay) içinde biriken çağrılar tek istekte
+    gönderilir; her çağrının sonucu ya da hatası kendi Future'ına aktarılır. Gönderilmekte olan başka
+    bir istek yoksa beklenmez; tek başına gelen çağrı gecikmeden gönderilir.
+    """
+
+    def __init__(self, transport, max_batch: Optional[int] = None, max_delay: Optional[float] = None,
+                 max_bytes: Optional[int] = None, senders: Optional[int] = None):
+        self.transport = transport
+        self.max_batch = max_batch or int(os.getenv("WP_MULTICALL_MAX_CALLS", 20))
+        self.max_delay = max_delay if max_delay is not None else float(os.getenv("WP_MULTICALL_DELAY", 0.02))
+        self.max_bytes = max_bytes or int(os.getenv("WP_MULTICALL_MAX_BYTES", 8 * 1024 * 1024))
+
+        self._pending = []
+        # Gönderilmekte olan (yanıtı beklenen) grup sayısı
+        self._in_flight = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._senders = ThreadPoolExecutor(max_workers=senders or int(os.getenv("WP_MULTICALL_SENDERS", 2)),
+                                           thread_name_prefix="xmlrpc-multicall")
+        self._collector = threading.Thread(target=self._collect_loop, name="xmlrpc-batcher", daemon=True)
+        self._collector.start()
+
+    @staticmethod
+    def _estimate_size(method) -> int:
+        # Yalnızca medya yüklemeleri büyük olur; diğer çağrılar için küçük sabit bir değer yeterli
+        data = getattr(method, 'data', None)
+        if isinstance(data, dict) and 'bits' in data:
+            return len(data['bits'])
+        return 1024
+
+    def submit(self, method) -> Future:
+        future = Future()
+        with self._cond:
+            if not self._closed:
+                self._pending.append((method, future))
+                self._cond.notify()
+                return future
+
+        # Kapatılmış gruplayıcıya gelen çağrı beklemede kalmaz, doğrudan gönderilir
+        try:
+            future.set_result(self.transport.call_direct(method))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def close(self):
+        """Yeni çağrı almayı bırakır; kuyruktaki çağrılar gönderildikten sonra toplayıcı iş parçacığı çıkar
+        ve gönderici havuzu kapatılır. Gönderici iş parçacığından da çağrılabilir, gönderimleri beklemez."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _take_batch(self):
+        batch = []
+        size = 0
+        while self._pending and len(batch) < self.max_batch:
+            method_size = self._estimate_size(self._pending[0][0])
+            if batch and size + method_size > self.max_bytes:
+                break
+            batch.append(self._pending.pop(0))
+            size += method_size
+        return batch
+
+    def _collect_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    break
+
+                # Sunucuda bekleyen istek varken gelen çağrılar kısa süre bekletilip birlikte gönderilir;
+                # boşta iken tek çağrıyı bekletmek yalnızca gecikme ekler. Kapatılırken beklenmez
+                deadline = time.monotonic() + self.max_delay
+                while self._in_flight and not self._closed and len(self._pending) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch = self._take_batch()
+                self._in_flight += 1
+
+            self._senders.submit(self._send, batch)
+
+        # Son grup havuza verildi; gönderilmekte olanlar tamamlanır, iş parçacıkları ardından kapanır
+        self._senders.shutdown(wait=False)
+
+    def _send(self, batch):
+        try:
+            self._send_batch(batch)
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                # Bekleyen çağrılar sunucu boşalınca pencerenin sonunu beklemeden gönderilir
+                self._cond.notify()
+
+    def _send_batch(self, batch):
+        if len(batch) == 1:
+            method, future = batch[0]
+            try:
+                future.set_result(self.transport.call_direct(method))
+            except Exception as e:
+                future.set_exception(e)
+            return
+
+        try:
+            outcomes = self.transport.multicall([method for method, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), outcome in zip(batch, outcomes):
+            if isinstance(outcome, Exception):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+
+class XmlRpcTransport:
+    """python-wordpress-xmlrpc üzerinden çalışan taşıma katmanı (REST kullanılamadığında yedek).
+
+    batching açıkken eşzamanlı çağrılar system.multicall ile gruplanarak daha az istekle gönderilir.
+    """
+
+    name = "xmlrpc"
+
+    def __init__(self, site_url: str, username: str, password: str, connect: bool = True,
+                 batching: Optional[bool] = None):
+        self.xmlrpc_url = site_url + "/xmlrpc.php"
+        self.username = username
+        self.password = password
+
+        # XML-RPC bağlantısı iş parçacıkları arasında paylaşılamaz; her iş parçacığı kendi istemcisini kullanır
+        self._local = threading.local()
+        if connect:
+            self._local.client = Client(self.xmlrpc_url, username, password)
+
+        if batching is None:
+            batching = os.getenv("WP_MULTICALL", "1") == "1"
+        # Gruplayıcı ilk çağrıda oluşturulur; oluşturma ve kapatma aynı kilitle yapılır
+        self._batching = batching
+        self.batcher = None
+        self._batcher_lock = threading.Lock()
+
+    def get_client(self) -> Client:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = Client(self.xmlrpc_url, self.username, self.password)
+            self._local.client = client
+        return client
+
+    def call_direct(self, method):
+        return self.get_client().call(method)
+
+    def get_batcher(self) -> Optional[XmlRpcBatcher]:
+        if self.batcher is None and self._batching:
+            with self._batcher_lock:
+                if self.batcher is None and self._batching:
+                    self.batcher = XmlRpcBatcher(self)
+        return self.batcher
+
+    def disable_batching(self):
+        """Gruplamayı kapatır; kuyruktaki çağrılar eski gruplayıcı tarafından gönderildikten sonra o kapanır."""
+        with self._batcher_lock:
+            self._batching = False
+            batcher, self.batcher = self.batcher, None
+        if batcher is not None:
+            batcher.close()
+
+    def call(self, method):
+        batcher = self.get_batcher()
+        if batcher is None:
+            return self.call_direct(method)
+        return batcher.submit(method).result()
+
+    def multicall(self, methods) -> List:
+        """Çağrıları tek system.multicall isteğiyle gönderir; her çağrı için sonuç ya da istisna döndürür."""
+        client = self.get_client()
+        calls = [{'methodName': method.method_name, 'params': list(method.get_args(client))} for method in methods]
+
+        try:
+            raw_results = client.server.system.multicall(calls)
+        except xmlrpc.client.Fault as e:
+            if e.faultCode != -32601:
+                raise
+            # Sunucu system.multicall desteklemiyor; gruplamayı kapat ve tek tek gönder
+            print("XML-RPC sunucusu system.multicall desteklemiyor, çağrılar tek tek gönderilecek.")
+            self.disable_batching()
+            raw_results = None
+
+        outcomes = []
+        for index, method in enumerate(methods):
+            if raw_results is None:
+                try:
+                    outcomes.append(self.call_direct(method))
+                except Exception as e:
+                    outcomes.append(e)
+                continue
+
+            raw = raw_results[index]
+            if isinstance(raw, dict) and 'faultCode' in raw:
+                outcomes.append(_fault_to_exception(raw['faultCode'], raw.get('faultString', '')))
+                continue
+            try:
+                outcomes.append(method.process_result(raw[0]))
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+
+    def upload_media(self, path: str, name: str, mime_type: str) -> Dict:
+        # XML-RPC dosyayı base64 olarak XML içinde gönderir; dosyanın tamamı belleğe okunur
+        with open(path, 'rb') as f:
+            data = {'name': name, 'type': mime_type, 'bits': f.read()}
+        response = self.call(UploadFile(data))
+        return {'id': response['id'], 'url': response['url']}
+
+    @staticmethod
+    def build_post(fields: Dict) -> WordPressPost:
+        post = WordPressPost()
+        post.title = fields['title']
+        post.content = fields['content']
+        post.post_status = fields.get('status', 'publish')
+        if fields.get('date'):
+            # wordpress_xmlrpc tarihi post_date_gmt olarak gönderir; xmlrpc.client saat dilimini yok sayar
+            post.date = _to_gmt(fields['date'])
+        if fields.get('thumbnail'):
+            post.thumbnail = fields['thumbnail']
+        if fields.get('tags'):
+            post.terms_names = {'post_tag': fields['tags']}
+        return post
+
+    def create_post(self, fields: Dict):
+        return self.call(NewPost(self.build_post(fields)))
+
+
+class RestTransport:
+    """WordPress REST API (/wp-json/wp/v2) taşıma katmanı.
+
+    Medya dosyaları diskten akıtılarak (base64 ve XML sarmalaması olmadan) gönderilir ve ortak
+    HTTP oturumunun bağlantı havuzu kullanılır. Kimlik doğrulama uygulama parolasıyla (Basic) yapılır.
+    """
+
+    name = "rest"
+
+    def __init__(self, site_url: str, username: str, password: str, http_client=None):
+        self.api_url = site_url + "/wp-json/wp/v2"
+        self.index_url = site_url + "/wp-json/"
+        self.auth = (username or "", password or "")
+        self.http = http_client or get_http_client()
+
+        self._tag_ids = {}
+        self._tag_lock = threading.Lock()
+
+    def _request(self, method: str, path: str, **kwargs):
+        response = self.http.request(method, self.api_url + path, auth=self.auth, **kwargs)
+        if response.status_code >= 400:
+            try:
+                message = response.json().get('message', response.text)
+            except ValueError:
+                message = response.text
+            raise TransportError(f"REST {method} {path} hatası ({response.status_code}): {message}")
+        return response.json()
+
+    def is_available(self) -> bool:
+        """Sitenin REST API'sinin erişilebilir olup olmadığını kontrol eder.
+
+        Ortak oturumun yeniden deneme ve uzun okuma süreleri kullanılmaz; erişilemeyen site tek ve kısa
+        bir denemeyle XML-RPC'ye düşer.
+        """
+        timeout = float(os.getenv("WP_TRANSPORT_PROBE_TIMEOUT", 3))
+        try:
+            response = requests.get(self.index_url, timeout=timeout)
+            return response.status_code == 200 and 'wp/v2' in response.json().get('namespaces', [])
+        except (requests.exceptions.RequestException, ValueError):
+            return False
+
+    def upload_media(self, path: str, name: str, mime_type: str) -> Dict:
+        # Dosya nesnesi doğrudan gövde olarak verilir; requests onu parça parça okuyarak gönderir
+        with open(path, 'rb') as f:
+            result = self._request('POST', '/media', data=f, headers={
+                'Content-Type': mime_type,
+                'Content-Disposition': _content_disposition(name),
+                'Content-Length': str(os.fstat(f.fileno()).st_size),
+            })
+        return {'id': result['id'], 'url': result.get('source_url') or result.get('guid', {}).get('rendered')}
+
+    def resolve_tag_ids(self, names: List[str]) -> List[int]:
+        """Etiket adlarını REST API'nin beklediği kimliklere çevirir; olmayanları oluşturur."""
+        ids = []
+        for name in names:
+            key = name.strip().lower()
+            if not key:
+                continue
+            with self._tag_lock:
+                tag_id = self._tag_ids.get(key)
+            if tag_id is None:
+                tag_id = self._find_or_create_tag(name.strip())
+                with self._tag_lock:
+                    self._tag_ids[key] = tag_id
+            ids.append(tag_id)
+        return list(dict.fromkeys(ids))
+
+    def _find_tag(self, name: str) -> Optional[int]:
+        for tag in self._request('GET', '/tags', params={'search': name, 'per_page': 100}):
+            if tag.get('name', '').lower() == name.lower():
+                return tag['id']
+        return None
+
+    def _find_or_create_tag(self, name: str) -> int:
+        tag_id = self._find_tag(name)
+        if tag_id is not None:
+            return tag_id
+        try:
+            return self._request('POST', '/tags', json={'name': name})['id']
+        except TransportError as e:
+            # Etiket bu arada başka bir istek tarafından oluşturulduysa tekrar ara
+            if 'term_exists' in str(e):
+                tag_id = self._find_tag(name)
+                if tag_id is not None:
+                    return tag_id
+            raise
+
+    def create_post(self, fields: Dict):
+        payload = {
+            'title': fields['title'],
+            'content': fields['content'],
+            'status': fields.get('status', 'publish'),
+        }
+        if fields.get('date'):
+            # XML-RPC tarihi GMT kabul eder; REST'te 'date' sitenin yerel saatidir, bu yüzden date_gmt gönderilir
+            payload['date_gmt'] = _to_gmt(fields['date']).strftime('%Y-%m-%dT%H:%M:%S')
+        if fields.get('thumbnail'):
+            payload['featured_media'] = int(fields['thumbnail'])
+        if fields.get('tags'):
+            payload['tags'] = self.resolve_tag_ids(fields['tags'])
+
+        return str(self._request('POST', '/posts', json=payload)['id'])
+
+
+def create_transport(site_url: str, username: str, password: str, mode: Optional[str] = None):
+    """WP_TRANSPORT ayarına göre taşıma katmanını seçer: 'xmlrpc', 'rest' ya da 'auto'.
+
+    'auto' modunda REST API erişilebilirse REST, değilse XML-RPC kullanılır; bu denetim ağ isteği yaptığı
+    için WordpressClient taşıma katmanını ilk kullanımda kurar.
+    """
+    mode = (mode or os.getenv("WP_TRANSPORT", "auto")).lower()
+
+    if mode in ("rest", "auto"):
+        rest = RestTransport(site_url, username, password)
+        if mode == "rest" or rest.is_available():
+            return rest
+        print("WordPress REST API'ye erişilemedi, XML-RPC kullanılıyor.")
+
+    return XmlRpcTransport(site_url, username, password)
@@ -324,7 +324,7 @@ async function resizeSelectedImage() {
         if (data.status === 'success') {
             // Başarılı olursa resmi güncelle
             const img = currentResizeImage.container.querySelector('img');
-            img.src = data.resized_url + '?t=' + new Date().getTime(); // Cache'i önlemek için
+            img.src = data.resized_url; // Dosya adı kaynak sürümünü içerir, önbellek sorun olmaz
 
             // Boyut bilgisini güncelle
             if (data.new_size) {
@@ -538,19 +538,24 @@ async function submitForm(event) {
     formData.append('alternating_alignment', alternatingAlignment ? '1' : '0');
 
     try {
-        const response = await fetch(form.action, {
-            method: 'POST',
-            body: formData
-        });
+        let result = await sendPost(form.action, formData);
 
-        const result = await response.json();
+        // Yakın kopya nedeniyle engellendiyse kullanıcı onaylarsa yeniden gönder
+        if (result.status === 'duplicate' &&
+            confirm(result.message + '\n\n' + formatDuplicates(result.duplicates) + '\n\nYine de yayınlansın mı?')) {
+            formData.set('allow_duplicate', '1');
+            result = await sendPost(form.action, formData);
+        }
 
         if (result.status === 'success') {
+            if (result.duplicates && result.duplicates.length) {
+                showToast('Benzer yazı bulundu: ' + formatDuplicates(result.duplicates), 'warning');
+            }
             showToast('İçerik başarıyla gönderildi!', 'success');
             setTimeout(() => {
                 location.reload(); // Sayfayı yenile
             }, 1500);
-        } else {
+        } else if (result.status !== 'duplicate') {
             showToast('Bir hata oluştu: ' + result.message, 'error');
         }
     } catch (error) {
@@ -561,6 +566,225 @@ async function submitForm(event) {
     return false;
 }
 
+// Formu gönderir; gönderim kuyruğa alındıysa iş tamamlanana kadar durumunu takip eder
+async function sendPost(url, formData) {
+    const response = await fetch(url, {
+        method: 'POST',
+        body: formData
+    });
+
+    const result = await response.json();
+    if (result.status === 'queued') {
+        showToast('İçerik kuyruğa alındı, yayınlanıyor...', 'info');
+        const job = await waitForJob(result.status_url);
+        return job.result || { status: 'error', message: job.error || 'Bilinmeyen hata' };
+    }
+    return result;
+}
+
+function formatDuplicates(duplicates) {
+    return (duplicates || [])
+        .map(dup => `"${dup.title}" (%${Math.round(dup.similarity * 100)})`)
+        .join(', ');
+}
+
+// Arka plan işinin durumunu tamamlanana kadar sorgula
+async function waitForJob(statusUrl, interval = 1000) {
+    const stageLabels = {
+        translating: 'Çeviri yapılıyor',
+        fetching_images: 'Görseller hazırlanıyor',
+        rendering: 'Şablon uygulanıyor',
+        publishing: "WordPress'e gönderiliyor",
+        saving: 'Kaydediliyor'
+    };
+    let lastStage = null;
+
+    while (true) {
+        const response = await fetch(statusUrl);
+        const job = await response.json();
+
+        if (job.status === 'succeeded' || job.status === 'failed' || job.status === 'needs_review') {
+            return job;
+        }
+        if (response.status === 404) {
+            return { status: 'failed', error: job.message };
+        }
+
+        if (job.stage && job.stage !== lastStage) {
+            lastStage = job.stage;
+            showToast((stageLabels[job.stage] || job.stage) + '...', 'info');
+        }
+
+        await new Promise(resolve => setTimeout(resolve, interval));
+    }
+}
+
+// Geçmiş listesinin sonraki sayfasını imleçle getir
+async function loadMoreHistory() {
+    const button = document.getElementById('history-load-more');
+    const cursor = button.dataset.nextCursor;
+    if (!cursor) return;
+
+    button.disabled = true;
+    try {
+        const response = await fetch(`/history?cursor=${encodeURIComponent(cursor)}`);
+        const page = await response.json();
+        if (!response.ok) {
+            throw new Error(page.message || `HTTP Error: ${response.status}`);
+        }
+
+        const list = document.getElementById('history-list');
+        page.posts.forEach(post => list.appendChild(renderHistoryItem(post)));
+
+        button.dataset.nextCursor = page.next_cursor || '';
+        button.style.display = page.next_cursor ? '' : 'none';
+    } catch (error) {
+        console.error('Geçmiş yükleme hatası:', error);
+        showToast('Geçmiş yüklenemedi: ' + error.message, 'error');
+    } finally {
+        button.disabled = false;
+    }
+}
+
+// Geçmişte tam metin arama; arama kutusu boşken normal liste gösterilir
+let historySearchOffset = null;
+
+async function searchHistory(append = false) {
+    const query = document.getElementById('history-search').value.trim();
+    const results = document.getElementById('history-search-results');
+    const moreButton = document.getElementById('history-search-more');
+    const list = document.getElementById('history-list');
+    const loadMore = document.getElementById('history-load-more');
+
+    if (!query) {
+        results.replaceChildren();
+        results.style.display = 'none';
+        moreButton.style.display = 'none';
+        list.style.display = '';
+        loadMore.style.display = loadMore.dataset.nextCursor ? '' : 'none';
+        return;
+    }
+
+    const offset = append ? historySearchOffset : 0;
+    if (append && offset === null) return;
+
+    moreButton.disabled = true;
+    try {
+        const response = await fetch(`/history/search?q=${encodeURIComponent(query)}&offset=${offset}`);
+        const page = await response.json();
+        if (!response.ok) {
+            throw new Error(page.message || `HTTP Error: ${response.status}`);
+        }
+        // Yazarken gelen eski yanıtlar yeni sonuçların üzerine yazılmasın
+        if (page.query !== document.getElementById('history-search').value.trim()) return;
+
+        if (!append) {
+            results.replaceChildren();
+        }
+        page.results.forEach(post => {
+            const item = renderHistoryItem(post);
+            if (post.snippet) {
+                // Özet sunucuda kaçışlanır; yalnızca <mark> etiketlerini içerir
+                const snippet = document.createElement('p');
+                snippet.className = 'search-snippet';
+                snippet.innerHTML = post.snippet;
+                item.insertBefore(snippet, item.querySelector('.post-actions'));
+            }
+            results.appendChild(item);
+        });
+        if (!append && page.results.length === 0) {
+            const empty = document.createElement('p');
+            empty.className = 'post-meta';
+            empty.textContent = 'Sonuç bulunamadı.';
+            results.appendChild(empty);
+        }
+
+        historySearchOffset = page.next_offset;
+        results.style.display = '';
+        moreButton.style.display = page.next_offset !== null ? '' : 'none';
+        list.style.display = 'none';
+        loadMore.style.display = 'none';
+    } catch (error) {
+        console.error('Geçmiş arama hatası:', error);
+        showToast('Arama yapılamadı: ' + error.message, 'error');
+    } finally {
+        moreButton.disabled = false;
+    }
+}
+
+function renderHistoryItem(post) {
+    const wpUrl = document.querySelector('.history-section').dataset.wpUrl;
+
+    const item = document.createElement('div');
+    item.className = 'history-item';
+    item.dataset.postId = post.id;
+
+    const title = document.createElement('h4');
+    title.textContent = post.title;
+
+    const meta = document.createElement('p');
+    meta.className = 'post-meta';
+    const date = document.createElement('span');
+    date.className = 'post-date';
+    date.textContent = post.created_at;
+    const status = document.createElement('span');
+    status.className = 'post-status';
+    status.textContent = post.status;
+    meta.append(date, ' ', status);
+
+    const actions = document.createElement('div');
+    actions.className = 'post-actions';
+    const editLink = document.createElement('a');
+    editLink.href = `${wpUrl}/wp-admin/post.php?post=${post.wordpress_id}&action=edit`;
+    editLink.target = '_blank';
+    editLink.className = 'edit-link';
+    editLink.textContent = "WordPress'te Düzenle";
+    const toggle = document.createElement('button');
+    toggle.type = 'button';
+    toggle.className = 'secondary-button content-toggle';
+    toggle.textContent = 'İçeriği Göster';
+    toggle.addEventListener('click', () => toggleHistoryContent(toggle, post.id));
+    actions.append(editLink, toggle);
+
+    item.append(title, meta, actions);
+    return item;
+}
+
+// Yazı içeriği yalnızca istendiğinde yüklenir
+async function toggleHistoryContent(button, postId) {
+    const item = button.closest('.history-item');
+    let preview = item.querySelector('.history-content');
+
+    if (preview) {
+        const hidden = preview.style.display === 'none';
+        preview.style.display = hidden ? '' : 'none';
+        button.textContent = hidden ? 'İçeriği Gizle' : 'İçeriği Göster';
+        return;
+    }
+
+    button.disabled = true;
+    try {
+        const response = await fetch(`/history/${postId}?fields=content`);
+        const post = await response.json();
+        if (!response.ok) {
+            throw new Error(post.message || `HTTP Error: ${response.status}`);
+        }
+
+        // Kaydedilmiş HTML sayfanın geri kalanını etkilemesin diye yalıtılmış çerçevede gösterilir
+        preview = document.createElement('iframe');
+        preview.className = 'history-content';
+        preview.setAttribute('sandbox', '');
+        preview.srcdoc = post.content;
+        item.appendChild(preview);
+        button.textContent = 'İçeriği Gizle';
+    } catch (error) {
+        console.error('İçerik yükleme hatası:', error);
+        showToast('İçerik yüklenemedi: ' + error.message, 'error');
+    } finally {
+        button.disabled = false;
+    }
+}
+
 // Önizleme güncelleme
 function updatePreview() {
     const title = document.getElementById('title').value;
@@ -685,4 +909,7 @@ document.addEventListener('DOMContentLoaded', () => {
     ['title', 'content', 'tags'].forEach(id => {
         document.getElementById(id).addEventListener('input', debounce(updatePreview, 300));
     });
+
+    // Geçmiş araması
+    document.getElementById('history-search').addEventListener('input', debounce(() => searchHistory(), 300));
 });
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""HistoryManager testleri: varsayılan şablonla yakın kopya tespiti ve imleçle sayfalama."""
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from modules.history_manager import HistoryManager  # noqa: E402
+from modules.template_manager import TemplateManager  # noqa: E402
+
+ISTANBUL = (
+    "İstanbul'un tarihi yarımadasında bir gün geçirmek isteyenler sabah erken saatte Sultanahmet "
+    "meydanından yola çıkabilir. Ayasofya'nın kubbesi altında Bizans mozaiklerini inceledikten sonra "
+    "Yerebatan Sarnıcı'nın serin sütunları arasında kısa bir mola vermek iyi gelir. Öğle yemeğinde "
+    "Eminönü'ndeki balık ekmek tezgahları, ardından Mısır Çarşısı'ndaki baharat kokuları sizi bekler. "
+    "Akşamüstü Galata Köprüsü'nden Haliç'e bakarken vapurların gidip gelişini izlemek günün en güzel anıdır."
+)
+KAPADOKYA = (
+    "Kapadokya'da peri bacalarının arasında yürüyüş yapmak için en uygun mevsim ilkbahardır. Göreme Açık Hava "
+    "Müzesi'ndeki kaya kiliselerinin freskleri bölgenin erken Hristiyanlık dönemine ışık tutar. Ürgüp ve "
+    "Avanos arasındaki vadilerde bisiklet kiralayıp güneş batarken Kızılçukur'a varmak mümkündür. Çömlekçi "
+    "atölyelerinde Kızılırmak'ın kırmızı kilinden yapılan kapları şekillendirmeyi deneyebilir, gece ise "
+    "mağara otellerinden birinde konaklayarak sabah balonların havalanışını izleyebilirsiniz."
+)
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    # Depodaki kayıtlı varsayılan şablon kullanılır; sabit tanıtım metni içerdiği için ilgisiz yazıları
+    # şablonlu HTML üzerinden karşılaştırmak onları birbirine %90'ın üzerinde benzer gösteriyordu
+    (tmp_path / "templates").mkdir()
+    shutil.copy(os.path.join(ROOT, "templates", "saved_templates.json"), tmp_path / "templates")
+    monkeypatch.chdir(tmp_path)
+    manager = HistoryManager(db_file=str(tmp_path / "posts_history.db"))
+    yield manager
+    manager.close()
+
+
+def publish(history, templates, title, content, keywords):
+    """ui_module.publish_prepared_post gibi şablonlu içeriği ve kullanıcının yazdığı metni birlikte kaydeder."""
+    rendered = templates.apply_template("default", title=title, content=content, tags=keywords,
+                                        featured_image="https://example.com/kapak.jpg")
+    return history.save_post({
+        "title": title,
+        "content": rendered,
+        "source_content": content,
+        "keywords": keywords,
+        "template": "default",
+    }, "1")
+
+
+def test_near_duplicates_ignore_default_template_boilerplate(history):
+    templates = TemplateManager()
+    publish(history, templates, "İstanbul'da bir gün", ISTANBUL, "istanbul, gezi")
+
+    # Aynı şablonla yayınlanan ilgisiz bir yazı benzer sayılmamalı
+    assert history.find_near_duplicates("Kapadokya rehberi", KAPADOKYA, "kapadokya, gezi") == []
+
+    edited = ISTANBUL.replace("kısa bir mola", "uzunca bir mola").replace("en güzel", "en keyifli")
+    duplicates = history.find_near_duplicates("İstanbul'da bir gün", edited, "istanbul, gezi")
+    assert [dup["title"] for dup in duplicates] == ["İstanbul'da bir gün"]
+    assert duplicates[0]["similarity"] >= 0.7
+
+
+def test_backfilled_signatures_use_stored_user_text(history):
+    templates = TemplateManager()
+    publish(history, templates, "İstanbul'da bir gün", ISTANBUL, "istanbul, gezi")
+    publish(history, templates, "Kapadokya rehberi", KAPADOKYA, "kapadokya, gezi")
+    before = history.find_near_duplicates("İstanbul'da bir gün", ISTANBUL, "istanbul, gezi")
+
+    with history._connection() as conn:
+        conn.execute("DELETE FROM post_lsh_buckets")
+        conn.execute("DELETE FROM post_minhash")
+    assert history.backfill_signatures() == 2
+
+    assert history.find_near_duplicates("İstanbul'da bir gün", ISTANBUL, "istanbul, gezi") == before
+
+
+def save_plain(history, title):
+    return history.save_post({"title": title, "content": f"<p>{title}</p>", "keywords": "test"}, "1")
+
+
+def test_cursor_pages_cover_every_post_once(history):
+    # Aynı saniyede eklenen yazılar aynı created_at'i alır; sıralama id ile tamamlanır
+    ids = [save_plain(history, f"Yazı {i}") for i in range(25)]
+
+    seen = []
+    cursor = None
+    for expected_size in (10, 10, 5):
+        page = history.get_posts_page(limit=10, cursor=cursor, columns=["title"])
+        assert len(page["posts"]) == expected_size
+        seen.extend(post["id"] for post in page["posts"])
+        cursor = page["next_cursor"]
+
+    assert cursor is None
+    assert seen == sorted(ids, reverse=True)
+    assert set(page["posts"][0]) == {"created_at", "id", "title"}
+
+
+def test_cursor_page_is_stable_when_new_posts_arrive(history):
+    for i in range(6):
+        save_plain(history, f"Yazı {i}")
+    first = history.get_posts_page(limit=3)
+    expected = history.get_posts_page(limit=3, cursor=first["next_cursor"])
+
+    # Yeni yazı listenin başına eklenir; OFFSET'in aksine sonraki sayfayı kaydırmaz
+    save_plain(history, "Yeni yazı")
+
+    assert history.get_posts_page(limit=3, cursor=first["next_cursor"]) == expected
+
+
+def test_invalid_cursor_is_rejected(history):
+    with pytest.raises(ValueError):
+        history.get_posts_page(cursor="bozuk-imlec")
@@ -0,0 +1,97 @@
+"""JobQueue kira testleri: sahibi çöken işler yeniden kuyruğa alınır, yayına başlamış işler alınmaz."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.job_queue import JobQueue  # noqa: E402
+
+STAGES = ["rendering", "publishing", "saving"]
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    return str(tmp_path / "posts_history.db")
+
+
+def make_queue(db_file, handler=None):
+    # İş parçacıkları başlatılmaz; talep etme ve kira süresi doğrudan çağrılarla sınanır
+    queue = JobQueue(handler or (lambda payload, progress: {"status": "success"}), db_file=db_file,
+                     stages=STAGES, commit_stage="publishing")
+    queue.lease_seconds = 60
+    return queue
+
+
+def expire_lease(queue, job_id):
+    with queue._connect() as conn:
+        conn.execute("UPDATE jobs SET heartbeat_at = heartbeat_at - ? WHERE id = ?", (queue.lease_seconds + 1, job_id))
+
+
+def test_expired_job_is_claimed_by_another_process(db_file):
+    crashed, alive = make_queue(db_file), make_queue(db_file)
+    job_id = crashed.enqueue({"title": "Yazı"})
+    assert crashed._claim_next()["id"] == job_id
+
+    # Kirası dolmamış iş başka bir süreç tarafından alınmaz
+    assert alive._claim_next() is None
+
+    expire_lease(crashed, job_id)
+    assert alive._claim_next()["id"] == job_id
+
+    # Eski sahip geri dönse bile sonucu yeni sahibin üzerine yazamaz
+    crashed._finish(job_id, "failed", error="geç kalan sonuç")
+    assert alive.get_job(job_id)["status"] == "running"
+    alive._finish(job_id, "succeeded", result={"status": "success"})
+    assert alive.get_job(job_id)["status"] == "succeeded"
+
+
+def test_heartbeat_keeps_lease(db_file):
+    owner, other = make_queue(db_file), make_queue(db_file)
+    job_id = owner.enqueue({"title": "Yazı"})
+    owner._claim_next()
+
+    expire_lease(owner, job_id)
+    assert owner._heartbeat() == 1
+
+    assert other._claim_next() is None
+    assert other.get_job(job_id)["status"] == "running"
+
+
+def test_job_that_started_publishing_is_held_for_review(db_file):
+    crashed, alive = make_queue(db_file), make_queue(db_file)
+    job_id = crashed.enqueue({"title": "Yazı"})
+    crashed._claim_next()
+    # İşçi gönderimi başlattıktan sonra çöktü
+    crashed._update_stage(job_id, "rendering")
+    crashed._update_stage(job_id, "publishing")
+
+    expire_lease(crashed, job_id)
+    assert alive._claim_next() is None
+
+    job = alive.get_job(job_id)
+    assert job["status"] == "needs_review"
+    assert job["error"]
+
+
+def test_handler_does_not_publish_without_marker(db_file):
+    published = []
+
+    def handler(payload, progress):
+        progress("publishing")
+        published.append(payload)
+        return {"status": "success"}
+
+    queue = make_queue(db_file, handler)
+    job_id = queue.enqueue({"title": "Yazı"})
+    queue._claim_next()
+
+    def broken_update(job_id, stage, state="running"):
+        raise RuntimeError("veritabanı kilitli")
+
+    queue._update_stage = broken_update
+    queue._run_job(job_id, {"title": "Yazı"})
+
+    assert published == []
+    assert queue.get_job(job_id)["status"] == "failed"
@@ -0,0 +1,79 @@
+"""Flask uygulaması testleri: pano sayfasının ETag ile koşullu sunulması ve geçmiş imleci."""
+import importlib
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope="module")
+def main(tmp_path_factory):
+    # Uygulama veritabanı ve şablon dosyasını çalışma dizinine göre açar; depodakiler değiştirilmez
+    workdir = tmp_path_factory.mktemp("app")
+    (workdir / "templates").mkdir()
+    shutil.copy(os.path.join(ROOT, "templates", "saved_templates.json"), workdir / "templates")
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(workdir)
+        # Taşıma katmanı ilk kullanımda seçildiği için adrese bağlanılmaz
+        mp.setenv("WP_URL", "http://127.0.0.1:9")
+        mp.setenv("WP_USER", "kullanici")
+        mp.setenv("WP_APP_PASSWORD", "uygulama-parolasi")
+        module = importlib.import_module("main")
+        yield module
+
+        # İlk istekte başlayan işçiler çalışma dizininden çıkmadan durdurulur
+        module.job_queue.stop()
+        for thread in module.job_queue._threads:
+            thread.join(timeout=10)
+        module.history_manager.close()
+
+
+@pytest.fixture
+def client(main):
+    return main.app.test_client()
+
+
+def save_post(main, title):
+    return main.history_manager.save_post({"title": title, "content": f"<p>{title}</p>", "keywords": "test"}, "1")
+
+
+def test_dashboard_is_revalidated_with_etag(main, client):
+    first = client.get("/")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = client.get("/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.data == b""
+
+    # Geçmiş değişince sayfa yeniden üretilir ve eski ETag geçersiz olur
+    save_post(main, "Panoda yeni yazı")
+    changed = client.get("/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert "Panoda yeni yazı" in changed.get_data(as_text=True)
+
+
+def test_history_endpoint_pages_with_cursor(main, client):
+    for i in range(5):
+        save_post(main, f"Sayfalı yazı {i}")
+
+    titles = []
+    url = "/history?limit=2&fields=title"
+    while url:
+        page = client.get(url).get_json()
+        titles.extend(post["title"] for post in page["posts"])
+        url = f"/history?limit=2&fields=title&cursor={page['next_cursor']}" if page["next_cursor"] else None
+
+    assert titles[:5] == [f"Sayfalı yazı {i}" for i in reversed(range(5))]
+    assert len(titles) == len(set(titles))
+
+
+def test_history_endpoint_rejects_invalid_cursor(client):
+    response = client.get("/history?cursor=bozuk-imlec")
+    assert response.status_code == 400
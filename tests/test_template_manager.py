@@ -0,0 +1,53 @@
+"""TemplateManager görsel biçimlendirme testleri: wp:image blokları Gutenberg'in kabul ettiği <img> içermeli."""
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.template_manager import TemplateManager  # noqa: E402
+
+IMAGE_URL = "https://example.com/a.jpg"
+RENDITIONS = [
+    {"url": f"/static/images/renditions/a-{width}.{ext}", "width": width, "height": width * 3 // 4, "format": fmt}
+    for fmt, ext in (("jpeg", "jpg"), ("webp", "webp"))
+    for width in (480, 800)
+]
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    # Şablon dosyası çalışma dizinine göre oluşturulur
+    monkeypatch.chdir(tmp_path)
+    return TemplateManager()
+
+
+def test_image_blocks_use_plain_img_with_srcset(manager):
+    content = manager.apply_template(
+        "default", title="Başlık", content="Metin", tags="gezi",
+        featured_image=IMAGE_URL, content_images=[IMAGE_URL],
+        image_renditions={IMAGE_URL: RENDITIONS},
+    )
+
+    blocks = re.findall(r"<!-- wp:image .*?-->(.*?)<!-- /wp:image -->", content, re.DOTALL)
+    assert len(blocks) == 2
+    for block in blocks:
+        assert "<picture" not in block and "<source" not in block
+        assert ('srcset="/static/images/renditions/a-480.jpg 480w, /static/images/renditions/a-800.jpg 800w"'
+                in block)
+        assert 'width="800" height="600"' in block
+
+
+def test_image_without_renditions_is_plain_img(manager):
+    assert manager._format_image_tag(IMAGE_URL, "a", "content-image") == \
+        f'<img src="{IMAGE_URL}" alt="a" class="content-image"/>'
+
+
+def test_srcset_uses_webp_when_it_is_the_only_format(manager):
+    webp_only = [item for item in RENDITIONS if item["format"] == "webp"]
+
+    tag = manager._format_image_tag(IMAGE_URL, "a", "content-image", webp_only)
+
+    assert 'srcset="/static/images/renditions/a-480.webp 480w, /static/images/renditions/a-800.webp 800w"' in tag
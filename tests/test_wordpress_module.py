@@ -0,0 +1,62 @@
+"""WordpressClient.rewrite_image_sources testleri: yayınlanan yazıda yerel görsel adresi kalmamalı."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.wordpress_module import WordpressClient  # noqa: E402
+
+SIZES = 'sizes="(max-width: 800px) 100vw, 800px"'
+CONTENT = (
+    '<picture>\n'
+    f'<source type="image/webp" srcset="/static/images/renditions/a-480.webp 480w, '
+    f'/static/images/renditions/a-800.webp 800w" {SIZES}/>\n'
+    f'<img src="https://example.com/a.jpg" alt="a" srcset="/static/images/renditions/a-480.jpg 480w, '
+    f'/static/images/renditions/a-800.jpg 800w" {SIZES} width="800" height="600"/>\n'
+    '</picture>'
+)
+
+
+def test_uploaded_candidates_are_rewritten_and_missing_ones_dropped():
+    uploaded = {
+        "https://example.com/a.jpg": {"id": 1, "url": "https://wp.example/a.jpg"},
+        "/static/images/renditions/a-480.jpg": {"id": 2, "url": "https://wp.example/a-480.jpg"},
+    }
+
+    content = WordpressClient.rewrite_image_sources(CONTENT, uploaded)
+
+    assert "/static/" not in content
+    assert 'src="https://wp.example/a.jpg"' in content
+    assert 'srcset="https://wp.example/a-480.jpg 480w"' in content
+    # Hiç adayı yüklenemeyen WebP kaynağı tamamen kaldırılır
+    assert "<source" not in content
+
+
+def test_img_falls_back_to_src_when_no_candidate_was_uploaded():
+    content = WordpressClient.rewrite_image_sources(CONTENT, {})
+
+    assert "/static/" not in content
+    assert "srcset" not in content
+    assert "sizes" not in content
+    assert '<img src="https://example.com/a.jpg" alt="a" width="800" height="600"/>' in content
+
+
+def test_remote_srcset_candidates_are_kept():
+    content = '<img src="https://cdn.example/b.jpg" srcset="https://cdn.example/b-480.jpg 480w" sizes="100vw"/>'
+
+    assert WordpressClient.rewrite_image_sources(content, {}) == content
+
+
+def test_uploaded_img_gets_attachment_class():
+    content = ('<img src="https://example.com/a.jpg" alt="a" class="content-image"/>'
+               '<img src="https://example.com/b.jpg"/>')
+    uploaded = {
+        "https://example.com/a.jpg": {"id": 7, "url": "https://wp.example/a.jpg"},
+        "https://example.com/b.jpg": {"id": "8", "url": "https://wp.example/b.jpg"},
+    }
+
+    content = WordpressClient.rewrite_image_sources(content, uploaded)
+
+    # WordPress srcset'i wp-image-{id} sınıfından bulduğu ek dosyanın ara boyutlarıyla kendisi ekler
+    assert '<img src="https://wp.example/a.jpg" alt="a" class="content-image wp-image-7"/>' in content
+    assert '<img class="wp-image-8" src="https://wp.example/b.jpg"/>' in content
@@ -0,0 +1,174 @@
+"""XML-RPC ve REST taşıma katmanlarının yerel WordPress taklidine (benchmarks/fake_wordpress.py) karşı testleri.
+
+Her test iki taşımayla da çalışır: yazı yayınlama, medya yükleme (Türkçe karakterli dosya adı dahil)
+ve ileri tarihli yazı zamanlama. Çalıştırmak için: python -m pytest -q
+"""
+import os
+import sys
+import xmlrpc.client
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from wordpress_xmlrpc.methods.posts import NewPost
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import fake_wordpress  # noqa: E402
+from modules.media_index import MediaIndex  # noqa: E402
+from modules.wordpress_module import WordpressClient  # noqa: E402
+from modules.wp_transports import create_transport  # noqa: E402
+
+TRANSPORTS = ["rest", "xmlrpc"]
+
+
+@pytest.fixture
+def server():
+    srv = fake_wordpress.start()
+    yield srv
+    srv.shutdown()
+
+
+@pytest.fixture(params=TRANSPORTS)
+def transport(request, server):
+    return create_transport(server.url, "kullanici", "uygulama-parolasi", mode=request.param)
+
+
+@pytest.fixture
+def image_file(tmp_path):
+    path = tmp_path / "kırmızı-şehir.jpg"
+    path.write_bytes(b"\xff\xd8\xff\xe0" + os.urandom(4096))
+    return path
+
+
+def stored_post(site, transport_name, post_id):
+    """Sahte sunucunun sakladığı yazıyı iki taşıma için ortak alanlara çevirir."""
+    raw = site.posts[int(post_id)]
+    if transport_name == "rest":
+        return {
+            "title": raw["title"],
+            "content": raw["content"],
+            "status": raw["status"],
+            "date_gmt": datetime.strptime(raw["date_gmt"], "%Y-%m-%dT%H:%M:%S") if "date_gmt" in raw else None,
+            "thumbnail": raw.get("featured_media"),
+            "tags": sorted(site.tags[tag_id] for tag_id in raw.get("tags", [])),
+            "local_date": raw.get("date"),
+        }
+
+    date = raw.get("post_date_gmt")
+    if isinstance(date, xmlrpc.client.DateTime):
+        date = datetime.strptime(date.value, "%Y%m%dT%H:%M:%S")
+    return {
+        "title": raw["post_title"],
+        "content": raw["post_content"],
+        "status": raw["post_status"],
+        "date_gmt": date,
+        "thumbnail": int(raw["post_thumbnail"]) if raw.get("post_thumbnail") else None,
+        "tags": sorted(raw.get("terms_names", {}).get("post_tag", [])),
+        "local_date": raw.get("post_date"),
+    }
+
+
+def test_create_post_with_tags(server, transport):
+    post_id = transport.create_post({
+        "title": "İstanbul'da bir gün",
+        "content": "<p>Boğaz kıyısında yürüyüş</p>",
+        "tags": ["gezi", "İstanbul"],
+    })
+
+    post = stored_post(server.site, transport.name, post_id)
+    assert post["title"] == "İstanbul'da bir gün"
+    assert post["status"] == "publish"
+    assert post["tags"] == ["gezi", "İstanbul"]
+
+
+def test_upload_media_with_turkish_filename(server, transport, image_file):
+    media = transport.upload_media(str(image_file), image_file.name, "image/jpeg")
+
+    stored = server.site.media[int(media["id"])]
+    assert stored["name"] == "kırmızı-şehir.jpg"
+    assert stored["size"] == image_file.stat().st_size
+    assert media["url"] == stored["url"]
+
+
+def test_scheduled_post_is_sent_as_gmt(server, transport):
+    publish_at = datetime(2030, 1, 2, 9, 30, 0)
+    post_id = transport.create_post({
+        "title": "Zamanlanmış yazı",
+        "content": "<p>İleri tarihli</p>",
+        "status": "future",
+        "date": publish_at,
+    })
+
+    post = stored_post(server.site, transport.name, post_id)
+    assert post["status"] == "future"
+    assert post["date_gmt"] == publish_at
+    # Sitenin yerel saati olarak yorumlanan alan gönderilmez
+    assert post["local_date"] is None
+
+
+def test_scheduled_post_converts_aware_datetime_to_gmt(server, transport):
+    istanbul = timezone(timedelta(hours=3))
+    post_id = transport.create_post({
+        "title": "Saat dilimli yazı",
+        "content": "<p>İleri tarihli</p>",
+        "status": "future",
+        "date": datetime(2030, 1, 2, 12, 30, 0, tzinfo=istanbul),
+    })
+
+    assert stored_post(server.site, transport.name, post_id)["date_gmt"] == datetime(2030, 1, 2, 9, 30, 0)
+
+
+def test_publish_with_featured_image(server, transport, image_file, tmp_path):
+    client = WordpressClient(server.url, "kullanici", "uygulama-parolasi",
+                             media_index=MediaIndex(db_file=str(tmp_path / "media_index.db")),
+                             transport=transport)
+
+    post_id = client.upload_post("Öne çıkan görselli yazı", "<p>İçerik</p>", str(image_file),
+                                 datetime(2030, 5, 1, 6, 0, 0), tags="gezi, doğa")
+
+    assert post_id
+    post = stored_post(server.site, transport.name, post_id)
+    media_id, media = next(iter(server.site.media.items()))
+    assert post["thumbnail"] == media_id
+    assert media["name"] == "kırmızı-şehir.jpg"
+    assert post["date_gmt"] == datetime(2030, 5, 1, 6, 0, 0)
+    assert post["tags"] == ["doğa", "gezi"]
+    assert media["url"] in post["content"]
+
+
+def test_disable_batching_flushes_and_closes_batcher(server):
+    transport = create_transport(server.url, "kullanici", "uygulama-parolasi", mode="xmlrpc")
+    batcher = transport.get_batcher()
+    futures = [batcher.submit(NewPost(transport.build_post({"title": f"Yazı {i}", "content": "<p>İçerik</p>"})))
+               for i in range(5)]
+
+    transport.disable_batching()
+
+    assert len({future.result(timeout=10) for future in futures}) == 5
+    batcher._collector.join(timeout=10)
+    assert not batcher._collector.is_alive()
+    assert batcher._senders._shutdown
+    # Kapatıldıktan sonra gelen çağrı bekletilmeden doğrudan gönderilir
+    late = batcher.submit(NewPost(transport.build_post({"title": "Geç", "content": "<p>İçerik</p>"})))
+    assert late.result(timeout=10)
+    assert transport.get_batcher() is None
+
+
+def test_deleted_attachment_is_uploaded_again(server, transport, image_file, tmp_path):
+    client = WordpressClient(server.url, "kullanici", "uygulama-parolasi",
+                             media_index=MediaIndex(db_file=str(tmp_path / "media_index.db")),
+                             transport=transport)
+
+    first = client.upload_image(str(image_file))
+    assert str(client.upload_image(str(image_file))["id"]) == str(first["id"])
+    assert len(server.site.media) == 1
+
+    # Ek dosya WordPress'te silinince indeksteki kayıt kullanılmaz
+    del server.site.media[int(first["id"])]
+    second = client.upload_image(str(image_file))
+
+    assert str(second["id"]) != str(first["id"])
+    assert list(server.site.media) == [int(second["id"])]
+    assert client.upload_image(str(image_file))["url"] == second["url"]